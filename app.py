@@ -1,18 +1,24 @@
 import os
+import re
 import json
 import time
+import hashlib
+import mimetypes
 from datetime import datetime
-import random
 import threading
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import numpy as np
+from flask import Flask, render_template, request, jsonify, send_from_directory, abort
 from flask_socketio import SocketIO
 import requests
 from rover_simulation import RoverSimulation
+from pose_estimator import PoseEstimator
+from coverage_planner import CoveragePlanner
 
 # Base URL for the API
 BASE_URL = "https://roverdata2-production.up.railway.app"
 
-app = Flask(__name__)
+# Static assets are served by serve_static (fingerprinted, precompressed)
+app = Flask(__name__, static_folder=None)
 app.config['SECRET_KEY'] = 'roverx-secret-key'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
@@ -23,6 +29,24 @@ simulation_running = False
 is_delivering_aid = False
 aid_delivery_start_time = 0
 
+# Pose estimate between upstream polls
+ROVER_SPEED = 0.5  # position units per second while a move command runs
+pose_estimator = PoseEstimator()
+pose_lock = threading.Lock()  # The simulation thread updates the pose while requests read it
+
+# Boustrophedon sweeps over the search area, in the upstream position units
+SEARCH_AREA = [-20, -20, 20, 20]  # min_x, min_y, max_x, max_y
+SEARCH_LANE_SPACING = 4
+coverage_planner = CoveragePlanner(lane_spacing=SEARCH_LANE_SPACING, min_sweep_length=1, arrival_tolerance=1)
+
+# Static asset settings
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_MAX_AGE = 31536000  # one year, fingerprinted URLs never change content
+STATIC_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]  # preferred order
+FINGERPRINT_RE = re.compile(r'^(?P<name>.+)\.(?P<hash>[0-9a-f]{12})(?P<ext>\.[^./]+)$')
+static_fingerprints = {}
+index_html_cache = None
+
 # Rover data structure
 rover_data = {
     "status": "idle",
@@ -91,6 +115,7 @@ def simulation_loop():
                 add_log_entry(f"Battery critically low ({rover_data['battery']}%). Starting recharge...", "warning")
                 rover_simulation.charge_rover()
                 rover_simulation.stop_rover()  # Ensure the rover stops moving
+                update_pose_command("stop", 0.0)
                 rover_data["status"] = "Charging"  # Update status immediately
                 socketio.emit('status_update', rover_data)  # Send immediate update to UI
                 add_log_entry("Rover stopped for charging. Will resume at 80%.", "info")
@@ -105,6 +130,7 @@ def simulation_loop():
                 
                 # Stop the rover
                 rover_simulation.stop_rover()
+                update_pose_command("stop", 0.0)
                 add_log_entry("Rover stopped due to connection loss.", "warning")
                 
                 # Start charging immediately
@@ -124,10 +150,9 @@ def simulation_loop():
                 # Move to indicate we're no longer charging
                 move_rover()
             
-            # If not charging and battery is above minimum, move randomly
+            # If not charging and battery is above minimum, follow the search sweeps
             if rover_simulation.status.lower() != "charging" and rover_data["battery"] > COMMS_LOSS and not is_delivering_aid:
-                # Move in a random direction
-                move_rover()
+                move_rover(next_search_direction())
             elif rover_simulation.status.lower() == "charging":
                 # If charging, emit a status update to show charging progress
                 if rover_data["status"] != "Charging" and rover_data["status"] != "Recharging":
@@ -144,6 +169,7 @@ def simulation_loop():
         # Stop the rover before exiting
         if rover_simulation:
             rover_simulation.stop_rover()
+            update_pose_command("stop", 0.0)
         simulation_running = False
         add_log_entry("Simulation stopped", "warning")
 
@@ -204,6 +230,15 @@ def update_sensor_data():
             pos = data.get("position", {"x": 0, "y": 0})
             rover_data["position"] = {"x": pos["x"], "y": pos["y"]}
             
+            # Fuse the fix and accelerometer frame into the pose estimate
+            accel = data.get("accelerometer")
+            with pose_lock:
+                now = time.time()
+                if accel:
+                    pose_estimator.update_accelerometer((accel.get("x", 0), accel.get("y", 0)), now)
+                pose_estimator.update_position((pos["x"], pos["y"]), now)
+                rover_data["estimated_pose"] = pose_estimator.get_pose()
+            
             # Ensure battery level doesn't exceed 100%
             battery_level = data.get("battery_level", 0)
             if battery_level > 100:
@@ -221,6 +256,7 @@ def update_sensor_data():
                     
                     # Start aid delivery process
                     rover_simulation.stop_rover()  # Stop the rover
+                    update_pose_command("stop", 0.0)
                     rover_data["status"] = "Delivering Aid"
                     socketio.emit('status_update', rover_data)
                     add_log_entry("Rover stopped. Delivering aid to survivor...", "info")
@@ -258,6 +294,31 @@ def update_sensor_data():
         add_log_entry(f"Error updating sensor data: {str(e)}", "error")
         return False
 
+def update_pose_command(direction, speed):
+    """Fuse the velocity of a move command into the pose estimate"""
+    with pose_lock:
+        pose_estimator.update_command(direction, speed, time.time())
+
+def start_search_sweeps():
+    """Plan the sweeps over the search area, the dashboard has no obstacle map so every lane is free"""
+    coverage_planner.plan(SEARCH_AREA, lambda points: np.ones(len(points), dtype=bool), 1)
+
+def next_search_direction():
+    """Get the move direction toward the next coverage waypoint, restarting the sweeps once the area is covered"""
+    position = [rover_data["position"]["x"], rover_data["position"]["y"]]
+    if coverage_planner.area is None or coverage_planner.is_complete:
+        start_search_sweeps()
+    coverage_planner.advance(position)
+    # The loop above handles recharging, so the sweep is not cut short for range
+    leg = coverage_planner.next_leg(position, float('inf'), max_waypoints=1)
+    if not leg:
+        return None
+    dx = leg[0][0] - position[0]
+    dy = leg[0][1] - position[1]
+    if abs(dx) > abs(dy):
+        return "right" if dx > 0 else "left"
+    return "forward" if dy > 0 else "backward"
+
 def move_rover(direction=None):
     """Move the rover in a specified or random direction"""
     global rover_data, rover_simulation
@@ -271,6 +332,8 @@ def move_rover(direction=None):
         result = rover_simulation.move_rover(direction)
         
         if result:
+            update_pose_command(rover_simulation.last_direction, ROVER_SPEED)
+            
             # Add to movement history
             rover_data["movement_history"].append({
                 "direction": rover_simulation.last_direction,
@@ -298,17 +361,95 @@ def move_rover(direction=None):
         add_log_entry(f"Error moving rover: {str(e)}", "error")
         return False
 
+def get_static_fingerprint(filename):
+    """Get the content hash of a static file, computed once per process"""
+    if filename not in static_fingerprints:
+        with open(os.path.join(STATIC_DIR, filename), 'rb') as f:
+            static_fingerprints[filename] = hashlib.sha256(f.read()).hexdigest()[:12]
+    return static_fingerprints[filename]
+
+@app.context_processor
+def inject_static_url():
+    """Expose static_url() to templates for fingerprinted asset URLs"""
+    def static_url(filename):
+        name, ext = os.path.splitext(filename)
+        return f"/static/{name}.{get_static_fingerprint(filename)}{ext}"
+    return {"static_url": static_url}
+
+def parse_accept_encoding(header):
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    weights = {}
+    for token in header.lower().split(','):
+        coding, *params = token.split(';')
+        coding = coding.strip()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+def select_static_variant(path):
+    """Pick the best precompressed variant of a static file the client accepts"""
+    weights = parse_accept_encoding(request.headers.get('Accept-Encoding', ''))
+    source = os.path.join(STATIC_DIR, path)
+    # Highest q-value first, our preferred order breaks ties, q=0 means not acceptable
+    candidates = []
+    for preference, (encoding, suffix) in enumerate(STATIC_ENCODINGS):
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > 0:
+            candidates.append((-weight, preference, encoding, suffix))
+    for _, _, encoding, suffix in sorted(candidates):
+        variant = source + suffix
+        # Ignore variants left over from an older build of the asset
+        if os.path.isfile(variant) and os.path.getmtime(variant) >= os.path.getmtime(source):
+            return path + suffix, encoding
+    return path, None
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    global index_html_cache
+    
+    # The dashboard template has no per-request context, render it once
+    if index_html_cache is None:
+        index_html_cache = render_template('index.html')
+    return index_html_cache
 
 @app.route('/static/<path:path>')
 def serve_static(path):
-    return send_from_directory('static', path)
+    # Resolve fingerprinted URLs (js/script.<hash>.js) to the source file
+    fingerprinted = False
+    match = FINGERPRINT_RE.match(path)
+    if match and not os.path.isfile(os.path.join(STATIC_DIR, path)):
+        path = match.group('name') + match.group('ext')
+        fingerprinted = True
+    
+    if not os.path.isfile(os.path.join(STATIC_DIR, path)):
+        abort(404)
+    
+    variant, encoding = select_static_variant(path)
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    response = send_from_directory(STATIC_DIR, variant, mimetype=mimetype)
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    
+    # Only URLs carrying the current content hash are safe to cache forever
+    if fingerprinted and match.group('hash') == get_static_fingerprint(path):
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/start-simulation', methods=['POST'])
 def api_start_simulation():
-    global simulation_thread, simulation_running, rover_simulation, rover_data
+    global simulation_thread, simulation_running, rover_simulation, rover_data, pose_estimator
     
     if simulation_running:
         return jsonify({"status": "error", "message": "Simulation already running"})
@@ -318,9 +459,15 @@ def api_start_simulation():
     rover_data["log_entries"] = []
     rover_data["path_history"] = []
     rover_data["survivors_found"] = []
+    rover_data.pop("estimated_pose", None)
+    
+    # The previous run's pose says nothing about the new rover
+    with pose_lock:
+        pose_estimator = PoseEstimator()
     
     # Create a new rover simulation
     rover_simulation = RoverSimulation()
+    start_search_sweeps()
     
     # Start simulation in a separate thread
     simulation_running = True
@@ -344,6 +491,10 @@ def api_stop_simulation():
 
 @app.route('/api/rover-data', methods=['GET'])
 def api_rover_data():
+    with pose_lock:
+        if pose_estimator.initialized:
+            # Extrapolate the pose to now, upstream positions only arrive every poll
+            rover_data["estimated_pose"] = pose_estimator.get_pose(time.time())
     return jsonify(rover_data)
 
 if __name__ == '__main__':
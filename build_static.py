@@ -0,0 +1,49 @@
+import os
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Brotli variants are optional, gzip is always built
+
+# Static assets directory served by app.py
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Text assets worth precompressing
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.html', '.svg', '.json')
+
+def compress_file(path):
+    """Write .gz (and .br when available) variants next to a static file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        variants[".br"] = brotli.compress(data, quality=11)
+
+    written = []
+    for suffix, compressed in variants.items():
+        # Only keep variants that actually save bytes
+        if len(compressed) >= len(data):
+            continue
+        with open(path + suffix, 'wb') as f:
+            f.write(compressed)
+        written.append((suffix, len(compressed)))
+    return len(data), written
+
+def build_static(static_dir=STATIC_DIR):
+    """Precompress every compressible asset under the static directory"""
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            size, written = compress_file(path)
+            summary = ", ".join(f"{suffix}: {length} bytes" for suffix, length in written)
+            print(f"{os.path.relpath(path, static_dir)} ({size} bytes) -> {summary or 'skipped'}")
+
+    if not brotli:
+        print("brotli not installed, only gzip variants were built")
+
+if __name__ == "__main__":
+    build_static()
@@ -0,0 +1,153 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+Point = Tuple[float, float]
+
+class CoveragePlanner:
+    def __init__(self, lane_spacing: float, min_sweep_length: float = 50.0,
+                 arrival_tolerance: float = 25.0):
+        self.lane_spacing = lane_spacing            # cm between parallel sweeps
+        self.min_sweep_length = min_sweep_length    # cm, shorter free runs are skipped
+        self.arrival_tolerance = arrival_tolerance  # cm
+        self.area = None
+        self.sweeps: List[Tuple[Point, Point]] = []
+        self.sweep_index = 0
+        self.resume_point: Optional[Point] = None  # Where the current sweep continues
+
+    @property
+    def is_complete(self) -> bool:
+        return self.area is not None and self.sweep_index >= len(self.sweeps)
+
+    def plan(self, area: List[float], is_free: Callable[[np.ndarray], np.ndarray], resolution: float):
+        """Split an area (min_x, min_y, max_x, max_y) into boustrophedon sweeps around obstacles"""
+        min_x, min_y, max_x, max_y = area
+        lanes = np.arange(min_y + self.lane_spacing / 2, max_y, self.lane_spacing)
+        xs = np.arange(min_x, max_x + resolution / 2, resolution)
+
+        # Check every sample of every lane in one pass
+        samples = np.stack(np.broadcast_arrays(xs[None, :], lanes[:, None]), axis=-1)
+        free = is_free(samples.reshape(-1, 2)).reshape(len(lanes), len(xs))
+
+        sweeps = []
+        for i, (lane_y, lane_free) in enumerate(zip(lanes.tolist(), free)):
+            # Split the lane into runs of free samples, [start, stop) indices
+            edges = np.flatnonzero(np.diff(np.concatenate([[0], lane_free.astype(np.int8), [0]])))
+            lane_sweeps = [
+                ((float(xs[start]), lane_y), (float(xs[stop - 1]), lane_y))
+                for start, stop in edges.reshape(-1, 2).tolist()
+                if xs[stop - 1] - xs[start] >= self.min_sweep_length
+            ]
+            # Alternate direction lane by lane
+            if i % 2 == 1:
+                lane_sweeps = [(end, start) for start, end in reversed(lane_sweeps)]
+            sweeps.extend(lane_sweeps)
+
+        self.area = list(area)
+        self.sweeps = sweeps
+        self.sweep_index = 0
+        self.resume_point = sweeps[0][0] if sweeps else None
+
+    def advance(self, position: List[float]):
+        """Record progress along the current sweep from the rover's position"""
+        if self.is_complete or self.area is None:
+            return
+
+        _, end = self.sweeps[self.sweep_index]
+        start = self.resume_point
+        seg_x = end[0] - start[0]
+        seg_y = end[1] - start[1]
+        length = math.hypot(seg_x, seg_y)
+        if length <= self.arrival_tolerance:
+            self._next_sweep()
+            return
+
+        # Project the rover onto the remaining part of the sweep
+        t = ((position[0] - start[0]) * seg_x + (position[1] - start[1]) * seg_y) / (length * length)
+        off_x = position[0] - (start[0] + t * seg_x)
+        off_y = position[1] - (start[1] + t * seg_y)
+        if t <= 0 or math.hypot(off_x, off_y) > self.arrival_tolerance:
+            return
+
+        if t * length >= length - self.arrival_tolerance:
+            self._next_sweep()
+        else:
+            self.resume_point = (start[0] + t * seg_x, start[1] + t * seg_y)
+
+    def _next_sweep(self):
+        self.sweep_index += 1
+        self.resume_point = self.sweeps[self.sweep_index][0] if not self.is_complete else None
+
+    def _upcoming_points(self):
+        """Yield (point, on_sweep) for the rest of the plan, on_sweep marks sweep ends"""
+        if self.is_complete or self.area is None:
+            return
+        yield self.resume_point, False
+        yield self.sweeps[self.sweep_index][1], True
+        for start, end in self.sweeps[self.sweep_index + 1:]:
+            yield start, False
+            yield end, True
+
+    def next_leg(self, position: List[float], range_budget: float,
+                 charging_station: Optional[List[float]] = None, max_waypoints: int = 10) -> List[Point]:
+        """Get the next waypoints that still leave enough range to reach the charging station"""
+        def return_distance(point):
+            if charging_station is None:
+                return 0.0
+            return math.hypot(point[0] - charging_station[0], point[1] - charging_station[1])
+
+        leg = []
+        remaining = range_budget
+        cursor = (float(position[0]), float(position[1]))
+        for point, on_sweep in self._upcoming_points():
+            if len(leg) >= max_waypoints:
+                break
+            distance = math.hypot(point[0] - cursor[0], point[1] - cursor[1])
+            if distance <= self.arrival_tolerance and not leg:
+                continue  # Already there
+            if distance + return_distance(point) <= remaining:
+                leg.append(point)
+                remaining -= distance
+                cursor = point
+                continue
+
+            # Only sweeps are cut short, transits to a new sweep wait for a recharge
+            if on_sweep:
+                cut = self._cut_distance(cursor, point, distance, remaining, charging_station)
+                if cut >= self.min_sweep_length:
+                    ratio = cut / distance
+                    leg.append((cursor[0] + (point[0] - cursor[0]) * ratio,
+                                cursor[1] + (point[1] - cursor[1]) * ratio))
+            break
+        return leg
+
+    def _cut_distance(self, cursor: Point, point: Point, distance: float, budget: float,
+                      charging_station: Optional[List[float]]) -> float:
+        """Farthest distance s toward point with s + (return distance from there) <= budget"""
+        if charging_station is None:
+            return min(max(budget, 0.0), distance)
+
+        # Solve s + |w + s*u| = budget, where w runs from the station to the cursor
+        ux = (point[0] - cursor[0]) / distance
+        uy = (point[1] - cursor[1]) / distance
+        wx = cursor[0] - charging_station[0]
+        wy = cursor[1] - charging_station[1]
+        denominator = 2 * (wx * ux + wy * uy + budget)
+        if denominator <= 0:
+            return 0.0
+        s = (budget * budget - (wx * wx + wy * wy)) / denominator
+        return min(max(s, 0.0), distance)
+
+    def progress(self) -> Dict:
+        """Get coverage progress by swept length"""
+        lengths = [math.hypot(end[0] - start[0], end[1] - start[1]) for start, end in self.sweeps]
+        done = sum(lengths[:self.sweep_index])
+        if not self.is_complete and self.resume_point is not None:
+            start = self.sweeps[self.sweep_index][0]
+            done += math.hypot(self.resume_point[0] - start[0], self.resume_point[1] - start[1])
+        total = sum(lengths)
+        return {
+            "sweeps_done": min(self.sweep_index, len(self.sweeps)),
+            "sweeps_total": len(self.sweeps),
+            "fraction": done / total if total else 1.0
+        }
@@ -0,0 +1,229 @@
+import argparse
+import random
+import threading
+import time
+import numpy as np
+from sensor_fusion import SENSOR_TYPE_CODES, SensorFusionSystem, SensorReading, SensorType
+from shared_fusion import FusionSession, SharedFusionStore
+
+def linear_scan_association(fusion, position):
+    """Reference association: the original loop over every detection with _is_nearby"""
+    for detection in fusion.survivor_detections:
+        if fusion._is_nearby(position, detection['position']):
+            return detection
+    return None
+
+def build_fusion(num_detections, half_size=None, seed=0):
+    """Fusion system with detections scattered over a rubble field, spaced beyond the association radius"""
+    rng = random.Random(seed)
+    fusion = SensorFusionSystem()
+    # One detection per 3 m square keeps most of them out of each other's merge radius
+    half_size = half_size or 1.5 * fusion.merge_radius * np.sqrt(num_detections)
+    while len(fusion.detections_by_id) < num_detections:
+        position = (rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size))
+        fusion.add_sensor_reading(SensorReading(SensorType.RFID, 0.9, 0.0, position, rng.random()))
+    # Settle the seeded field, merged detections move and get checked again
+    while fusion.recluster():
+        pass
+    return fusion, half_size
+
+def benchmark_association(counts=(10000, 50000), num_readings=2000, seed=0):
+    """Compare the spatial hash against the linear scan when associating new readings"""
+    print("detections  linear us/reading  indexed us/reading  speedup  matches")
+    for count in counts:
+        fusion, half_size = build_fusion(count, seed=seed)
+        rng = random.Random(seed + 1)
+        positions = [(rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size))
+                     for _ in range(num_readings)]
+
+        # Only a slice of the readings for the slow reference
+        reference = positions[:max(1, num_readings // 10)]
+        start = time.perf_counter()
+        expected = [linear_scan_association(fusion, position) for position in reference]
+        linear = (time.perf_counter() - start) / len(reference)
+
+        start = time.perf_counter()
+        found = []
+        for position in positions:
+            nearby = fusion.detection_index.query_radius(position, fusion.association_radius)
+            found.append(fusion.detections_by_id[min(nearby)] if nearby else None)
+        indexed = (time.perf_counter() - start) / len(positions)
+
+        matches = sum(a is b for a, b in zip(expected, found))
+        print(f"{count:>10}  {linear * 1e6:>17.1f}  {indexed * 1e6:>18.2f}  {linear / indexed:>6.0f}x  "
+              f"{matches}/{len(reference)}")
+
+def benchmark_ingestion(num_detections=10000, num_readings=20000, seed=0):
+    """Time add_sensor_reading end to end with a large detection set"""
+    fusion, half_size = build_fusion(num_detections, seed=seed)
+    rng = random.Random(seed + 2)
+    readings = [SensorReading(SensorType.IR, 0.9, 1.0 + i * 0.001,
+                              (rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size)),
+                              rng.random())
+                for i in range(num_readings)]
+    start = time.perf_counter()
+    for reading in readings:
+        fusion.add_sensor_reading(reading)
+    elapsed = time.perf_counter() - start
+    print(f"add_sensor_reading with {num_detections} detections: {elapsed / num_readings * 1e6:.1f} us/reading, "
+          f"{num_readings / elapsed:,.0f} readings/s, {len(fusion.survivor_detections)} detections after")
+
+def build_mission_log(num_readings, hit_rate=0.001, rate=1000.0, seed=0):
+    """Columnar mission recording, mostly below-threshold readings with a few survivor hits"""
+    rng = np.random.default_rng(seed)
+    type_codes = rng.integers(0, len(SENSOR_TYPE_CODES), num_readings)
+    timestamps = np.arange(num_readings) / rate
+    ultrasonic = type_codes == SENSOR_TYPE_CODES[SensorType.ULTRASONIC]
+    accelerometer = type_codes == SENSOR_TYPE_CODES[SensorType.ACCELEROMETER]
+    values = np.where(ultrasonic, rng.uniform(250, 400, num_readings),
+                      np.where(accelerometer, rng.uniform(0, 1.5, num_readings), rng.uniform(0, 0.4, num_readings)))
+    hits = rng.random(num_readings) < hit_rate
+    values[hits] = np.where(ultrasonic[hits], 50.0, np.where(accelerometer[hits], 3.0, 0.95))
+    xs = rng.uniform(-5000, 5000, num_readings)
+    ys = rng.uniform(-5000, 5000, num_readings)
+    confidences = rng.random(num_readings)
+    return type_codes, values, timestamps, xs, ys, confidences
+
+def benchmark_batch_ingestion(num_readings=1000000, batch_size=50000, seed=0):
+    """Replay a recorded mission one reading at a time and in columnar batches"""
+    log = build_mission_log(num_readings, seed=seed)
+    type_codes, values, timestamps, xs, ys, confidences = log
+    sensor_types = list(SensorType)
+
+    # A slice is enough to measure the per-reading path
+    count = min(num_readings, 100000)
+    readings = [SensorReading(sensor_types[type_codes[i]], float(values[i]), float(timestamps[i]),
+                              (float(xs[i]), float(ys[i])), float(confidences[i])) for i in range(count)]
+    single = SensorFusionSystem()
+    start = time.perf_counter()
+    for reading in readings:
+        single.add_sensor_reading(reading)
+    single_rate = count / (time.perf_counter() - start)
+
+    batched = SensorFusionSystem()
+    start = time.perf_counter()
+    hits = 0
+    for offset in range(0, num_readings, batch_size):
+        hits += batched.add_sensor_readings_batch(*(column[offset:offset + batch_size] for column in log))
+    batch_rate = num_readings / (time.perf_counter() - start)
+    print(f"add_sensor_reading: {single_rate:,.0f} readings/s | add_sensor_readings_batch: {batch_rate:,.0f} "
+          f"readings/s ({hits} hits, {len(batched.survivor_detections)} detections)")
+
+def benchmark_priority_survivors(num_detections=10000, num_calls=2000, seed=0):
+    """Compare the heap-backed top-k against sorting every detection per call"""
+    fusion, _ = build_fusion(num_detections, seed=seed)
+    current_time = fusion.current_time
+
+    start = time.perf_counter()
+    for _ in range(num_calls // 10):
+        expected = sorted(fusion.survivor_detections,
+                          key=lambda x: (x['confidence'], current_time - x['last_update']), reverse=True)[:5]
+    sorting = (time.perf_counter() - start) / (num_calls // 10)
+
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        found = fusion.get_priority_survivors(include_heatmap=False)
+    heap = (time.perf_counter() - start) / num_calls
+    print(f"get_priority_survivors with {num_detections} detections: sort {sorting * 1e6:.0f} us, "
+          f"heap {heap * 1e6:.1f} us, same order: {[d['id'] for d in found] == [d['id'] for d in expected]}")
+
+    # Controller cycles: a weak reading, then the default call with heatmap peaks, against
+    # rescanning the whole heatmap for peaks every cycle
+    rng = random.Random(seed + 2)
+    heatmap = fusion.heatmap
+    readings = [SensorReading(SensorType.IR, 0.6, current_time,
+                              (rng.uniform(-1500, 1500), rng.uniform(-1500, 1500)), 0.6)
+                for _ in range(2 * num_calls)]
+    start = time.perf_counter()
+    for reading in readings[:num_calls]:
+        fusion.add_sensor_reading(reading)
+        found = fusion.get_priority_survivors()
+    incremental = (time.perf_counter() - start) / num_calls
+
+    start = time.perf_counter()
+    for reading in readings[num_calls:num_calls + num_calls // 10]:
+        fusion.add_sensor_reading(reading)
+        heatmap._dirty.extend(heatmap._inside.tolist())
+        fusion.get_priority_survivors()
+    rescan = (time.perf_counter() - start) / (num_calls // 10)
+    print(f"reading + get_priority_survivors with heatmap peaks: incremental {incremental * 1e6:.1f} us, "
+          f"full rescan {rescan * 1e6:.0f} us, {len(heatmap.strong_peaks)} strong peaks")
+
+def benchmark_recluster(counts=(10000, 50000), num_fragments=200, seed=0):
+    """Time an incremental re-clustering pass after a few fragmented survivors, against a full pass"""
+    print("detections  fragments  incremental ms  full ms  merged")
+    for count in counts:
+        fusion, half_size = build_fusion(count, seed=seed)
+
+        # Split survivors: a second detection just past the association radius of an existing one
+        rng = random.Random(seed + 3)
+        for detection in rng.sample(fusion.survivor_detections, num_fragments):
+            angle = rng.uniform(0, 2 * np.pi)
+            offset = fusion.association_radius * 1.2
+            position = (detection['position'][0] + offset * np.cos(angle),
+                        detection['position'][1] + offset * np.sin(angle))
+            fusion._update_survivor_detection(SensorReading(SensorType.IR, 0.9, 0.0, position, 0.7))
+        start = time.perf_counter()
+        merged = fusion.recluster()
+        incremental = time.perf_counter() - start
+
+        # A full pass over every detection for comparison
+        fusion.touched_detections = set(fusion.detections_by_id)
+        start = time.perf_counter()
+        fusion.recluster()
+        full = time.perf_counter() - start
+        print(f"{count:>10}  {num_fragments:>9}  {incremental * 1e3:>14.2f}  {full * 1e3:>7.1f}  {merged:>6}")
+
+def benchmark_shared_store(num_rovers=32, readings_per_rover=5000, seed=0):
+    """Stream every rover's mission log into one shared store from its own thread, against
+    ingesting the merged log in one batch"""
+    sensor_types = list(SensorType)
+    logs = [build_mission_log(readings_per_rover, hit_rate=0.01, rate=100.0, seed=seed + rover)
+            for rover in range(num_rovers)]
+    # Replayed rovers run far faster than real time and drift apart, wait for every one of them
+    store = SharedFusionStore(max_skew=np.inf)
+    sessions = [FusionSession(store, f"rover-{rover}") for rover in range(num_rovers)]
+
+    def stream(session, log):
+        type_codes, values, timestamps, xs, ys, confidences = log
+        for i in range(len(values)):
+            session.add_sensor_reading(SensorReading(sensor_types[type_codes[i]], float(values[i]),
+                                                     float(timestamps[i]), (float(xs[i]), float(ys[i])),
+                                                     float(confidences[i])))
+        session.close()
+
+    threads = [threading.Thread(target=stream, args=(session, log)) for session, log in zip(sessions, logs)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    elapsed = time.perf_counter() - start
+
+    merged = SensorFusionSystem()
+    columns = [np.concatenate(column) for column in zip(*logs)]
+    merged.add_sensor_readings_batch(*columns, rover_ids=np.repeat(
+        np.array([f"rover-{rover}" for rover in range(num_rovers)], dtype=object), readings_per_rover))
+    shared = store.get_survivor_detections(min_confidence=0.0, include_heatmap=False)
+    expected = merged.get_survivor_detections(min_confidence=0.0, include_heatmap=False)
+    same = [(d['id'], d['position'], d['rovers']) for d in shared] == \
+           [(d['id'], d['position'], d['rovers']) for d in expected]
+    total = num_rovers * readings_per_rover
+    print(f"shared store, {num_rovers} rover threads: {total / elapsed:,.0f} readings/s, "
+          f"{len(shared)} detections, {sum(len(d['rovers']) > 1 for d in shared)} seen by several rovers, "
+          f"same as merged batch: {same}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark survivor detection fusion")
+    parser.add_argument("--counts", nargs="+", type=int, default=[10000, 50000])
+    parser.add_argument("--readings", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark_association(args.counts, args.readings, args.seed)
+    benchmark_ingestion(seed=args.seed)
+    benchmark_batch_ingestion(seed=args.seed)
+    benchmark_priority_survivors(seed=args.seed)
+    benchmark_recluster(args.counts, seed=args.seed)
+    benchmark_shared_store(seed=args.seed)
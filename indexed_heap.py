@@ -0,0 +1,91 @@
+import heapq
+from typing import Dict, Hashable, List, Tuple
+
+class IndexedHeap:
+    def __init__(self):
+        # Binary min-heap of [key, item_id], plus each item's slot in it
+        self.heap: List[list] = []
+        self.slots: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self.slots
+
+    def _swap(self, a: int, b: int):
+        self.heap[a], self.heap[b] = self.heap[b], self.heap[a]
+        self.slots[self.heap[a][1]] = a
+        self.slots[self.heap[b][1]] = b
+
+    def _sift_up(self, index: int):
+        while index > 0:
+            parent = (index - 1) // 2
+            if self.heap[index][0] >= self.heap[parent][0]:
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index: int):
+        size = len(self.heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self.heap[child][0] < self.heap[smallest][0]:
+                    smallest = child
+            if smallest == index:
+                break
+            self._swap(index, smallest)
+            index = smallest
+
+    def push(self, item_id: Hashable, key: Tuple):
+        """Insert an item, or move it if its key changed"""
+        index = self.slots.get(item_id)
+        if index is None:
+            self.heap.append([key, item_id])
+            self.slots[item_id] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return
+
+        old_key = self.heap[index][0]
+        self.heap[index][0] = key
+        if key < old_key:
+            self._sift_up(index)
+        elif key > old_key:
+            self._sift_down(index)
+
+    def remove(self, item_id: Hashable) -> bool:
+        """Remove an item, returns False if it was not queued"""
+        index = self.slots.get(item_id)
+        if index is None:
+            return False
+
+        last = len(self.heap) - 1
+        if index != last:
+            self._swap(index, last)
+        self.heap.pop()
+        del self.slots[item_id]
+        if index < len(self.heap):
+            # The former last item fills the hole, it may need to go either way
+            moved = self.heap[index][1]
+            self._sift_up(index)
+            self._sift_down(self.slots[moved])
+        return True
+
+    def top(self, count: int) -> List[Hashable]:
+        """Get the count smallest items in key order without popping, O(count log count)"""
+        found = []
+        # Best-first walk of the heap tree, a child can only follow its parent
+        frontier = [(self.heap[0][0], 0)] if self.heap and count > 0 else []
+        while frontier and len(found) < count:
+            _, index = heapq.heappop(frontier)
+            found.append(self.heap[index][1])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, (self.heap[child][0], child))
+        return found
+
+    def clear(self):
+        """Remove all items"""
+        self.heap.clear()
+        self.slots.clear()
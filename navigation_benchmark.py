@@ -0,0 +1,595 @@
+import argparse
+import math
+import platform
+import random
+import time
+import numpy as np
+from navigation_system import NavigationSystem
+from power_management import PowerManagementSystem, PowerMetrics
+from path_planner import DStarLite
+from tour_planner import TourPlanner
+from world_map import WorldMap
+
+def linear_scan_is_safe(obstacle_map, position, safe_distance):
+    """Reference safety check: scan every obstacle (the original obstacle_map loop)"""
+    for obs_pos in obstacle_map:
+        dx = position[0] - obs_pos[0]
+        dy = position[1] - obs_pos[1]
+        if math.sqrt(dx*dx + dy*dy) < safe_distance:
+            return False
+    return True
+
+def reference_optimize_path(navigation, target_position, battery_level):
+    """Reference zigzag planner: the original per-segment optimize_path loop with Bezier curves"""
+    def smooth_curve(start, end, num_points=5):
+        points = []
+        for i in range(num_points):
+            t = i / (num_points - 1)
+            x = (1-t)**2 * start[0] + 2*(1-t)*t * (start[0] + end[0])/2 + t**2 * end[0]
+            y = (1-t)**2 * start[1] + 2*(1-t)*t * (start[1] + end[1])/2 + t**2 * end[1]
+            points.append((x, y))
+        return points
+
+    def safe_alternative(target):
+        for distance in [navigation.safe_distance * 1.2, navigation.safe_distance * 1.5]:
+            for angle in [45, 90, 135, 180, 225, 270, 315]:
+                test_x = target[0] + distance * math.cos(math.radians(angle))
+                test_y = target[1] + distance * math.sin(math.radians(angle))
+                if navigation._is_position_safe([test_x, test_y]):
+                    return (test_x, test_y)
+        return None
+
+    path = []
+    current_pos = navigation.current_position
+    dx = target_position[0] - current_pos[0]
+    dy = target_position[1] - current_pos[1]
+    distance = math.sqrt(dx*dx + dy*dy)
+    segment_length = 50 if battery_level < 20 else 100
+    num_segments = max(1, int(distance / segment_length))
+    width = navigation.search_pattern_width
+    angle = navigation.current_pattern_angle
+
+    for i in range(num_segments):
+        base_x = current_pos[0] + (dx/num_segments) * (i+1)
+        base_y = current_pos[1] + (dy/num_segments) * (i+1)
+        turn = 90 if i % 2 == 0 else -90
+        zig_x = base_x + width * math.cos(math.radians(angle + turn))
+        zig_y = base_y + width * math.sin(math.radians(angle + turn))
+
+        if navigation._is_position_safe([zig_x, zig_y]):
+            path.append((zig_x, zig_y))
+        else:
+            alt_point = safe_alternative([zig_x, zig_y])
+            if alt_point:
+                path.append(alt_point)
+
+        if i < num_segments - 1:
+            next_base_x = current_pos[0] + (dx/num_segments) * (i+2)
+            next_base_y = current_pos[1] + (dy/num_segments) * (i+2)
+            path.extend(smooth_curve([zig_x, zig_y], [next_base_x, next_base_y]))
+    return path
+
+def build_navigation(num_obstacles, seed=0):
+    """Create a navigation system with randomly scattered obstacles"""
+    rng = random.Random(seed)
+    navigation = NavigationSystem()
+    half_size = navigation.map_size / 2
+    navigation.mark_obstacles([
+        [rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size)]
+        for _ in range(num_obstacles)
+    ])
+    return navigation
+
+def clutter_world(num_obstacles, rng, half_size):
+    """Obstacles scattered uniformly"""
+    return [[rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size)]
+            for _ in range(num_obstacles)]
+
+def corridor_world(num_obstacles, rng, half_size):
+    """Parallel walls 4 m apart with a doorway in every wall segment"""
+    wall_spacing = 400.0
+    walls = [y for y in np.arange(-half_size + wall_spacing, half_size, wall_spacing).tolist()]
+    doors = {wall: rng.uniform(-half_size, half_size - 150) for wall in walls}
+    obstacles = []
+    while len(obstacles) < num_obstacles:
+        wall = rng.choice(walls)
+        x = rng.uniform(-half_size, half_size)
+        if doors[wall] <= x <= doors[wall] + 150:
+            continue
+        obstacles.append([x, wall + rng.gauss(0, 5)])
+    return obstacles
+
+def rubble_world(num_obstacles, rng, half_size):
+    """Obstacles heaped in piles of varying size"""
+    num_piles = max(1, num_obstacles // 50)
+    piles = [(rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size), rng.uniform(20, 120))
+             for _ in range(num_piles)]
+    obstacles = []
+    for _ in range(num_obstacles):
+        x, y, spread = rng.choice(piles)
+        obstacles.append([x + rng.gauss(0, spread), y + rng.gauss(0, spread)])
+    return obstacles
+
+WORLD_GENERATORS = {"clutter": clutter_world, "corridors": corridor_world, "rubble": rubble_world}
+
+def build_world(kind, num_obstacles, seed=0):
+    """Create a navigation system over a seeded synthetic world"""
+    rng = random.Random(f"{kind}-{num_obstacles}-{seed}")
+    navigation = NavigationSystem()
+    half_size = navigation.map_size / 2
+    navigation.mark_obstacles(WORLD_GENERATORS[kind](num_obstacles, rng, half_size))
+    return navigation, rng
+
+def latency_percentiles(samples):
+    """p50, p90, p99 and max of latencies in seconds, as milliseconds"""
+    values = np.array(samples) * 1000
+    return np.percentile(values, [50, 90, 99]).tolist() + [float(values.max())]
+
+def time_each(function, arguments):
+    """Call function on every argument tuple, returns (results, latencies)"""
+    results = []
+    latencies = []
+    for args in arguments:
+        start = time.perf_counter()
+        results.append(function(*args))
+        latencies.append(time.perf_counter() - start)
+    return results, latencies
+
+def path_stats(navigation, start, path):
+    """Length of a path from start and whether it passes closer than the robot radius to an obstacle"""
+    points = np.array([start] + list(path), dtype=float)
+    length = float(np.sum(np.hypot(*np.diff(points, axis=0).T)))
+    samples = [points[:1]]
+    for a, b in zip(points[:-1], points[1:]):
+        count = max(2, int(np.hypot(*(b - a)) / (navigation.map_resolution / 2)) + 1)
+        samples.append(np.linspace(a, b, count))
+    clearance = navigation.clearance_map.clearance_at(np.vstack(samples))
+    return length, bool(np.any(clearance < navigation.robot_radius))
+
+def free_positions(navigation, rng, count):
+    """Random positions at least the safe distance from every obstacle"""
+    half_size = navigation.map_size / 2 - navigation.safe_distance
+    positions = []
+    for _ in range(count * 50):
+        position = [rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size)]
+        if navigation._is_position_safe(position):
+            positions.append(position)
+            if len(positions) == count:
+                break
+    return positions
+
+def benchmark_world(kind, num_obstacles, num_queries=200, num_plans=20, seed=0):
+    """Time the navigation hot paths on one synthetic world, returns report rows"""
+    navigation, rng = build_world(kind, num_obstacles, seed)
+    half_size = navigation.map_size / 2
+    rows = []
+
+    queries = [([rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size)],)
+               for _ in range(num_queries)]
+    _, latencies = time_each(navigation._is_position_safe, queries)
+    rows.append(("_is_position_safe", latencies, ""))
+
+    # Plans between random free positions, the rover is placed at each start
+    starts = free_positions(navigation, rng, num_plans)
+    targets = free_positions(navigation, rng, len(starts))
+    pairs = list(zip(starts, targets))
+    for name, plan in [
+        ("optimize_path", lambda target: navigation.optimize_path(target, 50)),
+        ("get_navigation_commands", lambda target: navigation.get_navigation_commands(target, 50).get("path", []))
+    ]:
+        if not pairs:
+            rows.append((name, [], "no free positions to plan between"))
+            continue
+        latencies = []
+        lengths = []
+        violations = 0
+        failures = 0
+        for start, target in pairs:
+            navigation.current_position = start
+            begin = time.perf_counter()
+            path = plan(target)
+            latencies.append(time.perf_counter() - begin)
+            if not path:
+                failures += 1
+                continue
+            length, violated = path_stats(navigation, start, path)
+            lengths.append(length)
+            violations += violated
+        mean_length = sum(lengths) / len(lengths) / 100 if lengths else 0.0
+        rows.append((name, latencies, f"mean length {mean_length:>6.1f} m | "
+                                      f"violations {violations:>3}/{len(pairs)} | no path {failures:>3}"))
+
+    # Sonar updates change the map, so they run last
+    readings = [([rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size)],
+                 rng.uniform(10, 500), rng.uniform(0, 360)) for _ in range(num_queries)]
+    latencies = []
+    for position, distance, angle in readings:
+        navigation.current_position = position
+        start = time.perf_counter()
+        navigation.process_ultrasonic_data(distance, angle)
+        latencies.append(time.perf_counter() - start)
+    rows.append(("process_ultrasonic_data", latencies, ""))
+    return rows
+
+def run_suite(worlds=tuple(WORLD_GENERATORS), counts=(100, 1000, 10000, 100000),
+              num_queries=200, num_plans=20, seed=0):
+    """Run the navigation benchmark over every world kind and obstacle count"""
+    print(f"{platform.platform()} | Python {platform.python_version()} | NumPy {np.__version__} | seed {seed}")
+    print(f"{'world':<10} {'obstacles':>9}  {'operation':<24} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8}")
+    for kind in worlds:
+        for count in counts:
+            for name, latencies, extra in benchmark_world(kind, count, num_queries, num_plans, seed):
+                if not latencies:
+                    print(f"{kind:<10} {count:>9}  {name:<24} {'-':>8} {'-':>8} {'-':>8} {'-':>8}  {extra}")
+                    continue
+                p50, p90, p99, worst = latency_percentiles(latencies)
+                print(f"{kind:<10} {count:>9}  {name:<24} {p50:>8.3f} {p90:>8.3f} {p99:>8.3f} "
+                      f"{worst:>8.3f}  {extra}")
+
+def time_queries(check, queries):
+    """Run a safety check over all queries, returns (results, seconds)"""
+    start = time.perf_counter()
+    results = [check(position) for position in queries]
+    return results, time.perf_counter() - start
+
+def benchmark_safety_checks(num_obstacles=10000, num_queries=2000, seed=0):
+    """Compare linear scan, spatial index and clearance lookup safety checks"""
+    navigation = build_navigation(num_obstacles, seed)
+    rng = random.Random(seed + 1)
+    half_size = navigation.map_size / 2
+    queries = [[rng.uniform(-half_size, half_size), rng.uniform(-half_size, half_size)]
+               for _ in range(num_queries)]
+
+    # Obstacles as the original dict keyed by position
+    obstacle_map = {tuple(position): 0 for position in navigation.obstacle_index.positions.values()}
+    safe_distance = navigation.safe_distance
+
+    linear, linear_time = time_queries(
+        lambda p: linear_scan_is_safe(obstacle_map, p, safe_distance), queries)
+    indexed, indexed_time = time_queries(
+        lambda p: not navigation.obstacle_index.any_within(p, safe_distance, strict=True), queries)
+    clearance, clearance_time = time_queries(navigation._is_position_safe, queries)
+
+    print(f"Obstacles: {len(obstacle_map)} | Queries: {num_queries}")
+    for name, results, seconds in [("linear scan", linear, linear_time),
+                                   ("spatial index", indexed, indexed_time),
+                                   ("clearance map", clearance, clearance_time)]:
+        mismatches = sum(a != b for a, b in zip(results, linear))
+        print(f"  {name:<14} {seconds * 1e6 / num_queries:>10.2f} us/query | "
+              f"speedup {linear_time / seconds:>8.1f}x | mismatches {mismatches}")
+
+def max_turn(start, path):
+    """Largest heading change, in degrees, at any waypoint of a path"""
+    points = np.array([start] + list(path), dtype=float)
+    chords = np.diff(points, axis=0)
+    chords = chords[np.hypot(*chords.T) > 1e-9]
+    if len(chords) < 2:
+        return 0.0
+    headings = np.arctan2(chords[:, 1], chords[:, 0])
+    return float(np.degrees(np.max(np.abs((np.diff(headings) + np.pi) % (2 * np.pi) - np.pi))))
+
+def benchmark_optimize_path(num_obstacles=2000, repeats=20, seed=0):
+    """Compare the spline-smoothed zigzag planner with the original loop"""
+    navigation = build_navigation(num_obstacles, seed)
+    navigation.current_position = [-1800.0, -1800.0]
+    navigation.current_pattern_angle = 45
+
+    print(f"Obstacles: {len(navigation.obstacle_index)}")
+    for target, battery in [([0.0, 0.0], 50), ([1800.0, 1800.0], 50), ([1800.0, 1800.0], 10)]:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            reference = reference_optimize_path(navigation, target, battery)
+        reference_time = (time.perf_counter() - start) / repeats
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            path = navigation.optimize_path(target, battery)
+        smoothed_time = (time.perf_counter() - start) / repeats
+
+        print(f"  target {target} battery {battery:>3}% | points {len(reference):>4} -> {len(path):>4} | "
+              f"max turn {max_turn(navigation.current_position, reference):>3.0f} -> "
+              f"{max_turn(navigation.current_position, path):>3.0f} deg | "
+              f"loop {reference_time * 1000:>7.2f} ms | smoothed {smoothed_time * 1000:>6.2f} ms")
+
+def benchmark_replanning(num_obstacles=2000, num_updates=200, seed=0):
+    """Compare full D* Lite plans with incremental repairs under a stream of sonar readings"""
+    navigation = build_navigation(num_obstacles, seed)
+    rng = random.Random(seed + 2)
+    target = [1500.0, 1500.0]
+    navigation.current_position = [-1500.0, -1500.0]
+    navigation.max_plan_expansions = None  # Time whole plans and repairs
+
+    start = time.perf_counter()
+    route = navigation.plan_route(target)
+    full_time = time.perf_counter() - start
+    if not route:
+        print("No route found, try another seed")
+        return
+
+    repair_times = []
+    for i in range(num_updates):
+        # Drive along the route while the sonar keeps reporting obstacles
+        if i % 10 == 0 and route:
+            navigation.update_position(list(route[0]), "forward")
+        navigation.process_ultrasonic_data(rng.uniform(10, 300), rng.uniform(0, 360))
+
+        start = time.perf_counter()
+        route = navigation.plan_route(target)
+        repair_times.append(time.perf_counter() - start)
+
+    # A fresh plan from the final state, for reference
+    start_cell, goal_cell = navigation._route_endpoints(target)
+    start = time.perf_counter()
+    DStarLite(navigation.planning_map, start_cell, goal_cell).plan()
+    fresh_time = time.perf_counter() - start
+
+    repair_times.sort()
+    mean_repair = sum(repair_times) / len(repair_times)
+    print(f"Obstacles: {len(navigation.obstacle_index)} | Sensor updates: {num_updates}")
+    print(f"  initial plan   {full_time * 1000:>8.2f} ms")
+    print(f"  fresh plan     {fresh_time * 1000:>8.2f} ms (final state)")
+    print(f"  repair mean    {mean_repair * 1000:>8.2f} ms ({mean_repair / fresh_time:.1%} of a fresh plan)")
+    print(f"  repair max     {repair_times[-1] * 1000:>8.2f} ms")
+
+RANDOM_WALK_MOVES = {"forward": (0, 1), "backward": (0, -1), "left": (-1, 0), "right": (1, 0)}
+
+class CoverageSimulator:
+    """Local kinematic rover: drives at travel speed, drains the battery and tracks swept area"""
+    def __init__(self, navigation, power, area, footprint_radius, cell_size=50.0, tick=2.0):
+        self.navigation = navigation
+        self.power = power
+        self.tick = tick  # seconds, the simulation loop moves every 2 s
+        self.footprint_radius = footprint_radius
+        self.battery_level = 100.0
+        self.battery_used = 0.0
+        self.clock = time.time()
+
+        # Free cells of the search area, the coverable area
+        xs = np.arange(area[0] + cell_size / 2, area[2], cell_size)
+        ys = np.arange(area[1] + cell_size / 2, area[3], cell_size)
+        self.cells = np.stack(np.meshgrid(xs, ys, indexing='ij'), axis=-1).reshape(-1, 2)
+        self.free = ~(navigation.clearance_map.clearance_at(self.cells) < navigation.robot_radius)
+        self.covered = np.zeros(len(self.cells), dtype=bool)
+        self.cell_area = (cell_size / 100) ** 2  # m^2
+        self._sweep_footprint(navigation.current_position)
+        self._report_power()
+
+    def _report_power(self):
+        consumption = self.power.calculate_power_consumption(True, True, True)
+        self.power.update_power_metrics(PowerMetrics(
+            battery_level=self.battery_level, power_consumption=consumption,
+            temperature=30.0, voltage=12.0, current=consumption / 12.0, timestamp=self.clock
+        ))
+
+    def _sweep_footprint(self, position):
+        d2 = np.sum((self.cells - np.asarray(position, dtype=float)) ** 2, axis=1)
+        self.covered |= d2 <= self.footprint_radius ** 2
+
+    def drive(self, path, direction="forward"):
+        """Drive along a path for one tick, stopping short of obstacles"""
+        remaining = self.navigation.travel_speed * self.tick
+        position = np.array(self.navigation.current_position, dtype=float)
+        for point in path:
+            if remaining <= 0:
+                break
+            offset = np.asarray(point, dtype=float) - position
+            distance = float(np.hypot(*offset))
+            step = min(distance, remaining)
+            if step <= 0:
+                continue
+            target = position + offset * (step / distance)
+            samples = np.linspace(position, target, max(2, int(step / 25) + 1))
+            if np.any(self.navigation.clearance_map.clearance_at(samples) < self.navigation.robot_radius):
+                break
+            for sample in samples:
+                self._sweep_footprint(sample)
+            position = target
+            remaining -= step
+        self.navigation.update_position(position.tolist(), direction)
+
+        # Driving or blocked, the tick costs the same energy
+        consumption = self.power.calculate_power_consumption(True, True, True)
+        drained = consumption * self.tick / 3600.0 / self.power.battery_capacity * 100.0
+        self.battery_level -= drained
+        self.battery_used += drained
+        self.clock += self.tick
+        self._report_power()
+
+    def recharge(self):
+        self.battery_level = 100.0
+        self._report_power()
+
+    @property
+    def covered_area(self) -> float:
+        return float(np.sum(self.covered & self.free)) * self.cell_area
+
+    @property
+    def free_area(self) -> float:
+        return float(np.sum(self.free)) * self.cell_area
+
+def build_search_world(num_rubble=40, seed=0, battery_capacity=100.0):
+    """Create a rubble field search area with the charging station at its center"""
+    rng = random.Random(seed)
+    navigation = NavigationSystem()
+    area = [-1000.0, -1000.0, 1000.0, 1000.0]
+    rubble = []
+    for _ in range(num_rubble):
+        cx, cy = rng.uniform(-950, 950), rng.uniform(-950, 950)
+        if math.hypot(cx, cy) < 150:
+            continue  # Keep the charging station reachable
+        rubble.extend([cx + rng.gauss(0, 25), cy + rng.gauss(0, 25)] for _ in range(8))
+    navigation.mark_obstacles(rubble)
+
+    power = PowerManagementSystem()
+    power.battery_capacity = battery_capacity
+    power.set_charging_station([0.0, 0.0])
+    return navigation, power, area
+
+def run_random_walk(simulator, rng):
+    """The simulation loop's behavior: a random direction every tick until the battery runs low"""
+    while simulator.battery_level > simulator.power.RECHARGE_START:
+        direction = rng.choice(list(RANDOM_WALK_MOVES))
+        dx, dy = RANDOM_WALK_MOVES[direction]
+        x, y = simulator.navigation.current_position
+        step = simulator.navigation.travel_speed * simulator.tick
+        simulator.drive([(x + dx * step, y + dy * step)], direction)
+
+def run_coverage(simulator, area, max_charges=1, max_ticks=100000):
+    """Follow the coverage sweeps, returning to the station and resuming when the budget runs out"""
+    navigation = simulator.navigation
+    navigation.start_coverage(area)
+    charges = 0
+    for _ in range(max_ticks):
+        budget = simulator.power.estimate_travel_range(navigation.travel_speed)
+        command = navigation.get_coverage_commands(budget, simulator.power.charging_station_location)
+        if command["command"] == "move":
+            simulator.drive(command["path"])
+        elif command["command"] == "return_to_charge":
+            station = simulator.power.charging_station_location
+            while math.hypot(navigation.current_position[0] - station[0],
+                             navigation.current_position[1] - station[1]) > 1.0:
+                route = navigation.find_route(station) or [tuple(station)]
+                simulator.drive(route)
+            charges += 1
+            if charges >= max_charges:
+                break
+            simulator.recharge()
+        else:
+            break
+    return charges
+
+def benchmark_coverage(num_rubble=40, seed=0):
+    """Compare area covered per percent of battery for the random walk and the coverage sweeps"""
+    print(f"Search area 20x20 m, {num_rubble} rubble piles")
+
+    navigation, power, area = build_search_world(num_rubble, seed)
+    simulator = CoverageSimulator(navigation, power, area, navigation.search_pattern_width / 2)
+    run_random_walk(simulator, random.Random(seed))
+    random_rate = simulator.covered_area / simulator.battery_used
+    print(f"  random walk    {simulator.covered_area:>7.1f} of {simulator.free_area:.1f} m^2 | "
+          f"battery {simulator.battery_used:>5.1f}% | {random_rate:>6.2f} m^2/%")
+
+    navigation, power, area = build_search_world(num_rubble, seed)
+    simulator = CoverageSimulator(navigation, power, area, navigation.search_pattern_width / 2)
+    run_coverage(simulator, area)
+    coverage_rate = simulator.covered_area / simulator.battery_used
+    print(f"  coverage       {simulator.covered_area:>7.1f} of {simulator.free_area:.1f} m^2 | "
+          f"battery {simulator.battery_used:>5.1f}% | {coverage_rate:>6.2f} m^2/% "
+          f"({coverage_rate / random_rate:.1f}x)")
+
+    # A small battery forces several returns, sweeps resume where they stopped
+    navigation, power, area = build_search_world(num_rubble, seed, battery_capacity=4.0)
+    simulator = CoverageSimulator(navigation, power, area, navigation.search_pattern_width / 2)
+    charges = run_coverage(simulator, area, max_charges=20)
+    progress = navigation.coverage_planner.progress()
+    print(f"  small battery  {simulator.covered_area:>7.1f} of {simulator.free_area:.1f} m^2 | "
+          f"{charges} returns to charge | sweeps {progress['sweeps_done']}/{progress['sweeps_total']}")
+
+# Pioneer 3-AT sonar ring, degrees from the heading: front so0-so7, rear so8-so15
+PIONEER_SONAR_ANGLES = [90, 50, 30, 10, -10, -30, -50, -90, -90, -130, -150, -170, 170, 150, 130, 90]
+
+def benchmark_sonar_scan(num_obstacles=2000, num_scans=500, timestep=16, seed=0):
+    """Compare batch sonar ring ingestion with one reading at a time, against the Webots step"""
+    rng = random.Random(seed + 3)
+    scans = []
+    for i in range(num_scans):
+        pose = [rng.uniform(-1500, 1500), rng.uniform(-1500, 1500), rng.uniform(0, 360)]
+        scans.append((pose, [rng.uniform(20, 500) for _ in PIONEER_SONAR_ANGLES]))
+
+    navigation = build_navigation(num_obstacles, seed)
+    start = time.perf_counter()
+    for pose, distances in scans:
+        navigation.current_position = pose[:2]
+        for distance, angle in zip(distances, PIONEER_SONAR_ANGLES):
+            navigation.process_ultrasonic_data(distance, angle + pose[2])
+    single_time = (time.perf_counter() - start) / num_scans
+
+    navigation = build_navigation(num_obstacles, seed)
+    start = time.perf_counter()
+    for pose, distances in scans:
+        navigation.process_ultrasonic_scan(distances, PIONEER_SONAR_ANGLES, pose)
+    batch_time = (time.perf_counter() - start) / num_scans
+
+    print(f"Sonar ring: {len(PIONEER_SONAR_ANGLES)} beams | Scans: {num_scans}")
+    print(f"  one at a time  {single_time * 1000:>7.3f} ms/scan")
+    print(f"  batch          {batch_time * 1000:>7.3f} ms/scan | speedup {single_time / batch_time:.1f}x | "
+          f"{batch_time * 1000 / timestep:.1%} of a {timestep} ms Webots step")
+
+def benchmark_tour_planning(counts=(100, 300, 500), num_additions=20, seed=0):
+    """Time survivor tour construction and incremental updates, and the gain over nearest neighbor"""
+    station = [0.0, 0.0]
+    for count in counts:
+        rng = random.Random(seed + count)
+        targets = {i: [rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)] for i in range(count)}
+
+        greedy = TourPlanner(max_passes=0)
+        greedy.sync(targets, station, station)
+        planner = TourPlanner()
+        start = time.perf_counter()
+        planner.sync(targets, station, station)
+        build_time = time.perf_counter() - start
+
+        update_times = []
+        for i in range(num_additions):
+            targets[count + i] = [rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)]
+            start = time.perf_counter()
+            planner.sync(targets, station, station)
+            update_times.append(time.perf_counter() - start)
+
+        # Legs for a battery that drives 150 m per charge
+        stops = planner.get_stops(station, 15000, 15000, station)
+        charges = sum(stop["type"] == "charging_station" for stop in stops[:-1])
+        print(f"  {count:>4} survivors | build {build_time * 1000:>6.1f} ms | "
+              f"add one {sum(update_times) / num_additions * 1000:>5.1f} ms | "
+              f"nearest neighbor {greedy.length(station, station) / 100:>6.0f} m -> "
+              f"{planner.length(station, station) / 100:>6.0f} m | {charges} charging stops")
+
+def benchmark_world_map(num_steps=200000, max_cells=50000, seed=0):
+    """Drive a long mission through the world map and check memory stays under the cap"""
+    rng = random.Random(seed + 4)
+    world_map = WorldMap(max_cells=max_cells)
+    x = y = 0.0
+    start = time.perf_counter()
+    for step in range(num_steps):
+        # A long drift with local wandering, sonar hits around the rover
+        x += rng.uniform(-5, 15)
+        y += rng.uniform(-5, 10)
+        world_map.set_focus([x, y], step * 0.5)
+        world_map.add_path_point([x, y])
+        if step % 3 == 0:
+            world_map.add_obstacle([x + rng.uniform(-400, 400), y + rng.uniform(-400, 400)])
+    update_time = (time.perf_counter() - start) / num_steps
+
+    start = time.perf_counter()
+    region = world_map.query_bbox(x - 2000, y - 2000, x + 2000, y + 2000)
+    query_time = time.perf_counter() - start
+
+    stats = world_map.get_stats()
+    print(f"Mission: {num_steps} updates over {math.hypot(x, y) / 100:.0f} m | cap {max_cells} cells")
+    print(f"  stored cells {stats['cells']:>7} in {stats['chunks']} chunks "
+          f"(flat storage would hold {num_steps + num_steps // 3}) | "
+          f"coarsenings {stats['coarsenings']} | evictions {stats['evictions']}")
+    print(f"  update {update_time * 1e6:>6.2f} us | 40x40 m box query {query_time * 1000:.2f} ms "
+          f"({len(region['obstacles'])} obstacles, {len(region['path'])} trail cells)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark navigation on seeded synthetic worlds")
+    parser.add_argument("--worlds", nargs="+", choices=list(WORLD_GENERATORS), default=list(WORLD_GENERATORS))
+    parser.add_argument("--counts", nargs="+", type=int, default=[100, 1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200, help="safety checks and sonar readings per world")
+    parser.add_argument("--plans", type=int, default=20, help="planned paths per world")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--components", action="store_true", help="also run the component benchmarks")
+    args = parser.parse_args()
+
+    run_suite(args.worlds, args.counts, args.queries, args.plans, args.seed)
+    if args.components:
+        for count in [10000, 50000]:
+            benchmark_safety_checks(num_obstacles=count)
+        benchmark_optimize_path()
+        benchmark_replanning(seed=1)
+        benchmark_coverage()
+        benchmark_sonar_scan()
+        benchmark_tour_planning()
+        benchmark_world_map()
@@ -2,13 +2,39 @@ import math
 from typing import List, Tuple, Dict, Optional
 import numpy as np
 import time
+from collections import deque
+from occupancy_grid import OccupancyGrid, ClearanceMap
+from spatial_index import SpatialHash
+from path_planner import CoarseCostMap, CostMap, DStarLite, astar, simplify_path
+from plan_cache import PlanCache
+from coverage_planner import CoveragePlanner
+from world_map import WorldMap
+from path_smoothing import smooth_path
 
 class NavigationSystem:
     def __init__(self):
         self.obstacle_threshold = 50  # cm
         self.safe_distance = 100  # cm
-        self.path_history = []
-        self.obstacle_map = {}
+        self.robot_radius = 30  # cm, grid cells closer than this to an obstacle are impassable
+        self.path_history = deque(maxlen=1000)  # Recent trail, older visits live in the world map
+        self.map_size = 4000  # cm, square area centered on the start position
+        self.map_resolution = 10  # cm per occupancy grid cell
+        self.occupancy_grid = OccupancyGrid(self.map_size, self.map_size, self.map_resolution)
+        # Occupied cells bucketed by safe distance, so safety checks touch only nearby cells
+        self.obstacle_index = SpatialHash(cell_size=self.safe_distance)
+        # Distance to the nearest obstacle per cell, turns most safety checks into a lookup
+        self.clearance_map = ClearanceMap(self.occupancy_grid, max_distance=2 * self.safe_distance)
+        # Grid planner costs and the incremental route toward the current target
+        self.cost_map = CostMap(self.clearance_map, self.robot_radius, self.safe_distance)
+        # Routes are searched on coarser blocks of the cost map, and give up after
+        # max_plan_expansions cells so a hopeless query cannot stall a command
+        self.planning_resolution = 30  # cm per planning cell
+        self.planning_map = CoarseCostMap(self.cost_map, self.planning_resolution // self.map_resolution)
+        self.max_plan_expansions = 20000
+        self.route_planner = None
+        # Memory-capped mission map, full detail near the rover, coarser far away and when stale
+        self.world_map = WorldMap(resolution=self.map_resolution)
+        self.sensor_max_range = 400  # cm, beams are traced up to this range
         self.current_position = [0, 0]
         self.current_direction = "forward"
         self.search_pattern_width = 200  # cm
@@ -16,30 +42,106 @@ class NavigationSystem:
         self.last_turn_time = 0
         self.turn_interval = 5  # seconds
         self.current_pattern_angle = 0
+        self.travel_speed = 30  # cm/s
+        self.max_turn_rate = 90  # degrees/s
+        self.max_heading_change = 45  # degrees between consecutive smoothed waypoints
+        
+        # Boustrophedon sweeps for search mode, one search pattern width apart
+        self.coverage_planner = CoveragePlanner(lane_spacing=self.search_pattern_width)
+        
+        # Paths reused while position cell, target, battery band and nearby obstacles are unchanged
+        self.obstacle_version = 0
+        self.plan_cache = PlanCache(
+            capacity=256,
+            # Farthest an obstacle change can affect a zigzag plan: zig offset,
+            # alternative point distance and the safe distance around it
+            bucket_size=self.search_pattern_width + 2.5 * self.safe_distance
+        )
         
     def process_ultrasonic_data(self, distance: float, angle: float) -> Dict:
         """Process ultrasonic sensor data to detect obstacles"""
-        if distance < self.obstacle_threshold:
-            # Calculate obstacle position relative to rover
-            obstacle_x = self.current_position[0] + distance * math.cos(math.radians(angle))
-            obstacle_y = self.current_position[1] + distance * math.sin(math.radians(angle))
-            
-            # Update obstacle map
-            self.obstacle_map[(round(obstacle_x), round(obstacle_y))] = distance
-            
+        # Calculate beam end position relative to rover
+        beam_length = min(distance, self.sensor_max_range)
+        end_x = self.current_position[0] + beam_length * math.cos(math.radians(angle))
+        end_y = self.current_position[1] + beam_length * math.sin(math.radians(angle))
+        
+        # Cells along the beam are free, any echo within range marks the cell it came from,
+        # only close ones are reported to the caller
+        changed = self.occupancy_grid.update_beam(self.current_position, [end_x, end_y],
+                                                  distance < self.sensor_max_range)
+        self._sync_obstacle_maps(changed)
+        obstacle_detected = distance < self.obstacle_threshold
+        
+        if obstacle_detected:
             return {
                 "obstacle_detected": True,
                 "distance": distance,
                 "angle": angle,
-                "position": [obstacle_x, obstacle_y]
+                "position": [end_x, end_y]
             }
         return {"obstacle_detected": False}
+
+    def process_ultrasonic_scan(self, distances, angles, pose: Optional[List[float]] = None) -> Dict:
+        """Process a whole sonar sweep, angles relative to the pose heading (x, y, heading)"""
+        if pose is None:
+            pose = [self.current_position[0], self.current_position[1], 0.0]
+        distances = np.asarray(distances, dtype=float).reshape(-1)
+        angles = np.asarray(angles, dtype=float).reshape(-1)
+
+        # Beam end positions for every sensor in one step
+        beam_lengths = np.minimum(distances, self.sensor_max_range)
+        world_angles = np.radians(angles + pose[2])
+        ends = np.empty((len(distances), 2))
+        ends[:, 0] = pose[0] + beam_lengths * np.cos(world_angles)
+        ends[:, 1] = pose[1] + beam_lengths * np.sin(world_angles)
+
+        # Same as process_ultrasonic_data, every echo within range marks its cell
+        changed = self.occupancy_grid.update_beams(pose[:2], ends, distances < self.sensor_max_range)
+        self._sync_obstacle_maps(changed)
+        obstacle_detected = distances < self.obstacle_threshold
+
+        hits = np.flatnonzero(obstacle_detected)
+        return {
+            "obstacle_detected": bool(len(hits)),
+            "obstacles": [
+                {"distance": distance, "angle": angle, "position": position}
+                for distance, angle, position in zip(
+                    distances[hits].tolist(), angles[hits].tolist(), ends[hits].tolist()
+                )
+            ]
+        }
+
+    def mark_obstacles(self, positions: List[List[float]]):
+        """Mark known obstacle positions (e.g. from a prior map) as occupied"""
+        changed = self.occupancy_grid.update_points(positions, hit=True)
+        self._sync_obstacle_maps(changed)
+    
+    def _sync_obstacle_maps(self, changed_cells: List[Tuple[int, int]]):
+        """Sync the obstacle index and clearance map with cells whose occupancy changed"""
+        if not changed_cells:
+            return
+            
+        self.obstacle_version += 1
+        self.plan_cache.invalidate_near(self.occupancy_grid.cell_to_world(changed_cells))
+        self.clearance_map.update(changed_cells)
+        changed_costs = self.planning_map.refresh(self.cost_map.refresh(changed_cells))
+        if self.route_planner and changed_costs:
+            self.route_planner.update_costs(changed_costs)
+            
+        cells = np.array(changed_cells)
+        occupied = self.occupancy_grid.is_cell_occupied(cells)
+        positions = self.occupancy_grid.cell_to_world(cells)
+        for cell, position, is_occupied in zip(changed_cells, positions, occupied):
+            if is_occupied:
+                self.obstacle_index.insert(cell, position)
+                self.world_map.add_obstacle(position)
+            else:
+                self.obstacle_index.remove(cell)
+                self.world_map.remove_obstacle(position)
     
     def optimize_path(self, target_position: List[float], battery_level: float) -> List[Tuple[float, float]]:
         """Optimize path using zigzag pattern and avoiding straight lines"""
-        path = []
-        current_pos = self.current_position.copy()
-        current_time = time.time()
+        current_pos = self.current_position
         
         # Calculate direct path
         dx = target_position[0] - current_pos[0]
@@ -54,102 +156,265 @@ class NavigationSystem:
             
         num_segments = max(1, int(distance / segment_length))
         
-        # Generate zigzag path
-        for i in range(num_segments):
-            # Calculate base position for this segment
-            base_x = current_pos[0] + (dx/num_segments) * (i+1)
-            base_y = current_pos[1] + (dy/num_segments) * (i+1)
-            
-            # Add zigzag points
-            if i % 2 == 0:
-                # Zig right
-                zig_x = base_x + self.search_pattern_width * math.cos(math.radians(self.current_pattern_angle + 90))
-                zig_y = base_y + self.search_pattern_width * math.sin(math.radians(self.current_pattern_angle + 90))
-            else:
-                # Zag left
-                zig_x = base_x + self.search_pattern_width * math.cos(math.radians(self.current_pattern_angle - 90))
-                zig_y = base_y + self.search_pattern_width * math.sin(math.radians(self.current_pattern_angle - 90))
-                
-            # Check if zigzag point is safe
-            if self._is_position_safe([zig_x, zig_y]):
-                path.append((zig_x, zig_y))
-            else:
-                # Find alternative safe point
-                alt_point = self._find_safe_alternative([zig_x, zig_y])
-                if alt_point:
-                    path.append(alt_point)
-                    
-            # Add intermediate points for smoother movement
-            if i < num_segments - 1:
-                next_base_x = current_pos[0] + (dx/num_segments) * (i+2)
-                next_base_y = current_pos[1] + (dy/num_segments) * (i+2)
-                path.extend(self._generate_smooth_curve(
-                    [zig_x, zig_y],
-                    [next_base_x, next_base_y]
-                ))
-                
-        return path
-    
-    def _generate_smooth_curve(self, start: List[float], end: List[float]) -> List[Tuple[float, float]]:
-        """Generate smooth curve between two points"""
-        curve_points = []
-        num_points = 5
-        
-        for i in range(num_points):
-            t = i / (num_points - 1)
-            # Use quadratic Bezier curve for smooth movement
-            x = (1-t)**2 * start[0] + 2*(1-t)*t * (start[0] + end[0])/2 + t**2 * end[0]
-            y = (1-t)**2 * start[1] + 2*(1-t)*t * (start[1] + end[1])/2 + t**2 * end[1]
-            curve_points.append((x, y))
-            
-        return curve_points
+        # Base position of every segment, plus the one after the last
+        steps = np.arange(1, num_segments + 2, dtype=float)
+        base = np.empty((num_segments + 1, 2))
+        base[:, 0] = current_pos[0] + (dx/num_segments) * steps
+        base[:, 1] = current_pos[1] + (dy/num_segments) * steps
+        
+        # Zig right on even segments, zag left on odd ones
+        zig_offsets = np.array([
+            [self.search_pattern_width * math.cos(math.radians(self.current_pattern_angle + 90)),
+             self.search_pattern_width * math.sin(math.radians(self.current_pattern_angle + 90))],
+            [self.search_pattern_width * math.cos(math.radians(self.current_pattern_angle - 90)),
+             self.search_pattern_width * math.sin(math.radians(self.current_pattern_angle - 90))]
+        ])
+        zigs = base[:-1] + zig_offsets[np.arange(num_segments) % 2]
+        
+        # Replace unsafe zigzag points with a safe alternative where one exists
+        points = zigs.copy()
+        has_point = self._are_positions_safe(zigs)
+        unsafe = np.flatnonzero(~has_point)
+        if len(unsafe):
+            points[unsafe], has_point[unsafe] = self._find_safe_alternatives(zigs[unsafe])
+        
+        # Each segment visits its point, then heads for the next base position
+        controls = np.concatenate([points[:, None, :], base[1:, None, :]], axis=1)
+        keep = np.ones(controls.shape[:2], dtype=bool)
+        keep[:, 0] = has_point
+        keep[-1, 1] = False
+        
+        # Fit a spline through them, sampled densely only where the path turns
+        waypoints, _ = smooth_path(
+            np.vstack([[current_pos], controls[keep]]),
+            max_heading_change=self.max_heading_change,
+            max_spacing=self.search_pattern_width
+        )
+        return list(zip(waypoints[:, 0].tolist(), waypoints[:, 1].tolist()))
     
     def _is_position_safe(self, position: List[float]) -> bool:
         """Check if a position is safe from obstacles"""
-        for obs_pos, distance in self.obstacle_map.items():
-            dx = position[0] - obs_pos[0]
-            dy = position[1] - obs_pos[1]
-            dist = math.sqrt(dx*dx + dy*dy)
-            if dist < self.safe_distance:
+        clearance = self.clearance_map.lookup(position)
+        if clearance is not None:
+            # Clearance is measured from the cell center, the position may be
+            # up to half a cell diagonal away from it
+            margin = self.clearance_map.cell_half_diagonal + 1e-3
+            if clearance - margin >= self.safe_distance:
+                return True
+            if clearance + margin < self.safe_distance:
                 return False
-        return True
+                
+        # Near the safe distance boundary (or off the map) use the exact check
+        return not self.obstacle_index.any_within(position, self.safe_distance, strict=True)
+    
+    def _are_positions_safe(self, positions: np.ndarray) -> np.ndarray:
+        """Check which of many positions (N, 2) are safe from obstacles"""
+        clearance = self.clearance_map.clearance_at(positions)
+        margin = self.clearance_map.cell_half_diagonal + 1e-3
+        safe = clearance - margin >= self.safe_distance
+        unsafe = clearance + margin < self.safe_distance
+        
+        # Same boundary and off-map fallback as _is_position_safe
+        for index in np.flatnonzero(~(safe | unsafe)):
+            safe[index] = not self.obstacle_index.any_within(positions[index], self.safe_distance, strict=True)
+        return safe
     
-    def _find_safe_alternative(self, target: List[float]) -> Optional[Tuple[float, float]]:
-        """Find a safe alternative point near the target"""
-        # Try different angles and distances
+    def _find_safe_alternatives(self, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Find a safe alternative point near each target, returns (points, found)"""
+        # Try different angles and distances, in order of preference
         angles = [45, 90, 135, 180, 225, 270, 315]
         distances = [self.safe_distance * 1.2, self.safe_distance * 1.5]
+        offsets = np.array([
+            [distance * math.cos(math.radians(angle)), distance * math.sin(math.radians(angle))]
+            for distance in distances for angle in angles
+        ])
         
-        for distance in distances:
-            for angle in angles:
-                test_x = target[0] + distance * math.cos(math.radians(angle))
-                test_y = target[1] + distance * math.sin(math.radians(angle))
-                if self._is_position_safe([test_x, test_y]):
-                    return (test_x, test_y)
-        return None
+        candidates = targets[:, None, :] + offsets[None, :, :]
+        safe = self._are_positions_safe(candidates.reshape(-1, 2)).reshape(len(targets), len(offsets))
+        first_safe = np.argmax(safe, axis=1)
+        return candidates[np.arange(len(targets)), first_safe], np.any(safe, axis=1)
+    
+    def _is_path_clear(self, path: List[Tuple[float, float]]) -> bool:
+        """Check that the straight segments of a path stay clear of obstacles"""
+        points = np.array([self.current_position] + list(path), dtype=float)
+        step = self.map_resolution / 2
+        for start, end in zip(points[:-1], points[1:]):
+            num_samples = max(2, int(np.hypot(*(end - start)) / step) + 1)
+            samples = np.linspace(start, end, num_samples)
+            clearance = self.clearance_map.clearance_at(samples)
+            if np.any(clearance < self.robot_radius):
+                return False
+            # Off the dense grid (NaN) only the obstacle index knows the obstacles
+            for sample in samples[np.isnan(clearance)]:
+                if self.obstacle_index.any_within(sample, self.robot_radius, strict=True):
+                    return False
+        return True
+    
+    def _route_endpoints(self, target_position: List[float],
+                         cost_map: Optional[CostMap] = None) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Get the planning cells of the rover and the target, None if either is off the map"""
+        positions = [self.current_position, target_position]
+        if not np.all(self.occupancy_grid.in_bounds(self.occupancy_grid.world_to_cell(positions))):
+            return None
+        start, goal = (tuple(cell) for cell in (cost_map or self.planning_map).world_to_cell(positions).tolist())
+        return start, goal
+    
+    def _cells_to_route(self, cells: Optional[List[Tuple[int, int]]], target_position: List[float],
+                        cost_map: Optional[CostMap] = None) -> List[Tuple[float, float]]:
+        """Turn planned cells into waypoints ending exactly at the target"""
+        if not cells:
+            return []
+        # A one-cell path means the rover already shares the target's cell
+        waypoints = simplify_path(cells)[1:] or cells[-1:]
+        route = [tuple(point) for point in (cost_map or self.planning_map).cell_to_world(waypoints).tolist()]
+        if route:
+            route[-1] = (float(target_position[0]), float(target_position[1]))
+        return route
+    
+    def find_route(self, target_position: List[float]) -> List[Tuple[float, float]]:
+        """Plan an obstacle-free route to the target, [] if there is none within max_plan_expansions"""
+        # D* Lite on the planning map repairs the previous route as obstacles come in
+        route = self.plan_route(target_position)
+        if route and self._is_path_clear(route):
+            return route
+            
+        # Planning cells only sample the cost map at their centers, so a coarse route can clip a
+        # corner, and passages narrower than a planning cell only show on the fine cost map
+        endpoints = self._route_endpoints(target_position, self.cost_map)
+        if endpoints is None:
+            return []
+        return self._cells_to_route(astar(self.cost_map, *endpoints, self.max_plan_expansions),
+                                    target_position, self.cost_map)
+    
+    def plan_route(self, target_position: List[float]) -> List[Tuple[float, float]]:
+        """Plan an obstacle-free route to the target, repairing the previous plan when possible.
+        Searches on past max_plan_expansions return [] and resume on the next call"""
+        endpoints = self._route_endpoints(target_position)
+        if endpoints is None:
+            return []
+            
+        start, goal = endpoints
+        if self.route_planner is None or self.route_planner.goal != goal:
+            self.route_planner = DStarLite(self.planning_map, start, goal)
+        else:
+            # Obstacle changes were already fed in by _sync_obstacle_maps
+            self.route_planner.update_start(start)
+        return self._cells_to_route(self.route_planner.plan(self.max_plan_expansions), target_position)
     
     def update_position(self, new_position: List[float], direction: str):
         """Update rover position and direction"""
         self.current_position = new_position
         self.current_direction = direction
         self.path_history.append((new_position[0], new_position[1]))
+        self.coverage_planner.advance(new_position)
         
-        # Update pattern angle based on movement
         current_time = time.time()
+        self.world_map.set_focus(new_position, current_time)
+        self.world_map.add_path_point(new_position)
+        
+        # Update pattern angle based on movement
         if current_time - self.last_turn_time > self.turn_interval:
             self.current_pattern_angle = (self.current_pattern_angle + 45) % 360
             self.last_turn_time = current_time
         
-    def get_navigation_commands(self, target_position: List[float], battery_level: float) -> Dict:
-        """Generate navigation commands based on current state"""
+    def _get_planned_path(self, target_position: List[float], battery_level: float) -> List[Tuple[float, float]]:
+        """Get the path toward a target, reusing a cached plan when nothing relevant changed"""
+        position_cell = tuple(self.occupancy_grid.world_to_cell(self.current_position).tolist())
+        key = (
+            position_cell,
+            (float(target_position[0]), float(target_position[1])),
+            battery_level < 20,  # Same band as the segment length choice in optimize_path
+            self.current_pattern_angle
+        )
+        path = self.plan_cache.get(key)
+        if path is not None:
+            return path
+            
         path = self.optimize_path(target_position, battery_level)
         
+        # The zigzag does not check the segments between its points, fall back to a
+        # route around the known obstacles when one is blocked, or stop without one
+        if not path or not self._is_path_clear(path):
+            path = self.find_route(target_position)
+                
+        self.plan_cache.put(key, path, [self.current_position] + path + [target_position])
+        return path
+    
+    def get_map_region(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Dict:
+        """Get mapped obstacles and the visited trail inside a box, for the dashboard"""
+        return self.world_map.query_bbox(min_x, min_y, max_x, max_y)
+        
+    def get_plan_cache_stats(self) -> Dict:
+        """Get plan cache statistics, including hit rate"""
+        stats = self.plan_cache.get_stats()
+        stats["obstacle_version"] = self.obstacle_version
+        return stats
+        
+    def start_coverage(self, area: List[float]):
+        """Plan boustrophedon sweeps over an area (min_x, min_y, max_x, max_y) around known obstacles"""
+        def is_free(points):
+            # Off-map samples have no obstacle data (NaN), treat them as free
+            return ~(self.clearance_map.clearance_at(points) < self.robot_radius)
+        self.coverage_planner.plan(area, is_free, self.map_resolution)
+        
+    def get_coverage_commands(self, range_budget: float,
+                              charging_station: Optional[List[float]] = None) -> Dict:
+        """Generate search commands that follow the coverage sweeps within the battery range"""
+        planner = self.coverage_planner
+        planner.advance(self.current_position)
+        if planner.is_complete:
+            return {
+                "command": "coverage_complete",
+                "coverage": planner.progress()
+            }
+            
+        # The leg stops where the remaining range only covers the way back,
+        # the sweep resumes from there after recharging
+        path = planner.next_leg(self.current_position, range_budget, charging_station)
         if not path:
             return {
-                "command": "stop",
-                "reason": "no_safe_path"
+                "command": "return_to_charge",
+                "reason": "battery_budget",
+                "coverage": planner.progress()
             }
             
+        # Transits between sweeps may cross obstacles, route around them
+        if not self._is_path_clear(path[:1]):
+            route = self._get_transit_route(path[0])
+            if route:
+                path = route + path[1:]
+                
+        command = self._move_command(path)
+        command["coverage"] = planner.progress()
+        return command
+        
+    def _get_transit_route(self, target: Tuple[float, float]) -> List[Tuple[float, float]]:
+        """Get the route to the next sweep, cached until an obstacle changes near it"""
+        key = ("transit", float(target[0]), float(target[1]))
+        cached = self.plan_cache.get(key)  # Planning position, then the route
+        if cached is not None and len(cached) == 1:
+            return []  # No route until the map changes
+        if cached:
+            # Continue from the last route segment the rover is on
+            starts = np.array(cached[:-1])
+            offsets = np.array(cached[1:]) - starts
+            position = np.asarray(self.current_position, dtype=float)
+            t = np.clip(np.sum((position - starts) * offsets, axis=1) /
+                        np.maximum(np.sum(offsets ** 2, axis=1), 1e-9), 0.0, 1.0)
+            distances = np.hypot(*(starts + offsets * t[:, None] - position).T)
+            on_route = np.flatnonzero(distances <= self.coverage_planner.arrival_tolerance)
+            if len(on_route):
+                route = cached[on_route[-1] + 1:]
+                if self._is_path_clear(route[:1]):
+                    return route
+                    
+        route = self.find_route(target)
+        start = (float(self.current_position[0]), float(self.current_position[1]))
+        self.plan_cache.put(key, [start] + route, [start] + route + [target])
+        return route
+        
+    def _move_command(self, path: List[Tuple[float, float]]) -> Dict:
+        """Build a move command toward the first point of a path"""
         next_point = path[0]
         dx = next_point[0] - self.current_position[0]
         dy = next_point[1] - self.current_position[1]
@@ -162,5 +427,32 @@ class NavigationSystem:
             "command": "move",
             "angle": angle,
             "distance": distance,
+            "speed": self._turn_limited_speed(path),
             "path": path
-        } 
\ No newline at end of file
+        }
+        
+    def _turn_limited_speed(self, path: List[Tuple[float, float]]) -> float:
+        """Travel speed that keeps the turn at the next waypoint within the turn rate"""
+        if len(path) < 2:
+            return self.travel_speed
+        points = np.array([self.current_position[:2]] + list(path[:2]), dtype=float)
+        first, second = np.diff(points, axis=0)
+        turn = abs((math.atan2(second[1], second[0]) - math.atan2(first[1], first[0]) + math.pi)
+                   % (2 * math.pi) - math.pi)
+        arc = (math.hypot(*first) + math.hypot(*second)) / 2
+        if turn < 1e-9 or arc < 1e-9:
+            return self.travel_speed
+        # Turning through the corner takes turn / rate seconds over about arc cm
+        return min(self.travel_speed, arc * math.radians(self.max_turn_rate) / turn)
+        
+    def get_navigation_commands(self, target_position: List[float], battery_level: float) -> Dict:
+        """Generate navigation commands based on current state"""
+        path = self._get_planned_path(target_position, battery_level)
+        
+        if not path:
+            return {
+                "command": "stop",
+                "reason": "no_safe_path"
+            }
+            
+        return self._move_command(path) 
\ No newline at end of file
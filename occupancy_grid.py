@@ -0,0 +1,273 @@
+import math
+from typing import Dict, List, Tuple, Optional
+import numpy as np
+
+class OccupancyGrid:
+    def __init__(self, width: float = 4000.0, height: float = 4000.0,
+                 resolution: float = 10.0, origin: Optional[Tuple[float, float]] = None):
+        self.resolution = resolution  # cm per cell
+        self.shape = (int(math.ceil(width / resolution)), int(math.ceil(height / resolution)))
+
+        # World position of cell (0, 0)'s corner, grid is centered on (0, 0) by default
+        if origin is None:
+            origin = (-self.shape[0] * resolution / 2, -self.shape[1] * resolution / 2)
+        self.origin = np.array(origin, dtype=float)
+
+        # Log-odds occupancy per cell, indexed [x, y]
+        self.log_odds = np.zeros(self.shape, dtype=np.float32)
+        # Cells beyond the dense grid, kept sparse so obstacles anywhere are remembered.
+        # Only hits create entries, cells whose evidence drops back to unknown are dropped
+        self.outside: Dict[Tuple[int, int], float] = {}
+
+        # Log-odds update model
+        self.hit_log_odds = 0.85     # p(occupied | hit) ~ 0.7
+        self.miss_log_odds = -0.4    # p(occupied | beam passed) ~ 0.4
+        self.min_log_odds = -4.0
+        self.max_log_odds = 4.0
+        self.occupied_threshold = 0.5  # A single hit marks a cell occupied
+
+        self._occupied_cache = None
+
+    def world_to_cell(self, points) -> np.ndarray:
+        """Convert world positions (..., 2) to integer cell indices"""
+        points = np.asarray(points, dtype=float)
+        return np.floor((points - self.origin) / self.resolution).astype(np.int64)
+
+    def cell_to_world(self, cells) -> np.ndarray:
+        """Convert cell indices (..., 2) to world positions of the cell centers"""
+        cells = np.asarray(cells)
+        return self.origin + (cells + 0.5) * self.resolution
+
+    def in_bounds(self, cells) -> np.ndarray:
+        """Check which cell indices (..., 2) lie inside the grid"""
+        cells = np.asarray(cells)
+        return ((cells[..., 0] >= 0) & (cells[..., 0] < self.shape[0]) &
+                (cells[..., 1] >= 0) & (cells[..., 1] < self.shape[1]))
+
+    def trace_cells(self, start_cell, end_cell) -> np.ndarray:
+        """Get the cells crossed by a beam from start_cell up to, excluding, end_cell"""
+        start_cell = np.asarray(start_cell)
+        end_cell = np.asarray(end_cell)
+        steps = int(np.max(np.abs(end_cell - start_cell)))
+        if steps == 0:
+            return np.empty((0, 2), dtype=np.int64)
+
+        t = np.arange(steps) / steps
+        return np.rint(start_cell + np.outer(t, end_cell - start_cell)).astype(np.int64)
+
+    def update_beam(self, origin: List[float], end: List[float], hit: bool) -> List[Tuple[int, int]]:
+        """Update the grid with one sensor beam, returns cells whose occupancy changed"""
+        origin_cell, end_cell = self.world_to_cell([origin, end])
+        free_cells = self.trace_cells(origin_cell, end_cell)
+        if not hit:
+            free_cells = np.vstack([free_cells, end_cell])
+
+        changed = self._apply_update(free_cells, self.miss_log_odds)
+        if hit:
+            changed.extend(self._apply_update(end_cell[None, :], self.hit_log_odds))
+        return changed
+
+    def update_beams(self, origin: List[float], ends, hits) -> List[Tuple[int, int]]:
+        """Update the grid with a sweep of beams (N, 2) from one origin, returns changed cells"""
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        hits = np.asarray(hits, dtype=bool).reshape(-1)
+        if len(ends) == 0:
+            return []
+        origin_cell = self.world_to_cell(origin)
+        end_cells = self.world_to_cell(ends)
+
+        # Trace every beam at once, each contributes steps cells before its end cell
+        spans = end_cells - origin_cell
+        steps = np.max(np.abs(spans), axis=1)
+        beam = np.repeat(np.arange(len(ends)), steps)
+        index = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+        t = (index / steps[beam])[:, None]
+        free_cells = np.rint(origin_cell + spans[beam] * t).astype(np.int64)
+        # Beams that hit nothing leave their end cell free too
+        free_cells = np.vstack([free_cells, end_cells[~hits]])
+
+        changed = self._apply_update(free_cells, self.miss_log_odds)
+        changed.extend(self._apply_update(end_cells[hits], self.hit_log_odds))
+        # A cell can flip back and forth within one sweep
+        return list(dict.fromkeys(changed))
+
+    def update_points(self, points, hit: bool = True) -> List[Tuple[int, int]]:
+        """Apply a hit (or miss) to the cells containing world positions (N, 2)"""
+        cells = self.world_to_cell(np.asarray(points, dtype=float).reshape(-1, 2))
+        return self._apply_update(cells, self.hit_log_odds if hit else self.miss_log_odds)
+
+    def _apply_update(self, cells: np.ndarray, delta: float) -> List[Tuple[int, int]]:
+        """Add a log-odds delta to cells and report which crossed the occupied threshold"""
+        if len(cells) == 0:
+            return []
+
+        cells = np.unique(cells, axis=0)
+        inside = self.in_bounds(cells)
+        changed = []
+        if not np.all(inside):
+            changed = self._apply_outside(cells[~inside], delta)
+            cells = cells[inside]
+
+        xs, ys = cells[:, 0], cells[:, 1]
+        before = self.log_odds[xs, ys] > self.occupied_threshold
+        self.log_odds[xs, ys] = np.clip(self.log_odds[xs, ys] + delta,
+                                        self.min_log_odds, self.max_log_odds)
+        after = self.log_odds[xs, ys] > self.occupied_threshold
+
+        flipped = before != after
+        if np.any(flipped):
+            changed.extend(tuple(cell) for cell in cells[flipped].tolist())
+        if changed:
+            self._occupied_cache = None
+        return changed
+
+    def _apply_outside(self, cells: np.ndarray, delta: float) -> List[Tuple[int, int]]:
+        """Add a log-odds delta to cells beyond the dense grid, returns cells that flipped"""
+        if delta <= 0 and not self.outside:
+            return []
+        changed = []
+        for cell in map(tuple, cells.tolist()):
+            before = self.outside.get(cell)
+            if before is None:
+                if delta <= 0:
+                    continue
+                before = 0.0
+            after = min(max(before + delta, self.min_log_odds), self.max_log_odds)
+            if after > 0:
+                self.outside[cell] = after
+            else:
+                del self.outside[cell]
+            if (before > self.occupied_threshold) != (after > self.occupied_threshold):
+                changed.append(cell)
+        return changed
+
+    def is_cell_occupied(self, cells) -> np.ndarray:
+        """Check which cell indices (..., 2) are occupied, on or off the dense grid"""
+        cells = np.asarray(cells, dtype=np.int64)
+        inside = self.in_bounds(cells)
+        occupied = np.zeros(inside.shape, dtype=bool)
+        occupied[inside] = self.log_odds[cells[inside][:, 0], cells[inside][:, 1]] > self.occupied_threshold
+        if self.outside and not np.all(inside):
+            occupied[~inside] = [self.outside.get(cell, 0.0) > self.occupied_threshold
+                                 for cell in map(tuple, cells[~inside].tolist())]
+        return occupied
+
+    def is_occupied(self, points) -> np.ndarray:
+        """Check which world positions (..., 2) fall in occupied cells"""
+        return self.is_cell_occupied(self.world_to_cell(points))
+
+    def occupied_cells(self) -> np.ndarray:
+        """Get indices (N, 2) of all occupied cells, including those beyond the dense grid"""
+        if self._occupied_cache is None:
+            outside = [cell for cell, value in self.outside.items() if value > self.occupied_threshold]
+            self._occupied_cache = np.vstack([np.argwhere(self.log_odds > self.occupied_threshold),
+                                              np.array(outside, dtype=np.int64).reshape(-1, 2)])
+        return self._occupied_cache
+
+    def occupied_positions(self) -> np.ndarray:
+        """Get world positions (N, 2) of all occupied cell centers"""
+        return self.cell_to_world(self.occupied_cells())
+
+    def probability(self) -> np.ndarray:
+        """Get the occupancy probability of every cell"""
+        return 1.0 - 1.0 / (1.0 + np.exp(self.log_odds))
+
+    def clear(self):
+        """Reset every cell to unknown"""
+        self.log_odds.fill(0.0)
+        self.outside.clear()
+        self._occupied_cache = None
+
+class ClearanceMap:
+    def __init__(self, grid: OccupancyGrid, max_distance: float = 200.0):
+        self.grid = grid
+        self.max_distance = max_distance  # cm, clearance is capped here
+        self.radius_cells = int(math.ceil(max_distance / grid.resolution))
+        # Half a cell diagonal, the most a position can be from its cell center
+        self.cell_half_diagonal = grid.resolution * math.sqrt(2) / 2
+
+        # Distance from each cell center to the nearest occupied cell center
+        self.clearance = np.full(grid.shape, max_distance, dtype=np.float32)
+
+        # Distance from the center cell to every cell of the update window
+        offsets = np.arange(-self.radius_cells, self.radius_cells + 1)
+        window_dx, window_dy = np.meshgrid(offsets, offsets, indexing='ij')
+        self._window_distance = np.hypot(window_dx, window_dy) * grid.resolution
+
+    def window(self, cell, radius: int):
+        """Get the in-bounds slices of a square window around a cell, empty if it misses the grid"""
+        x0 = min(max(cell[0] - radius, 0), self.grid.shape[0])
+        x1 = max(min(cell[0] + radius + 1, self.grid.shape[0]), x0)
+        y0 = min(max(cell[1] - radius, 0), self.grid.shape[1])
+        y1 = max(min(cell[1] + radius + 1, self.grid.shape[1]), y0)
+        return slice(x0, x1), slice(y0, y1)
+
+    def update(self, changed_cells: List[Tuple[int, int]]):
+        """Update clearance around cells whose occupancy changed"""
+        grid = self.grid
+        for cell in changed_cells:
+            if grid.is_cell_occupied(cell):
+                self._stamp(cell)
+            else:
+                self._remove_obstacle(cell)
+
+    def _stamp(self, cell, region=None):
+        """Lower clearance around an obstacle cell, optionally only inside a region"""
+        xs, ys = self.window(cell, self.radius_cells)
+        if region is not None:
+            xs = slice(max(xs.start, region[0].start), min(xs.stop, region[0].stop))
+            ys = slice(max(ys.start, region[1].start), min(ys.stop, region[1].stop))
+        if xs.start >= xs.stop or ys.start >= ys.stop:
+            # Obstacles beyond the dense grid only matter within reach of its edge
+            return
+
+        r = self.radius_cells
+        distance = self._window_distance[xs.start - cell[0] + r:xs.stop - cell[0] + r,
+                                         ys.start - cell[1] + r:ys.stop - cell[1] + r]
+        view = self.clearance[xs, ys]
+        np.minimum(view, distance, out=view)
+
+    def _remove_obstacle(self, cell):
+        """Recompute the window around a freed cell from the obstacles that remain"""
+        grid = self.grid
+        region = self.window(cell, self.radius_cells)
+        if region[0].start >= region[0].stop or region[1].start >= region[1].stop:
+            return
+        self.clearance[region] = self.max_distance
+
+        # Obstacles up to max_distance outside the window still affect it
+        reach = 2 * self.radius_cells
+        oxs, oys = self.window(cell, reach)
+        obstacles = (np.argwhere(grid.log_odds[oxs, oys] > grid.occupied_threshold) + (oxs.start, oys.start)).tolist()
+        if oxs.stop - oxs.start < 2 * reach + 1 or oys.stop - oys.start < 2 * reach + 1:
+            # The reach crosses the grid edge, obstacles beyond it count too
+            obstacles.extend(
+                other for other, value in grid.outside.items()
+                if value > grid.occupied_threshold and
+                abs(other[0] - cell[0]) <= reach and abs(other[1] - cell[1]) <= reach
+            )
+        for ox, oy in obstacles:
+            self._stamp((ox, oy), region)
+
+    def lookup(self, position) -> Optional[float]:
+        """Get clearance at a single world position, None outside the grid"""
+        grid = self.grid
+        x = math.floor((position[0] - grid.origin[0]) / grid.resolution)
+        y = math.floor((position[1] - grid.origin[1]) / grid.resolution)
+        if 0 <= x < grid.shape[0] and 0 <= y < grid.shape[1]:
+            return float(self.clearance[x, y])
+        return None
+
+    def clearance_at(self, points) -> np.ndarray:
+        """Get clearance for world positions (..., 2), NaN outside the grid"""
+        cells = self.grid.world_to_cell(points)
+        inside = self.grid.in_bounds(cells)
+        xs = np.clip(cells[..., 0], 0, self.grid.shape[0] - 1)
+        ys = np.clip(cells[..., 1], 0, self.grid.shape[1] - 1)
+        return np.where(inside, self.clearance[xs, ys], np.nan)
+
+    def recompute(self):
+        """Rebuild the whole clearance map from the grid"""
+        self.clearance.fill(self.max_distance)
+        for cell in self.grid.occupied_cells().tolist():
+            self._stamp(tuple(cell))
@@ -0,0 +1,315 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from occupancy_grid import ClearanceMap
+
+Cell = Tuple[int, int]
+
+SQRT2 = math.sqrt(2)
+NEIGHBOR_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+INF = float('inf')
+
+class CostMap:
+    def __init__(self, clearance_map: ClearanceMap, robot_radius: float, safe_distance: float,
+                 clearance_weight: float = 4.0):
+        self.clearance_map = clearance_map
+        self.grid = clearance_map.grid
+        self.shape = self.grid.shape
+        self.resolution = self.grid.resolution  # cm per planning cell
+        self.robot_radius = robot_radius    # cm, cells closer than this to an obstacle are blocked
+        self.safe_distance = safe_distance  # cm, cells closer than this cost extra
+        self.clearance_weight = clearance_weight
+        self.max_cost = 1.0 + clearance_weight
+
+        # Traversal cost per cell, inf where blocked
+        self.costs = self._compute(slice(None), slice(None))
+
+    def _compute(self, xs: slice, ys: slice) -> np.ndarray:
+        """Compute cell costs from clearance for a region of the grid"""
+        clearance = self.clearance_map.clearance[xs, ys]
+        penalty = np.clip((self.safe_distance - clearance) / self.safe_distance, 0.0, 1.0)
+        costs = 1.0 + self.clearance_weight * penalty
+        costs[clearance < self.robot_radius] = np.inf
+        return costs
+
+    def refresh(self, changed_cells: List[Cell]) -> List[Cell]:
+        """Recompute costs around cells whose occupancy changed, returns cells whose cost changed"""
+        changed = set()
+        for cell in changed_cells:
+            xs, ys = self.clearance_map.window(cell, self.clearance_map.radius_cells)
+            costs = self._compute(xs, ys)
+            diff = np.argwhere(costs != self.costs[xs, ys])
+            if len(diff):
+                self.costs[xs, ys] = costs
+                changed.update(map(tuple, (diff + (xs.start, ys.start)).tolist()))
+        return list(changed)
+
+    def world_to_cell(self, positions) -> np.ndarray:
+        """Convert world positions (..., 2) to planning cell indices"""
+        return self.grid.world_to_cell(positions)
+
+    def cell_to_world(self, cells) -> np.ndarray:
+        """Convert planning cell indices (..., 2) to world positions of the cell centers"""
+        return self.grid.cell_to_world(cells)
+
+    def neighbors(self, cell: Cell) -> List[Cell]:
+        """Get the in-bounds 8-connected neighbors of a cell"""
+        x, y = cell
+        width, height = self.shape
+        return [(x + dx, y + dy) for dx, dy in NEIGHBOR_OFFSETS
+                if 0 <= x + dx < width and 0 <= y + dy < height]
+
+    def edge_cost(self, a: Cell, b: Cell) -> float:
+        """Cost of moving from cell a to neighboring cell b"""
+        costs = self.costs
+        cost_b = costs[b]
+        if cost_b == INF:
+            return INF
+
+        diagonal = a[0] != b[0] and a[1] != b[1]
+        # No cutting corners past blocked cells
+        if diagonal and (costs[a[0], b[1]] == INF or costs[b[0], a[1]] == INF):
+            return INF
+
+        # Leaving a blocked cell is allowed so the rover can back away from obstacles
+        cost_a = min(costs[a], self.max_cost)
+        step = SQRT2 if diagonal else 1.0
+        return step * self.resolution * (cost_a + cost_b) / 2
+
+    def heuristic(self, a: Cell, b: Cell) -> float:
+        """Octile distance, admissible since every cell costs at least 1"""
+        dx = abs(a[0] - b[0])
+        dy = abs(a[1] - b[1])
+        return self.resolution * (max(dx, dy) + (SQRT2 - 1) * min(dx, dy))
+
+class CoarseCostMap(CostMap):
+    def __init__(self, fine: CostMap, factor: int):
+        # Planning grid of factor x factor blocks of the fine cost map. Routes on it run
+        # between block centers, so a block costs as much as the fine cell at its center
+        self.fine = fine
+        self.factor = factor
+        self.clearance_map = fine.clearance_map
+        self.grid = fine.grid
+        self.shape = (math.ceil(fine.shape[0] / factor), math.ceil(fine.shape[1] / factor))
+        self.resolution = fine.resolution * factor
+        self.max_cost = fine.max_cost
+        self.costs = fine.costs[np.ix_(self._centers(np.arange(self.shape[0]), 0),
+                                       self._centers(np.arange(self.shape[1]), 1))].copy()
+
+    def _centers(self, blocks: np.ndarray, axis: int) -> np.ndarray:
+        """Fine index of the center of blocks along an axis, partial edge blocks use their last cell"""
+        return np.minimum(blocks * self.factor + self.factor // 2, self.fine.shape[axis] - 1)
+
+    def fine_to_coarse(self, cells) -> np.ndarray:
+        """Get the blocks containing fine cells (..., 2)"""
+        return np.asarray(cells, dtype=np.int64) // self.factor
+
+    def world_to_cell(self, positions) -> np.ndarray:
+        """Convert world positions (..., 2) to block indices"""
+        return self.fine_to_coarse(self.fine.world_to_cell(positions))
+
+    def cell_to_world(self, cells) -> np.ndarray:
+        """Convert block indices (..., 2) to world positions of their center cells"""
+        cells = np.asarray(cells, dtype=np.int64)
+        centers = np.stack([self._centers(cells[..., 0], 0), self._centers(cells[..., 1], 1)], axis=-1)
+        return self.fine.cell_to_world(centers)
+
+    def refresh(self, changed_cells: List[Cell]) -> List[Cell]:
+        """Re-sample blocks over fine cells whose cost changed, returns blocks whose cost changed"""
+        if not changed_cells:
+            return []
+        blocks = np.unique(self.fine_to_coarse(changed_cells), axis=0)
+        bx, by = blocks[:, 0], blocks[:, 1]
+        costs = self.fine.costs[self._centers(bx, 0), self._centers(by, 1)]
+        changed = costs != self.costs[bx, by]
+        self.costs[bx[changed], by[changed]] = costs[changed]
+        return list(map(tuple, blocks[changed].tolist()))
+
+def astar(cost_map: CostMap, start: Cell, goal: Cell,
+          max_expansions: Optional[int] = None) -> Optional[List[Cell]]:
+    """One-shot A* search from start to goal, returns the cells of the path, None when
+    there is none or the search gives up after max_expansions cells"""
+    g = {start: 0.0}
+    came_from: Dict[Cell, Cell] = {}
+    open_heap = [(cost_map.heuristic(start, goal), start)]
+    closed = set()
+
+    while open_heap:
+        _, current = heapq.heappop(open_heap)
+        if current == goal:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return path[::-1]
+        if current in closed:
+            continue
+        closed.add(current)
+        if max_expansions is not None and len(closed) > max_expansions:
+            return None
+
+        for neighbor in cost_map.neighbors(current):
+            if neighbor in closed:
+                continue
+            cost = g[current] + cost_map.edge_cost(current, neighbor)
+            if cost < g.get(neighbor, INF):
+                g[neighbor] = cost
+                came_from[neighbor] = current
+                heapq.heappush(open_heap, (cost + cost_map.heuristic(neighbor, goal), neighbor))
+    return None
+
+class DStarLite:
+    def __init__(self, cost_map: CostMap, start: Cell, goal: Cell):
+        self.cost_map = cost_map
+        self.start = start
+        self.goal = goal
+        self.km = 0.0
+
+        # Cost-to-goal estimates, missing entries are inf
+        self.g: Dict[Cell, float] = {}
+        self.rhs: Dict[Cell, float] = {goal: 0.0}
+
+        # Priority queue with lazy deletion, open_keys holds each cell's live key
+        self.open_heap = []
+        self.open_keys: Dict[Cell, Tuple[float, float]] = {}
+        self._push(goal, self._key(goal))
+
+        self.expansions = 0  # Total vertex expansions, for profiling replans
+
+    def _key(self, cell: Cell) -> Tuple[float, float]:
+        """Priority of a cell in the open queue"""
+        value = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (value + self.cost_map.heuristic(self.start, cell) + self.km, value)
+
+    def _push(self, cell: Cell, key: Tuple[float, float]):
+        self.open_keys[cell] = key
+        heapq.heappush(self.open_heap, (key, cell))
+
+    def _top(self):
+        """Get the live entry with the lowest key, dropping stale ones"""
+        while self.open_heap:
+            key, cell = self.open_heap[0]
+            if self.open_keys.get(cell) == key:
+                return key, cell
+            heapq.heappop(self.open_heap)
+        return (INF, INF), None
+
+    def _compute_rhs(self, cell: Cell) -> float:
+        """One-step lookahead cost-to-goal of a cell"""
+        if cell == self.goal:
+            return 0.0
+        cost_map = self.cost_map
+        g = self.g
+        return min(
+            (cost_map.edge_cost(cell, n) + g.get(n, INF) for n in cost_map.neighbors(cell)),
+            default=INF
+        )
+
+    def _requeue(self, cell: Cell):
+        """Queue a cell if it is inconsistent, otherwise drop it from the queue"""
+        self.open_keys.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._push(cell, self._key(cell))
+
+    def _update_vertex(self, cell: Cell):
+        """Recompute a cell's lookahead and requeue it if inconsistent"""
+        self.rhs[cell] = self._compute_rhs(cell)
+        self._requeue(cell)
+
+    def compute_shortest_path(self, max_expansions: Optional[int] = None) -> bool:
+        """Expand cells until the start's cost-to-goal is consistent, returns False if it
+        stopped after max_expansions first, the next call carries on from there"""
+        cost_map = self.cost_map
+        g = self.g
+        rhs = self.rhs
+        expansions = 0
+        while True:
+            top_key, cell = self._top()
+            if cell is None:
+                break
+            if not (top_key < self._key(self.start) or
+                    rhs.get(self.start, INF) != g.get(self.start, INF)):
+                break
+            if max_expansions is not None and expansions >= max_expansions:
+                return False
+
+            expansions += 1
+            self.expansions += 1
+            new_key = self._key(cell)
+            if top_key < new_key:
+                self._push(cell, new_key)
+                continue
+
+            heapq.heappop(self.open_heap)
+            del self.open_keys[cell]
+            g_cell = g.get(cell, INF)
+            rhs_cell = rhs.get(cell, INF)
+            if g_cell > rhs_cell:
+                # Cost-to-goal dropped, neighbors can only improve through this cell
+                g[cell] = rhs_cell
+                for neighbor in cost_map.neighbors(cell):
+                    if neighbor != self.goal:
+                        through = cost_map.edge_cost(neighbor, cell) + rhs_cell
+                        if through < rhs.get(neighbor, INF):
+                            rhs[neighbor] = through
+                    self._requeue(neighbor)
+            else:
+                # Cost-to-goal rose, neighbors that relied on this cell need a full lookahead
+                g[cell] = INF
+                for neighbor in cost_map.neighbors(cell) + [cell]:
+                    if neighbor != self.goal and (
+                            neighbor == cell or
+                            rhs.get(neighbor, INF) == cost_map.edge_cost(neighbor, cell) + g_cell):
+                        rhs[neighbor] = self._compute_rhs(neighbor)
+                    self._requeue(neighbor)
+        return True
+
+    def update_start(self, start: Cell):
+        """Move the start, keeping queued keys valid as lower bounds"""
+        if start != self.start:
+            self.km += self.cost_map.heuristic(self.start, start)
+            self.start = start
+
+    def update_costs(self, changed_cells: List[Cell]):
+        """Repair the plan around cells whose traversal cost changed"""
+        affected = set(changed_cells)
+        for cell in changed_cells:
+            affected.update(self.cost_map.neighbors(cell))
+        for cell in affected:
+            self._update_vertex(cell)
+
+    def plan(self, max_expansions: Optional[int] = None) -> Optional[List[Cell]]:
+        """Get the current best path from start to goal as cells, None if there is none
+        or the search has not finished within max_expansions"""
+        if not self.compute_shortest_path(max_expansions):
+            return None
+        if self.g.get(self.start, INF) == INF:
+            return None
+
+        path = [self.start]
+        current = self.start
+        visited = {current}
+        while current != self.goal:
+            prev = current
+            current = min(
+                self.cost_map.neighbors(prev),
+                key=lambda n: self.cost_map.edge_cost(prev, n) + self.g.get(n, INF)
+            )
+            if current in visited or self.g.get(current, INF) == INF:
+                return None
+            visited.add(current)
+            path.append(current)
+        return path
+
+def simplify_path(cells: List[Cell]) -> List[Cell]:
+    """Keep only the cells where the path changes direction, plus the end"""
+    if len(cells) < 3:
+        return list(cells)
+
+    waypoints = [cells[0]]
+    for prev, cell, nxt in zip(cells, cells[1:], cells[2:]):
+        if (cell[0] - prev[0], cell[1] - prev[1]) != (nxt[0] - cell[0], nxt[1] - cell[1]):
+            waypoints.append(cell)
+    waypoints.append(cells[-1])
+    return waypoints
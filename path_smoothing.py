@@ -0,0 +1,89 @@
+import math
+from typing import Tuple
+import numpy as np
+
+def catmull_rom(points: np.ndarray, samples_per_segment=16, alpha: float = 0.5) -> np.ndarray:
+    """Sample a centripetal Catmull-Rom spline through points (N, 2), all segments at once,
+    samples_per_segment may differ per segment"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) < 2:
+        return points.copy()
+
+    # Mirror the ends so the first and last segments get tangents too
+    padded = np.vstack([2 * points[0] - points[1], points, 2 * points[-1] - points[-2]])
+    p0, p1, p2, p3 = padded[:-3], padded[1:-2], padded[2:-1], padded[3:]
+
+    # Centripetal knot spacing, never overshoots into loops or cusps
+    def knot_step(a, b):
+        return np.maximum(np.hypot(*(b - a).T) ** alpha, 1e-9)
+    t1 = knot_step(p0, p1)
+    t2 = t1 + knot_step(p1, p2)
+    t3 = t2 + knot_step(p2, p3)
+
+    # One row per sample, segments may be sampled at different rates
+    counts = np.broadcast_to(np.asarray(samples_per_segment, dtype=np.int64), (len(p1),))
+    segment = np.repeat(np.arange(len(p1)), counts)
+    u = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)) / counts[segment]
+    t1, t2, t3 = (t[segment][:, None] for t in (t1, t2, t3))
+    p0, p1, p2, p3 = (p[segment] for p in (p0, p1, p2, p3))
+    t = t1 + (t2 - t1) * u[:, None]
+
+    # Barry-Goldman pyramid, with t0 = 0
+    a1 = (t1 - t) / t1 * p0 + t / t1 * p1
+    a2 = (t2 - t) / (t2 - t1) * p1 + (t - t1) / (t2 - t1) * p2
+    a3 = (t3 - t) / (t3 - t2) * p2 + (t - t2) / (t3 - t2) * p3
+    b1 = (t2 - t) / t2 * a1 + t / t2 * a2
+    b2 = (t3 - t) / (t3 - t1) * a2 + (t - t1) / (t3 - t1) * a3
+    curve = (t2 - t) / (t2 - t1) * b1 + (t - t1) / (t2 - t1) * b2
+    return np.vstack([curve, points[-1:]])
+
+def _turns(dense: np.ndarray) -> np.ndarray:
+    """Absolute heading change at each interior sample of a polyline"""
+    chords = np.diff(dense, axis=0)
+    headings = np.arctan2(chords[:, 1], chords[:, 0])
+    return np.abs((np.diff(headings) + math.pi) % (2 * math.pi) - math.pi)
+
+def smooth_path(points: np.ndarray, max_heading_change: float = 45.0, max_spacing: float = 200.0,
+                samples_per_segment: int = 16) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit a spline through waypoints (N, 2) and keep samples where the heading or distance
+    builds up, returns (waypoints without the first point, curvature in 1/cm at each)"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    # Repeated points have no direction, drop them before fitting
+    if len(points) > 1:
+        moves = np.hypot(*np.diff(points, axis=0).T) > 1e-6
+        points = points[np.concatenate([[True], moves])]
+    if len(points) < 2:
+        return points[1:], np.zeros(0)
+
+    # Resample tight segments more finely, so no dense step turns more than
+    # a quarter of the heading budget
+    step = math.radians(max_heading_change)
+    dense = catmull_rom(points, samples_per_segment)
+    segment_turns = np.zeros(len(points) - 1)
+    sample_segment = np.minimum(np.arange(1, len(dense) - 1) // samples_per_segment, len(segment_turns) - 1)
+    np.maximum.at(segment_turns, sample_segment, _turns(dense))
+    refine = np.clip(np.ceil(segment_turns / (step / 4)), 1, 32).astype(np.int64)
+    if np.any(refine > 1):
+        dense = catmull_rom(points, samples_per_segment * refine)
+
+    lengths = np.hypot(*np.diff(dense, axis=0).T)
+    turns = _turns(dense)
+
+    # Heading change and distance covered on arrival at each dense sample
+    turned = np.concatenate([[0.0, 0.0], np.cumsum(turns)])
+    travelled = np.concatenate([[0.0], np.cumsum(lengths)])
+
+    # Keep a sample whenever either budget rolls over, straight runs only
+    # keep one per max_spacing while turns keep one per max_heading_change
+    turn_bucket = np.floor(turned / step)
+    spacing_bucket = np.floor(travelled / max_spacing)
+    keep = np.zeros(len(dense), dtype=bool)
+    keep[1:] = (np.diff(turn_bucket) > 0) | (np.diff(spacing_bucket) > 0)
+    keep[-1] = True
+    kept = np.flatnonzero(keep)
+
+    # Sharpest curvature on the way to each kept sample
+    sample_curvature = np.concatenate([[0.0], turns / np.maximum((lengths[:-1] + lengths[1:]) / 2, 1e-9), [0.0]])
+    starts = np.concatenate([[1], kept[:-1] + 1])
+    curvature = np.maximum.reduceat(sample_curvature, starts)
+    return dense[kept], curvature
@@ -0,0 +1,110 @@
+import math
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+import numpy as np
+
+class PlanCache:
+    def __init__(self, capacity: int = 256, bucket_size: float = 450.0):
+        self.capacity = capacity
+        # Obstacle changes invalidate plans passing within about one bucket
+        self.bucket_size = bucket_size
+
+        self.entries: "OrderedDict[Hashable, List[Tuple[float, float]]]" = OrderedDict()
+        self.entry_buckets: Dict[Hashable, Set[Tuple[int, int]]] = {}
+        self.bucket_entries: Dict[Tuple[int, int], Set[Hashable]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> Optional[List[Tuple[float, float]]]:
+        """Get a cached path, None on a miss"""
+        path = self.entries.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(path)
+
+    def put(self, key: Hashable, path: List[Tuple[float, float]], footprint: List[List[float]]):
+        """Cache a path along with the positions its validity depends on"""
+        if key in self.entries:
+            self._remove(key)
+
+        buckets = self._footprint_buckets(footprint)
+        self.entries[key] = list(path)
+        self.entry_buckets[key] = buckets
+        for bucket in buckets:
+            self.bucket_entries.setdefault(bucket, set()).add(key)
+
+        # Evict least recently used plans
+        while len(self.entries) > self.capacity:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _footprint_buckets(self, footprint: List[List[float]]) -> Set[Tuple[int, int]]:
+        """Get the buckets touched by a polyline, sampled densely enough to miss none"""
+        points = np.asarray(footprint, dtype=float).reshape(-1, 2)
+        if len(points) > 1:
+            starts, ends = points[:-1], points[1:]
+            lengths = np.hypot(*(ends - starts).T)
+            counts = np.maximum(1, np.ceil(lengths / (self.bucket_size / 2))).astype(int)
+            segment = np.repeat(np.arange(len(starts)), counts)
+            step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            t = (step / counts[segment])[:, None]
+            samples = starts[segment] + (ends - starts)[segment] * t
+            points = np.vstack([samples, points[-1:]])
+        return set(map(tuple, np.floor(points / self.bucket_size).astype(int).tolist()))
+
+    def _remove(self, key: Hashable):
+        """Drop an entry and its bucket references"""
+        del self.entries[key]
+        for bucket in self.entry_buckets.pop(key):
+            keys = self.bucket_entries[bucket]
+            keys.discard(key)
+            if not keys:
+                del self.bucket_entries[bucket]
+
+    def invalidate_near(self, positions) -> int:
+        """Drop cached plans passing near any of the positions, returns how many"""
+        stale = set()
+        for x, y in np.asarray(positions, dtype=float).reshape(-1, 2).tolist():
+            bx = math.floor(x / self.bucket_size)
+            by = math.floor(y / self.bucket_size)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    stale.update(self.bucket_entries.get((bx + dx, by + dy), ()))
+
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        """Drop every cached plan"""
+        self.entries.clear()
+        self.entry_buckets.clear()
+        self.bucket_entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self) -> Dict:
+        """Get cache usage statistics"""
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,145 @@
+import math
+from typing import Dict, Optional
+import numpy as np
+
+# World-frame unit vectors of the rover API's move commands
+COMMAND_DIRECTIONS = {
+    "forward": (0.0, 1.0),
+    "backward": (0.0, -1.0),
+    "left": (-1.0, 0.0),
+    "right": (1.0, 0.0),
+    "stop": (0.0, 0.0)
+}
+
+class PoseEstimator:
+    def __init__(self, position_noise: float = 1.0, command_noise: float = 0.25,
+                 accel_noise: float = 0.5, accel_scale: float = 1.0):
+        self.position_noise = position_noise  # Position units, std of an upstream position
+        self.command_noise = command_noise    # Units per second, std of the velocity a move command implies
+        self.accel_noise = accel_noise        # m/s², accelerometer noise plus unmodelled motion
+        self.accel_scale = accel_scale        # Position units per metre
+
+        # State [x, y, vx, vy] and its covariance, unknown until the first position
+        self.state = np.zeros(4)
+        self.covariance = np.diag([1e6, 1e6, 1.0, 1.0])
+        self.acceleration = np.zeros(2)  # Last accelerometer frame in world axes, held between frames
+        self.timestamp: Optional[float] = None
+        self.initialized = False
+
+        # Preallocated workspace, every step works in place
+        self._transition = np.eye(4)
+        self._process_noise = np.zeros((4, 4))
+        self._scratch = np.zeros((4, 4))
+        self._gain = np.zeros((4, 2))
+        self._innovation_cov = np.zeros((2, 2))
+        self._innovation_inv = np.zeros((2, 2))
+        self._innovation = np.zeros(2)
+        self._correction = np.zeros(4)
+
+    def predict(self, timestamp: float):
+        """Advance the pose to a timestamp under constant acceleration, older timestamps are ignored"""
+        if self.timestamp is None:
+            self.timestamp = timestamp
+            return
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return
+        self.timestamp = timestamp
+
+        state = self.state
+        ax, ay = self.acceleration
+        state[0] += state[2] * dt + 0.5 * ax * dt * dt
+        state[1] += state[3] * dt + 0.5 * ay * dt * dt
+        state[2] += ax * dt
+        state[3] += ay * dt
+
+        # P = F P F^T + Q, with Q from white acceleration noise
+        transition = self._transition
+        transition[0, 2] = transition[1, 3] = dt
+        np.matmul(transition, self.covariance, out=self._scratch)
+        np.matmul(self._scratch, transition.T, out=self.covariance)
+        q = (self.accel_noise * self.accel_scale) ** 2
+        noise = self._process_noise
+        noise[0, 0] = noise[1, 1] = q * dt ** 4 / 4
+        noise[0, 2] = noise[2, 0] = noise[1, 3] = noise[3, 1] = q * dt ** 3 / 2
+        noise[2, 2] = noise[3, 3] = q * dt * dt
+        self.covariance += noise
+
+    def _update(self, offset: int, measured_x: float, measured_y: float, variance: float):
+        """Kalman update with a direct measurement of the state pair at offset"""
+        covariance = self.covariance
+        cov = self._innovation_cov
+        cov[:, :] = covariance[offset:offset + 2, offset:offset + 2]
+        cov[0, 0] += variance
+        cov[1, 1] += variance
+
+        # Closed-form 2x2 inverse, no allocation
+        det = cov[0, 0] * cov[1, 1] - cov[0, 1] * cov[1, 0]
+        inverse = self._innovation_inv
+        inverse[0, 0] = cov[1, 1] / det
+        inverse[1, 1] = cov[0, 0] / det
+        inverse[0, 1] = -cov[0, 1] / det
+        inverse[1, 0] = -cov[1, 0] / det
+        np.matmul(covariance[:, offset:offset + 2], inverse, out=self._gain)
+
+        self._innovation[0] = measured_x - self.state[offset]
+        self._innovation[1] = measured_y - self.state[offset + 1]
+        np.matmul(self._gain, self._innovation, out=self._correction)
+        self.state += self._correction
+
+        # P = (I - K H) P, then symmetrized against rounding
+        np.matmul(self._gain, covariance[offset:offset + 2, :], out=self._scratch)
+        covariance -= self._scratch
+        np.add(covariance, covariance.T, out=self._scratch)
+        np.multiply(self._scratch, 0.5, out=covariance)
+
+    def update_position(self, position, timestamp: float):
+        """Fuse an upstream position report"""
+        variance = self.position_noise ** 2
+        if not self.initialized:
+            # The first fix sets the position outright
+            self.state[0], self.state[1] = position[0], position[1]
+            self.covariance[:2, :] = 0.0
+            self.covariance[:, :2] = 0.0
+            self.covariance[0, 0] = self.covariance[1, 1] = variance
+            self.timestamp = timestamp if self.timestamp is None else max(self.timestamp, timestamp)
+            self.initialized = True
+            return
+        self.predict(timestamp)
+        self._update(0, position[0], position[1], variance)
+
+    def update_accelerometer(self, acceleration, timestamp: float, heading: Optional[float] = None):
+        """Fuse an accelerometer frame (x, y[, z]) in m/s², rotated to world axes if the heading is known"""
+        self.predict(timestamp)
+        ax, ay = acceleration[0] * self.accel_scale, acceleration[1] * self.accel_scale
+        if heading is not None:
+            cos_h, sin_h = math.cos(heading), math.sin(heading)
+            ax, ay = ax * cos_h - ay * sin_h, ax * sin_h + ay * cos_h
+        self.acceleration[0] = ax
+        self.acceleration[1] = ay
+
+    def update_command(self, direction: str, speed: float, timestamp: float):
+        """Fuse the velocity a move command implies"""
+        unit_x, unit_y = COMMAND_DIRECTIONS.get(direction, (0.0, 0.0))
+        self.predict(timestamp)
+        self._update(2, unit_x * speed, unit_y * speed, self.command_noise ** 2)
+
+    def get_pose(self, timestamp: Optional[float] = None) -> Dict:
+        """Get the estimated position, velocity and position covariance, the position
+        extrapolated to a timestamp if given without touching the filter"""
+        x, y, vx, vy = self.state.tolist()
+        if timestamp is not None and self.timestamp is not None and timestamp > self.timestamp:
+            dt = timestamp - self.timestamp
+            ax, ay = self.acceleration.tolist()
+            x += vx * dt + 0.5 * ax * dt * dt
+            y += vy * dt + 0.5 * ay * dt * dt
+            vx += ax * dt
+            vy += ay * dt
+        return {
+            "x": x,
+            "y": y,
+            "vx": vx,
+            "vy": vy,
+            "covariance": self.covariance[:2, :2].tolist(),
+            "timestamp": self.timestamp if timestamp is None else timestamp
+        }
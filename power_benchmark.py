@@ -0,0 +1,42 @@
+import argparse
+import random
+import time
+from power_management import PowerManagementSystem, PowerMetrics
+
+def rebuild_history(history, metrics, max_age=3600.0):
+    """Reference history: the original append and rebuild of the whole list per sample"""
+    history.append(metrics)
+    return [metric for metric in history if metrics.timestamp - metric.timestamp <= max_age]
+
+def benchmark_power_history(num_samples=20000, rate=1.0, seed=0):
+    """Time power metric updates with an hour of history against the list rebuild"""
+    rng = random.Random(seed)
+    samples = [PowerMetrics(battery_level=100.0 - i * 0.001, power_consumption=rng.uniform(10, 50),
+                            temperature=rng.uniform(25, 45), voltage=rng.uniform(11, 12.6),
+                            current=rng.uniform(1, 4), timestamp=i / rate)
+               for i in range(num_samples)]
+
+    history = []
+    start = time.perf_counter()
+    for metrics in samples:
+        history = rebuild_history(history, metrics)
+    rebuild = (time.perf_counter() - start) / num_samples
+
+    power = PowerManagementSystem()
+    start = time.perf_counter()
+    for metrics in samples:
+        power.update_power_metrics(metrics)
+    ring = (time.perf_counter() - start) / num_samples
+    stats = power.get_power_statistics()
+    print(f"{num_samples} samples at {rate:g} Hz: rebuild {rebuild * 1e6:.1f} us/sample, "
+          f"ring buffer {ring * 1e6:.1f} us/sample, {stats['count']} kept (list kept {len(history)}), "
+          f"consumption mean {stats['power_consumption']['mean']:.2f} W ewma {stats['power_consumption']['ewma']:.2f} W")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark power history updates")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--rate", type=float, default=1.0, help="samples per second of metric time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark_power_history(args.samples, args.rate, args.seed)
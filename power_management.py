@@ -1,5 +1,5 @@
 from typing import Dict, List, Optional
-import time
+import numpy as np
 from dataclasses import dataclass
 from enum import Enum
 
@@ -18,10 +18,140 @@ class PowerMetrics:
     current: float
     timestamp: float
 
+# Metric fields with rolling statistics in the power history
+HISTORY_FIELDS = ("power_consumption", "temperature", "voltage")
+
+class PowerHistory:
+    def __init__(self, capacity: int = 4096, max_age: float = 3600.0, ewma_half_life: float = 60.0,
+                 max_capacity: int = 65536):
+        # Circular buffer of samples in timestamp order, one column per field, expired from the head.
+        # capacity is only the starting size, the buffer doubles whenever max_age of samples does
+        # not fit, up to max_capacity samples (2 MB, an hour at 18 Hz), then the oldest is evicted
+        self.max_capacity = max_capacity
+        capacity = min(capacity, max_capacity)
+        self.timestamps = np.zeros(capacity)
+        self.values = np.zeros((capacity, len(HISTORY_FIELDS)))
+        self.head = 0
+        self.count = 0
+        self.max_age = max_age  # seconds of metric time kept behind the newest sample
+        self.value_sums = np.zeros(len(HISTORY_FIELDS))
+        
+        # EWMA as time-decayed sums aged to the newest sample, any sampling rate works
+        # and a late sample weighs in by its age
+        self.ewma_half_life = ewma_half_life  # seconds
+        self.decayed_sums = np.zeros(len(HISTORY_FIELDS))
+        self.decayed_weight = 0.0
+        self.newest = -np.inf
+        self.latest: Optional[PowerMetrics] = None  # Sample with the newest timestamp
+        
+    def __len__(self) -> int:
+        return self.count
+        
+    def add(self, metrics: PowerMetrics):
+        """Add a sample, O(1) unless it arrives behind the newest one"""
+        sample = np.array([getattr(metrics, field) for field in HISTORY_FIELDS], dtype=float)
+        timestamp = metrics.timestamp
+        if timestamp >= self.newest:
+            if self.decayed_weight:
+                decay = 0.5 ** ((timestamp - self.newest) / self.ewma_half_life)
+                self.decayed_sums *= decay
+                self.decayed_weight *= decay
+            self.decayed_sums += sample
+            self.decayed_weight += 1.0
+            self.newest = timestamp
+            self.latest = metrics
+            self.expire(self.newest - self.max_age)
+            if self.count == self.max_capacity:
+                self._drop_head(1)
+            self._reserve(self.count + 1)
+            index = (self.head + self.count) % len(self.timestamps)
+            self.timestamps[index] = timestamp
+            self.values[index] = sample
+            self.count += 1
+            self.value_sums += sample
+            return
+        
+        weight = 0.5 ** ((self.newest - timestamp) / self.ewma_half_life)
+        self.decayed_sums += sample * weight
+        self.decayed_weight += weight
+        if timestamp >= self.newest - self.max_age:
+            self._insert(timestamp, sample)
+            
+    def _insert(self, timestamp: float, sample: np.ndarray):
+        """Add a late sample at its place in timestamp order, O(n) but rare"""
+        if self.count == self.max_capacity:
+            if timestamp < self.timestamps[self.head]:
+                return  # Older than everything kept, it would be evicted first
+            self._drop_head(1)
+        self._reserve(self.count + 1)
+        order = (self.head + np.arange(self.count)) % len(self.timestamps)
+        timestamps = self.timestamps[order]
+        values = self.values[order]
+        index = int(np.searchsorted(timestamps, timestamp, side="right"))
+        self.timestamps[:self.count + 1] = np.insert(timestamps, index, timestamp)
+        self.values[:self.count + 1] = np.insert(values, index, sample, axis=0)
+        self.head = 0
+        self.count += 1
+        self.value_sums += sample
+        
+    def _reserve(self, count: int):
+        """Grow the buffer to hold count samples, at most max_capacity, unrolling the ring"""
+        capacity = len(self.timestamps)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        capacity = min(capacity, self.max_capacity)
+        order = (self.head + np.arange(self.count)) % len(self.timestamps)
+        timestamps = np.zeros(capacity)
+        timestamps[:self.count] = self.timestamps[order]
+        values = np.zeros((capacity, len(HISTORY_FIELDS)))
+        values[:self.count] = self.values[order]
+        self.timestamps, self.values = timestamps, values
+        self.head = 0
+            
+    def _drop_head(self, drop: int):
+        """Drop the oldest samples, at most up to the end of the buffer"""
+        self.value_sums -= self.values[self.head:self.head + drop].sum(axis=0)
+        self.head = (self.head + drop) % len(self.timestamps)
+        self.count -= drop
+        if not self.count:
+            # Wipe float drift whenever the buffer empties
+            self.head = 0
+            self.value_sums.fill(0.0)
+            
+    def expire(self, cutoff: float):
+        """Drop samples older than the cutoff from the head"""
+        capacity = len(self.timestamps)
+        while self.count and self.timestamps[self.head] < cutoff:
+            # Binary search the contiguous run from the head
+            end = min(self.head + self.count, capacity)
+            self._drop_head(int(np.searchsorted(self.timestamps[self.head:end], cutoff)))
+            
+    def get_stats(self) -> Dict:
+        """Get the rolling mean and EWMA of each field"""
+        stats = {"count": self.count}
+        for column, field in enumerate(HISTORY_FIELDS):
+            stats[field] = {
+                "mean": float(self.value_sums[column] / self.count) if self.count else None,
+                "ewma": float(self.decayed_sums[column] / self.decayed_weight) if self.decayed_weight else None
+            }
+        return stats
+        
+    def clear(self):
+        """Forget every sample, e.g. before replaying a mission on another clock"""
+        self.head = 0
+        self.count = 0
+        self.value_sums.fill(0.0)
+        self.decayed_sums.fill(0.0)
+        self.decayed_weight = 0.0
+        self.newest = -np.inf
+        self.latest = None
+
 class PowerManagementSystem:
     def __init__(self):
         self.current_state = PowerState.NORMAL
-        self.power_history: List[PowerMetrics] = []
+        self.power_history = PowerHistory()  # Up to an hour of metrics by their own timestamps
         self.charging_station_location = None
         
         # Power consumption rates (watts)
@@ -29,6 +159,7 @@ class PowerManagementSystem:
         self.movement_consumption = 20.0
         self.sensor_consumption = 5.0
         self.communication_consumption = 15.0
+        self.battery_capacity = 100.0  # Wh
         
         # Battery thresholds
         self.RECHARGE_START = 5.0  # Start recharging at 5%
@@ -42,17 +173,13 @@ class PowerManagementSystem:
         
     def update_power_metrics(self, metrics: PowerMetrics):
         """Update power metrics and adjust system state"""
-        self.power_history.append(metrics)
-        self._cleanup_old_metrics()
-        self._update_power_state(metrics)
-        
-    def _cleanup_old_metrics(self, max_age: float = 3600.0):
-        """Remove metrics older than max_age seconds"""
-        current_time = time.time()
-        self.power_history = [
-            metric for metric in self.power_history
-            if current_time - metric.timestamp <= max_age
-        ]
+        self.power_history.add(metrics)
+        # A late sample says nothing about the current state
+        self._update_power_state(self.power_history.latest)
+        
+    def get_power_statistics(self) -> Dict:
+        """Get rolling mean and EWMA of consumption, temperature and voltage"""
+        return self.power_history.get_stats()
         
     def _update_power_state(self, metrics: PowerMetrics):
         """Update power state based on current metrics"""
@@ -99,19 +226,31 @@ class PowerManagementSystem:
         if not self.power_history:
             return 0.0
             
-        current_metrics = self.power_history[-1]
+        current_metrics = self.power_history.latest
         if current_consumption <= 0:
             return float('inf')
             
         return (current_metrics.battery_level / 100.0) * \
                (current_metrics.voltage * current_metrics.current) / current_consumption
                
+    def estimate_travel_range(self, speed: float, battery_level: Optional[float] = None) -> float:
+        """Estimate how far (cm) the rover can drive at speed (cm/s) before the recharge threshold"""
+        if battery_level is None:
+            if not self.power_history:
+                return 0.0
+            battery_level = self.power_history.latest.battery_level
+            
+        consumption = self.calculate_power_consumption(True, True, True)
+        usable = max(0.0, battery_level - self.RECHARGE_START)
+        seconds = (usable / 100.0) * self.battery_capacity * 3600.0 / consumption
+        return seconds * speed
+               
     def get_power_recommendations(self) -> Dict:
         """Get power management recommendations"""
         if not self.power_history:
             return {}
             
-        current_metrics = self.power_history[-1]
+        current_metrics = self.power_history.latest
         recommendations = {
             "state": self.current_state.value,
             "battery_level": current_metrics.battery_level,
@@ -145,7 +284,7 @@ class PowerManagementSystem:
         if not self.power_history:
             return False
             
-        current_metrics = self.power_history[-1]
+        current_metrics = self.power_history.latest
         return (current_metrics.battery_level <= self.RECHARGE_START or
                 current_metrics.temperature >= self.TEMP_WARNING)
                 
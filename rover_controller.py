@@ -3,6 +3,7 @@ import time
 from navigation_system import NavigationSystem
 from sensor_fusion import SensorFusionSystem, SensorReading, SensorType
 from power_management import PowerManagementSystem, PowerMetrics, PowerState
+from tour_planner import TourPlanner
 from dataclasses import dataclass
 from enum import Enum
 
@@ -26,13 +27,20 @@ class RoverStatus:
     timestamp: float
 
 class RoverController:
-    def __init__(self):
+    def __init__(self, sensor_fusion=None, search_area: Optional[List[float]] = None):
         self.navigation = NavigationSystem()
-        self.sensor_fusion = SensorFusionSystem()
+        # A FusionSession shares survivor evidence with the other rovers on the mission
+        self.sensor_fusion = sensor_fusion or SensorFusionSystem()
         self.power_management = PowerManagementSystem()
+        self.tour_planner = TourPlanner()
         self.current_state = RoverState.IDLE
         self.status_history: List[RoverStatus] = []
         self.start_position = [0, 0]
+        self.search_area = search_area or [-1000, -1000, 1000, 1000]  # cm, min_x, min_y, max_x, max_y
+        # Set when the coverage or tour battery budget sends the rover back before the
+        # power system asks for a recharge
+        self.budget_return = False
+        self.search_complete = False  # Every sweep of the search area is done, until start_search
         
     def update_status(self, status: RoverStatus):
         """Update rover status and trigger appropriate actions"""
@@ -103,6 +111,7 @@ class RoverController:
         if (self.current_state == RoverState.RETURNING_TO_CHARGE and
             self._is_at_charging_station(status.position)):
             self.current_state = RoverState.RECHARGING
+            self.budget_return = False
             return
             
         # Check for charging completion
@@ -157,17 +166,39 @@ class RoverController:
         current_status = self.status_history[-1]
         
         if self.current_state == RoverState.IDLE:
+            if self.search_complete:
+                return {"command": "stop", "reason": "coverage_complete"}
             return {"command": "start_search"}
             
         elif self.current_state == RoverState.SEARCHING:
-            return {"command": "search_pattern"}
+            if self.navigation.coverage_planner.area is None:
+                self.navigation.start_coverage(self.search_area)
+                
+            # Sweep as far as the battery allows, coverage resumes after recharging
+            range_budget = self.power_management.estimate_travel_range(self.navigation.travel_speed)
+            action = self.navigation.get_coverage_commands(
+                range_budget, self.power_management.charging_station_location
+            )
+            if action["command"] == "coverage_complete":
+                return self._finish_search(current_status, action)
+            if action["command"] != "return_to_charge":
+                return action
+            self.current_state = RoverState.RETURNING_TO_CHARGE
+            self.budget_return = True
+            return self._get_return_to_charge_action(current_status)
             
         elif self.current_state == RoverState.MOVING_TO_SURVIVOR:
-            survivors = self.sensor_fusion.get_priority_survivors()
-            if not survivors:
+            stops = self._plan_survivor_tour(current_status)
+            if not stops:
                 return {"command": "stop"}
                 
-            target = survivors[0]['position']
+            # The tour recharges first when the next survivor is out of range
+            if stops[0]["type"] == "charging_station":
+                self.current_state = RoverState.RETURNING_TO_CHARGE
+                self.budget_return = True
+                return self._get_return_to_charge_action(current_status)
+                
+            target = stops[0]["position"]
             return self.navigation.get_navigation_commands(
                 target, current_status.battery_level
             )
@@ -176,20 +207,62 @@ class RoverController:
             return {"command": "deliver_aid"}
             
         elif self.current_state == RoverState.RETURNING_TO_CHARGE:
-            charging_station = self.power_management.get_charging_station_path(
-                current_status.position
-            )
-            if charging_station:
-                return self.navigation.get_navigation_commands(
-                    charging_station, current_status.battery_level
-                )
-            return {"command": "stop"}
+            return self._get_return_to_charge_action(current_status)
             
         elif self.current_state == RoverState.RECHARGING:
             return {"command": "recharge"}
             
         return {"command": "stop"}
         
+    def start_search(self, search_area: Optional[List[float]] = None):
+        """Start sweeping a search area, the next one once the previous search is complete"""
+        if search_area is not None:
+            self.search_area = search_area
+        self.navigation.start_coverage(self.search_area)
+        self.search_complete = False
+        self.current_state = RoverState.SEARCHING
+        
+    def _finish_search(self, current_status: RoverStatus, action: Dict) -> Dict:
+        """Leave searching once the sweeps are done, back to the charging station if there is one"""
+        self.search_complete = True
+        if self.power_management.charging_station_location:
+            self.current_state = RoverState.RETURNING_TO_CHARGE
+            self.budget_return = True
+            return self._get_return_to_charge_action(current_status)
+        self.current_state = RoverState.IDLE
+        return {"command": "stop", "reason": "coverage_complete", "coverage": action["coverage"]}
+        
+    def _plan_survivor_tour(self, current_status: RoverStatus) -> List[Dict]:
+        """Order all open survivor detections into a tour with charging stops"""
+        # Every detection is a candidate, as the priority list was
+        survivors = self.sensor_fusion.get_survivor_detections(min_confidence=0.0)
+        charging_station = self.power_management.charging_station_location
+        self.tour_planner.sync(
+            {survivor['id']: survivor['position'] for survivor in survivors},
+            current_status.position, charging_station
+        )
+        
+        speed = self.navigation.travel_speed
+        return self.tour_planner.get_stops(
+            current_status.position,
+            self.power_management.estimate_travel_range(speed),
+            self.power_management.estimate_travel_range(speed, self.power_management.RECHARGE_STOP),
+            charging_station
+        )
+        
+    def _get_return_to_charge_action(self, current_status: RoverStatus) -> Dict:
+        """Get navigation commands toward the charging station"""
+        charging_station = self.power_management.get_charging_station_path(
+            current_status.position
+        )
+        if charging_station is None and self.budget_return:
+            charging_station = self.power_management.charging_station_location
+        if charging_station:
+            return self.navigation.get_navigation_commands(
+                charging_station, current_status.battery_level
+            )
+        return {"command": "stop"}
+        
     def get_status_report(self) -> Dict:
         """Generate comprehensive status report"""
         if not self.status_history:
@@ -209,5 +282,7 @@ class RoverController:
             "power_actions": power_recommendations.get("actions", []),
             "estimated_battery_life": self.power_management.estimate_battery_life(
                 self._calculate_current_consumption()
-            )
+            ),
+            "power_statistics": self.power_management.get_power_statistics(),
+            "plan_cache_hit_rate": self.navigation.get_plan_cache_stats()["hit_rate"]
         } 
\ No newline at end of file
@@ -1,5 +1,12 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import heapq
+import itertools
+import threading
 import numpy as np
+from collections import deque
+from spatial_index import SpatialHash
+from indexed_heap import IndexedHeap
+from survivor_heatmap import SurvivorHeatmap
 from dataclasses import dataclass
 from enum import Enum
 
@@ -16,11 +23,177 @@ class SensorReading:
     timestamp: float
     position: Tuple[float, float]
     confidence: float
+    rover_id: Optional[str] = None  # Reporting rover when detections are shared between rovers
+
+# Integer codes for columnar batches, in SensorType order
+SENSOR_TYPE_CODES = {sensor_type: code for code, sensor_type in enumerate(SensorType)}
+
+class ReadingWindow:
+    def __init__(self, capacity: int = 1024):
+        # Circular buffers in timestamp order, expired from the head
+        self.timestamps = np.zeros(capacity)
+        self.values = np.zeros(capacity)
+        self.head = 0
+        self.count = 0
+        self.oldest = np.inf  # Head timestamp, skips expiry checks without indexing the buffers
+        self.value_sum = 0.0
+        # (timestamp, value) of readings larger than every later one, the head is the window max
+        self.max_candidates = deque()
+
+    def _reserve(self, count: int):
+        """Grow the buffers to hold count readings, unrolling the ring"""
+        capacity = len(self.timestamps)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        order = (self.head + np.arange(self.count)) % len(self.timestamps)
+        for name in ("timestamps", "values"):
+            grown = np.zeros(capacity)
+            grown[:self.count] = getattr(self, name)[order]
+            setattr(self, name, grown)
+        self.head = 0
+
+    def append(self, timestamp: float, value: float):
+        """Add a reading at the tail of the window"""
+        self._reserve(self.count + 1)
+        index = (self.head + self.count) % len(self.timestamps)
+        self.timestamps[index] = timestamp
+        self.values[index] = value
+        if not self.count:
+            self.oldest = timestamp
+        self.count += 1
+        self.value_sum += value
+        candidates = self.max_candidates
+        while candidates and candidates[-1][1] <= value:
+            candidates.pop()
+        candidates.append((timestamp, value))
+
+    def insert(self, timestamp: float, value: float):
+        """Add a late reading at its place in timestamp order, O(window) but rare"""
+        if not self.count or timestamp >= self.timestamps[(self.head + self.count - 1) % len(self.timestamps)]:
+            self.append(timestamp, value)
+            return
+        self._reserve(self.count + 1)
+        order = (self.head + np.arange(self.count)) % len(self.timestamps)
+        timestamps = self.timestamps[order]
+        values = self.values[order]
+        index = int(np.searchsorted(timestamps, timestamp, side="right"))
+        self.timestamps[:self.count + 1] = np.insert(timestamps, index, timestamp)
+        self.values[:self.count + 1] = np.insert(values, index, value)
+        self.head = 0
+        self.count += 1
+        self.oldest = float(self.timestamps[0])
+        self.value_sum += value
+        
+        # A candidate only if larger than every later reading, the first candidate after it is
+        # their max. Late readings land near the tail, so the scans from the right stay short
+        candidates = self.max_candidates
+        position = len(candidates)
+        while position and candidates[position - 1][0] > timestamp:
+            position -= 1
+        if position < len(candidates) and candidates[position][1] >= value:
+            return
+        while position and candidates[position - 1][1] <= value:
+            del candidates[position - 1]
+            position -= 1
+        candidates.insert(position, (timestamp, value))
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray):
+        """Add a time-ordered batch of readings at the tail of the window"""
+        count = len(values)
+        if count == 0:
+            return
+        self._reserve(self.count + count)
+        capacity = len(self.timestamps)
+        start = (self.head + self.count) % capacity
+        first = min(count, capacity - start)
+        self.timestamps[start:start + first] = timestamps[:first]
+        self.values[start:start + first] = values[:first]
+        self.timestamps[:count - first] = timestamps[first:]
+        self.values[:count - first] = values[first:]
+        if not self.count:
+            self.oldest = float(timestamps[0])
+        self.count += count
+        self.value_sum += float(values.sum())
+        
+        # Batch candidates are its strict suffix maxima, they replace older candidates up to the batch max
+        later_max = np.append(np.maximum.accumulate(values[::-1])[::-1][1:], -np.inf)
+        keep = values > later_max
+        candidates = self.max_candidates
+        batch_max = float(values.max())
+        while candidates and candidates[-1][1] <= batch_max:
+            candidates.pop()
+        candidates.extend(zip(timestamps[keep].tolist(), values[keep].tolist()))
+
+    def expire(self, cutoff: float):
+        """Drop readings older than the cutoff from the head"""
+        if self.oldest >= cutoff:
+            return
+        capacity = len(self.timestamps)
+        while self.count and self.timestamps[self.head] < cutoff:
+            end = min(self.head + self.count, capacity)
+            if self.head + 1 < end and self.timestamps[self.head + 1] >= cutoff:
+                # Steady streams expire one reading at a time
+                drop = 1
+                dropped_sum = float(self.values[self.head])
+            else:
+                # Binary search the contiguous run from the head
+                drop = int(np.searchsorted(self.timestamps[self.head:end], cutoff))
+                dropped_sum = float(self.values[self.head:self.head + drop].sum())
+            self.value_sum -= dropped_sum
+            self.head = (self.head + drop) % capacity
+            self.count -= drop
+        if self.count:
+            self.oldest = float(self.timestamps[self.head])
+        else:
+            # Wipe float drift whenever the window empties
+            self.head = 0
+            self.oldest = np.inf
+            self.value_sum = 0.0
+        candidates = self.max_candidates
+        while candidates and candidates[0][0] < cutoff:
+            candidates.popleft()
+
+    def get_stats(self) -> Dict:
+        """Get count, mean and max of the values in the window"""
+        if not self.count:
+            return {"count": 0, "mean": None, "max": None}
+        return {
+            "count": self.count,
+            "mean": self.value_sum / self.count,
+            "max": self.max_candidates[0][1]
+        }
 
 class SensorFusionSystem:
     def __init__(self):
-        self.sensor_readings = []
-        self.survivor_detections = []
+        # Windowed readings per sensor type, and the event time of the latest reading applied
+        self.current_time = 0.0
+        
+        # Event-time ordering: readings wait in the reorder buffer until the watermark, the
+        # latest timestamp seen minus allowed_lateness, passes them, then apply in timestamp order
+        self.allowed_lateness = 0.0  # seconds, cover the skew between concurrent fetchers
+        self.max_event_time = -np.inf
+        self.reorder_buffer = []  # Heap of (ordering key, arrival number, reading)
+        self.arrivals = itertools.count()  # Breaks ties between identical readings
+        self.late_readings = 0     # Arrived behind readings already applied, merged in out of order
+        self.dropped_readings = 0  # Late by more than the window, ignored
+        self.lock = threading.RLock()  # Fetcher threads may ingest concurrently
+        self.sensor_windows = {sensor_type: ReadingWindow() for sensor_type in SensorType}
+        self.window_seconds = 5.0
+        self.confidence_half_life: Optional[float] = None  # seconds, None weighs old evidence the same as new
+        self.max_detection_readings = 20  # Recent readings kept on each detection
+        self.next_detection_id = 0  # Stable ids so planners can track detections
+        self.association_radius = 50.0  # cm, readings this close update an existing detection
+        self.detections_by_id: Dict[int, Dict] = {}  # Survivor detections in creation order
+        self.detection_index = SpatialHash(cell_size=self.association_radius)
+        self.priority_queue = IndexedHeap()  # Detections by rescue priority
+        
+        # Re-clustering merges detections of one survivor that greedy association split up
+        self.merge_radius = 2 * self.association_radius  # cm, detections this close merge into one
+        self.recluster_interval = 1.0  # seconds of reading time between passes
+        self.last_recluster = 0.0
+        self.touched_detections = set()  # Ids created, updated or moved since the last pass
         self.sensor_weights = {
             SensorType.ULTRASONIC: 0.3,
             SensorType.IR: 0.3,
@@ -36,19 +209,144 @@ class SensorFusionSystem:
             SensorType.ACCELEROMETER: 2.0 # m/s²
         }
         
+        # Heatmap likelihood model: readings at the neutral value say nothing, evidence grows
+        # up to full at the detection threshold and is worth the gain in log-odds at full
+        # confidence, readings on the far side count against a survivor, at most half as much
+        self.evidence_neutral = {
+            SensorType.ULTRASONIC: 300,
+            SensorType.IR: 0.4,
+            SensorType.RFID: 0.2,
+            SensorType.ACCELEROMETER: 1.0
+        }
+        self.evidence_gains = {
+            SensorType.ULTRASONIC: 0.6,
+            SensorType.IR: 0.8,
+            SensorType.RFID: 1.0,
+            SensorType.ACCELEROMETER: 0.3
+        }
+        self.heatmap = SurvivorHeatmap()
+        
     def add_sensor_reading(self, reading: SensorReading):
         """Add a new sensor reading to the system"""
-        self.sensor_readings.append(reading)
-        self._cleanup_old_readings()
+        with self.lock:
+            self.max_event_time = max(self.max_event_time, reading.timestamp)
+            heapq.heappush(self.reorder_buffer, (self._event_key(reading), next(self.arrivals), reading))
+            self._release(self.max_event_time - self.allowed_lateness)
+            
+    def flush(self):
+        """Apply every buffered reading, e.g. at the end of a replay"""
+        with self.lock:
+            self._release(np.inf)
+            
+    def _event_key(self, reading: SensorReading) -> Tuple:
+        """Total order on readings, so equal timestamps apply the same way whatever the arrival order"""
+        return (reading.timestamp, SENSOR_TYPE_CODES[reading.type], reading.position[0], reading.position[1],
+                reading.value, reading.confidence, reading.rover_id or "")
+        
+    def _release(self, watermark: float):
+        """Apply buffered readings up to the watermark in event-time order"""
+        while self.reorder_buffer and self.reorder_buffer[0][0][0] <= watermark:
+            _, _, reading = heapq.heappop(self.reorder_buffer)
+            self._apply_reading(reading)
+            
+    def _apply_reading(self, reading: SensorReading):
+        """Fold one reading into the windows, heatmap and detections"""
+        if reading.timestamp < self.current_time:
+            # Behind readings already applied, event time never moves backwards
+            self.late_readings += 1
+            if self.current_time - reading.timestamp > self.window_seconds:
+                self.dropped_readings += 1
+                return
+            self.sensor_windows[reading.type].insert(reading.timestamp, reading.value)
+        else:
+            self.current_time = reading.timestamp
+            self.sensor_windows[reading.type].append(reading.timestamp, reading.value)
+            self._cleanup_old_readings(self.window_seconds)
+        self.heatmap.add_point(reading.position[0], reading.position[1], self._reading_evidence(reading))
         self._process_new_reading(reading)
+        self._maybe_recluster()
+        
+    def add_sensor_readings_batch(self, type_codes: np.ndarray, values: np.ndarray, timestamps: np.ndarray,
+                                  xs: np.ndarray, ys: np.ndarray, confidences: np.ndarray,
+                                  rover_ids: Optional[np.ndarray] = None) -> int:
+        """Add columns of readings (type codes from SENSOR_TYPE_CODES), returns the number of hits,
+        the batch applies at once in event-time order and skips the reorder buffer"""
+        with self.lock:
+            type_codes = np.asarray(type_codes, dtype=np.int64)
+            values = np.asarray(values, dtype=float)
+            timestamps = np.asarray(timestamps, dtype=float)
+            xs = np.asarray(xs, dtype=float)
+            ys = np.asarray(ys, dtype=float)
+            confidences = np.asarray(confidences, dtype=float)
+            if rover_ids is None:
+                rover_ids = np.full(len(values), None, dtype=object)
+            rover_ids = np.asarray(rover_ids, dtype=object)
+            if len(values) == 0:
+                return 0
+            
+            # Same total order as _event_key, np.lexsort sorts by its last key first
+            if np.any(np.diff(timestamps) < 0):
+                ties = np.array([rover_id or "" for rover_id in rover_ids])
+                order = np.lexsort((ties, confidences, values, ys, xs, type_codes, timestamps))
+                type_codes, values, timestamps = type_codes[order], values[order], timestamps[order]
+                xs, ys, confidences, rover_ids = xs[order], ys[order], confidences[order], rover_ids[order]
+            
+            # Readings behind those already applied take the single late path
+            sensor_types = list(SensorType)
+            late = int(np.searchsorted(timestamps, self.current_time))
+            hits = 0
+            for index in range(late):
+                reading = SensorReading(sensor_types[type_codes[index]], float(values[index]), float(timestamps[index]),
+                                        (float(xs[index]), float(ys[index])), float(confidences[index]),
+                                        rover_ids[index])
+                hits += self._is_survivor_detected(reading)
+                self._apply_reading(reading)
+            type_codes, values, timestamps = type_codes[late:], values[late:], timestamps[late:]
+            xs, ys, confidences, rover_ids = xs[late:], ys[late:], confidences[late:], rover_ids[late:]
+            
+            if len(values):
+                self.current_time = float(timestamps[-1])
+                for sensor_type, code in SENSOR_TYPE_CODES.items():
+                    of_type = type_codes == code
+                    self.sensor_windows[sensor_type].extend(timestamps[of_type], values[of_type])
+                self._cleanup_old_readings(self.window_seconds)
+                self.heatmap.add_evidence(xs, ys, self._evidence(type_codes, values, confidences))
+                
+                # Threshold every reading at once, only hits go through association, with
+                # re-clustering passes at the same readings as one-at-a-time ingestion
+                hit_indices = np.flatnonzero(self._detection_mask(type_codes, values))
+                segment_start = 0
+                for index in hit_indices:
+                    self._recluster_between(timestamps, segment_start, index)
+                    segment_start = index
+                    self._update_survivor_detection(SensorReading(
+                        type=sensor_types[type_codes[index]],
+                        value=float(values[index]),
+                        timestamp=float(timestamps[index]),
+                        position=(float(xs[index]), float(ys[index])),
+                        confidence=float(confidences[index]),
+                        rover_id=rover_ids[index]
+                    ))
+                hits += len(hit_indices)
+                self._recluster_between(timestamps, segment_start, len(timestamps))
+            
+            # The batch moves the watermark for buffered single readings too
+            self.max_event_time = max(self.max_event_time, float(timestamps[-1]) if len(timestamps) else -np.inf)
+            self._release(self.max_event_time - self.allowed_lateness)
+            return hits
         
     def _cleanup_old_readings(self, max_age: float = 5.0):
-        """Remove sensor readings older than max_age seconds"""
-        current_time = self.sensor_readings[-1].timestamp if self.sensor_readings else 0
-        self.sensor_readings = [
-            reading for reading in self.sensor_readings
-            if current_time - reading.timestamp <= max_age
-        ]
+        """Remove sensor readings older than max_age seconds from the head of each window"""
+        cutoff = self.current_time - max_age
+        for window in self.sensor_windows.values():
+            window.expire(cutoff)
+            
+    def get_window_stats(self, sensor_type: Optional[SensorType] = None) -> Dict:
+        """Get windowed count, mean and max per sensor type, or for a single type"""
+        with self.lock:
+            if sensor_type is not None:
+                return self.sensor_windows[sensor_type].get_stats()
+            return {sensor_type.value: window.get_stats() for sensor_type, window in self.sensor_windows.items()}
         
     def _process_new_reading(self, reading: SensorReading):
         """Process new sensor reading and update survivor detections"""
@@ -70,59 +368,254 @@ class SensorFusionSystem:
             
         return False
         
+    def _detection_mask(self, type_codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Vectorized _is_survivor_detected over columns of type codes and values"""
+        thresholds = np.array([self.thresholds[sensor_type] for sensor_type in SensorType], dtype=float)
+        below = np.array([sensor_type == SensorType.ULTRASONIC for sensor_type in SensorType])
+        limit = thresholds[type_codes]
+        return np.where(below[type_codes], values < limit, values > limit)
+        
+    def _evidence(self, type_codes: np.ndarray, values: np.ndarray, confidences: np.ndarray) -> np.ndarray:
+        """Log-odds of a survivor each reading adds to the heatmap"""
+        sensor_types = list(SensorType)
+        neutral = np.array([self.evidence_neutral[sensor_type] for sensor_type in sensor_types], dtype=float)
+        thresholds = np.array([self.thresholds[sensor_type] for sensor_type in sensor_types], dtype=float)
+        gains = np.array([self.evidence_gains[sensor_type] for sensor_type in sensor_types])
+        # Fraction of the way from neutral to the threshold, works for ultrasonic's falling scale too
+        margin = (values - neutral[type_codes]) / (thresholds[type_codes] - neutral[type_codes])
+        return np.clip(margin, -0.5, 1.0) * gains[type_codes] * confidences
+        
+    def _reading_evidence(self, reading: SensorReading) -> float:
+        """Scalar _evidence for a single reading"""
+        neutral = self.evidence_neutral[reading.type]
+        margin = (reading.value - neutral) / (self.thresholds[reading.type] - neutral)
+        return min(max(margin, -0.5), 1.0) * self.evidence_gains[reading.type] * reading.confidence
+        
     def _update_survivor_detection(self, reading: SensorReading):
         """Update or create a survivor detection based on new sensor reading"""
-        # Check if we have a nearby existing detection
-        for detection in self.survivor_detections:
-            if self._is_nearby(reading.position, detection['position']):
-                # Update existing detection
-                detection['confidence'] = self._calculate_confidence(detection, reading)
-                detection['last_update'] = reading.timestamp
-                detection['sensor_readings'].append(reading)
-                return
+        # Check if we have a nearby existing detection, the oldest one wins
+        nearby = self.detection_index.query_radius(reading.position, self.association_radius)
+        if nearby:
+            # Update existing detection
+            detection = self.detections_by_id[min(nearby)]
+            detection['confidence'] = self._calculate_confidence(detection, reading)
+            detection['last_update'] = max(detection['last_update'], reading.timestamp)
+            detection['sensor_readings'].append(reading)
+            if reading.rover_id is not None:
+                detection['rovers'][reading.rover_id] = detection['rovers'].get(reading.rover_id, 0) + 1
+            self._queue_detection(detection)
+            self.touched_detections.add(detection['id'])
+            return
                 
         # Create new detection
-        self.survivor_detections.append({
+        detection = {
+            'id': self.next_detection_id,
             'position': reading.position,
             'confidence': reading.confidence,
             'last_update': reading.timestamp,
-            'sensor_readings': [reading]
-        })
+            'weight_sums': {},          # Sensor weight per type, decayed when enabled
+            'weighted_confidence': {},  # Weight times confidence per type
+            'sensor_readings': deque([reading], maxlen=self.max_detection_readings),
+            'found_by': reading.rover_id,  # Rover whose reading created the detection
+            'rovers': {} if reading.rover_id is None else {reading.rover_id: 1}  # Supporting readings per rover
+        }
+        self._add_evidence(detection, reading, 1.0)
+        self.detections_by_id[detection['id']] = detection
+        self.detection_index.insert(detection['id'], detection['position'])
+        self._queue_detection(detection)
+        self.touched_detections.add(detection['id'])
+        self.next_detection_id += 1
+        
+    @property
+    def survivor_detections(self) -> List[Dict]:
+        """All survivor detections, oldest first"""
+        return list(self.detections_by_id.values())
+        
+    def _queue_detection(self, detection: Dict):
+        """Re-key a detection in the priority queue after its confidence or last update changed"""
+        # Highest confidence first, then the longest since last update, then the oldest detection
+        self.priority_queue.push(detection['id'], (-detection['confidence'], detection['last_update'], detection['id']))
+        
+    def _move_detection(self, detection: Dict, position: Tuple[float, float]):
+        """Move a detection and keep the association index in step"""
+        detection['position'] = position
+        self.detection_index.insert(detection['id'], position)
+        self.touched_detections.add(detection['id'])
+        
+    def _remove_detection(self, detection: Dict):
+        """Drop a detection, e.g. after it was merged into another one"""
+        del self.detections_by_id[detection['id']]
+        self.detection_index.remove(detection['id'])
+        self.priority_queue.remove(detection['id'])
+        self.touched_detections.discard(detection['id'])
+        
+    def _maybe_recluster(self):
+        """Run a re-clustering pass once the interval has passed since the last one"""
+        if self.touched_detections and self.current_time - self.last_recluster >= self.recluster_interval:
+            self.recluster()
+        
+    def _recluster_between(self, timestamps: np.ndarray, start: int, stop: int):
+        """Run the passes _maybe_recluster would have run after each of timestamps[start:stop]"""
+        while self.touched_detections:
+            due = start + int(np.searchsorted(timestamps[start:stop], self.last_recluster + self.recluster_interval))
+            if due >= stop:
+                return
+            self.recluster(float(timestamps[due]))
+            start = due
+        
+    def recluster(self, timestamp: Optional[float] = None) -> int:
+        """Merge clusters of detections within merge_radius, grown only from detections touched
+        since the last pass, returns the number of detections merged away"""
+        with self.lock:
+            touched = self.touched_detections
+            self.touched_detections = set()
+            self.last_recluster = self.current_time if timestamp is None else timestamp
+            merged = 0
+            seen = set()
+            for detection_id in sorted(touched):
+                if detection_id in seen or detection_id not in self.detections_by_id:
+                    continue
+                # Grow through the spatial index, reaching past the touched region as needed. A
+                # neighbour only joins while the cluster's mean position stays within merge_radius
+                # of every member, so a line of survivors does not chain into one detection
+                component = [detection_id]
+                positions = [self.detections_by_id[detection_id]['position']]
+                seen.add(detection_id)
+                frontier = [detection_id]
+                while frontier:
+                    position = self.detections_by_id[frontier.pop()]['position']
+                    for neighbour in sorted(self.detection_index.query_radius(position, self.merge_radius)):
+                        if neighbour in seen:
+                            continue
+                        grown = np.array(positions + [self.detections_by_id[neighbour]['position']])
+                        offsets = grown - grown.mean(axis=0)
+                        if np.max(offsets[:, 0] ** 2 + offsets[:, 1] ** 2) > self.merge_radius ** 2:
+                            continue
+                        seen.add(neighbour)
+                        component.append(neighbour)
+                        positions.append(self.detections_by_id[neighbour]['position'])
+                        frontier.append(neighbour)
+                if len(component) > 1:
+                    self._merge_detections([self.detections_by_id[i] for i in sorted(component)])
+                    merged += len(component) - 1
+            return merged
+        
+    def _merge_detections(self, detections: List[Dict]):
+        """Fold detections into the oldest one, recombining their running sums"""
+        kept = detections[0]
+        latest = max(detection['last_update'] for detection in detections)
+        weight_sums = {}
+        weighted_confidence = {}
+        total_weight = 0.0
+        center_x = center_y = 0.0
+        for detection in detections:
+            # Bring every detection's evidence to the same age before adding it up
+            scale = 1.0
+            if self.confidence_half_life:
+                scale = 0.5 ** ((latest - detection['last_update']) / self.confidence_half_life)
+            for sensor_type, weight in detection['weight_sums'].items():
+                weight_sums[sensor_type] = weight_sums.get(sensor_type, 0.0) + weight * scale
+            for sensor_type, value in detection['weighted_confidence'].items():
+                weighted_confidence[sensor_type] = weighted_confidence.get(sensor_type, 0.0) + value * scale
+            weight = sum(detection['weight_sums'].values()) * scale
+            total_weight += weight
+            center_x += detection['position'][0] * weight
+            center_y += detection['position'][1] * weight
+        
+        readings = sorted((reading for detection in detections for reading in detection['sensor_readings']),
+                          key=lambda reading: reading.timestamp)
+        rovers = {}
+        for detection in detections:
+            for rover_id, count in detection['rovers'].items():
+                rovers[rover_id] = rovers.get(rover_id, 0) + count
+        kept['weight_sums'] = weight_sums
+        kept['weighted_confidence'] = weighted_confidence
+        kept['confidence'] = sum(weighted_confidence.values()) / total_weight if total_weight > 0 else 0
+        kept['last_update'] = latest
+        kept['sensor_readings'] = deque(readings, maxlen=self.max_detection_readings)
+        kept['rovers'] = rovers
+        for detection in detections[1:]:
+            self._remove_detection(detection)
+        if total_weight > 0:
+            # Weighted centre of the fragments
+            self._move_detection(kept, (center_x / total_weight, center_y / total_weight))
+        self._queue_detection(kept)
         
     def _is_nearby(self, pos1: Tuple[float, float], pos2: Tuple[float, float], 
                    threshold: float = 50.0) -> bool:
         """Check if two positions are within threshold distance"""
         return np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2) <= threshold
         
+    def _add_evidence(self, detection: Dict, reading: SensorReading, scale: float):
+        """Add a reading's weighted confidence to a detection's running sums"""
+        weight = self.sensor_weights[reading.type] * scale
+        weight_sums = detection['weight_sums']
+        weighted_confidence = detection['weighted_confidence']
+        weight_sums[reading.type] = weight_sums.get(reading.type, 0.0) + weight
+        weighted_confidence[reading.type] = weighted_confidence.get(reading.type, 0.0) + weight * reading.confidence
+        
     def _calculate_confidence(self, detection: Dict, new_reading: SensorReading) -> float:
-        """Calculate updated confidence based on all sensor readings"""
-        readings = detection['sensor_readings'] + [new_reading]
-        total_weight = 0
-        weighted_sum = 0
+        """Fold a new reading into the running sums and return the updated confidence"""
+        scale = 1.0
+        if self.confidence_half_life:
+            age = new_reading.timestamp - detection['last_update']
+            if age > 0:
+                # Age the evidence so far, the new reading counts in full
+                decay = 0.5 ** (age / self.confidence_half_life)
+                for sums in (detection['weight_sums'], detection['weighted_confidence']):
+                    for sensor_type in sums:
+                        sums[sensor_type] *= decay
+            else:
+                # A late reading is already older than the evidence so far
+                scale = 0.5 ** (-age / self.confidence_half_life)
+        self._add_evidence(detection, new_reading, scale)
         
-        for reading in readings:
-            weight = self.sensor_weights[reading.type]
-            total_weight += weight
-            weighted_sum += weight * reading.confidence
-            
+        total_weight = sum(detection['weight_sums'].values())
+        weighted_sum = sum(detection['weighted_confidence'].values())
         return weighted_sum / total_weight if total_weight > 0 else 0
         
-    def get_survivor_detections(self, min_confidence: float = 0.5) -> List[Dict]:
-        """Get all survivor detections above minimum confidence"""
-        return [
-            detection for detection in self.survivor_detections
-            if detection['confidence'] >= min_confidence
-        ]
-        
-    def get_priority_survivors(self, max_count: int = 5) -> List[Dict]:
-        """Get highest priority survivors based on confidence and recency"""
-        current_time = self.sensor_readings[-1].timestamp if self.sensor_readings else 0
-        
-        # Sort by confidence and recency
-        sorted_detections = sorted(
-            self.survivor_detections,
-            key=lambda x: (x['confidence'], current_time - x['last_update']),
-            reverse=True
-        )
-        
-        return sorted_detections[:max_count] 
\ No newline at end of file
+    def get_survivor_detections(self, min_confidence: float = 0.5, include_heatmap: bool = True) -> List[Dict]:
+        """Get all survivor detections above minimum confidence, plus heatmap peaks away from them"""
+        with self.lock:
+            detections = [
+                detection for detection in self.survivor_detections
+                if detection['confidence'] >= min_confidence
+            ]
+            if include_heatmap:
+                detections += self._heatmap_detections(min_confidence)
+            return detections
+        
+    def _heatmap_detections(self, min_confidence: float) -> List[Dict]:
+        """Heatmap peaks away from every detection, as detections, strongest evidence first"""
+        # Weak readings that add up where no single reading crossed a threshold
+        detections = []
+        for peak in self.heatmap.peaks():
+            if peak['probability'] < min_confidence:
+                continue
+            if self.detection_index.any_within(peak['position'], self.association_radius):
+                continue
+            detections.append({
+                'id': ('heatmap',) + peak['cell'],
+                'position': peak['position'],
+                'confidence': peak['probability'],
+                'last_update': self.current_time,
+                'source': 'heatmap'
+            })
+        return detections
+        
+    def get_heatmap(self, max_size: int = 64) -> Dict:
+        """Get the downsampled survivor probability grid for the dashboard"""
+        with self.lock:
+            return self.heatmap.get_heatmap(max_size)
+        
+    def get_priority_survivors(self, max_count: int = 5, include_heatmap: bool = True) -> List[Dict]:
+        """Get highest priority survivors based on confidence and recency, heatmap peaks included"""
+        with self.lock:
+            # Same order as sorting on (confidence, current_time - last_update) in reverse,
+            # the age term only depends on last_update since current_time is shared
+            survivors = [self.detections_by_id[detection_id] for detection_id in self.priority_queue.top(max_count)]
+            peaks = self._heatmap_detections(0.0) if include_heatmap else []
+            if peaks:
+                # Peaks are updated now, so they rank after detections of equal confidence
+                survivors = sorted(survivors + peaks, key=lambda survivor: -survivor['confidence'])[:max_count]
+            return survivors
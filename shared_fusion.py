@@ -0,0 +1,197 @@
+import os
+import threading
+from multiprocessing.managers import BaseManager
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sensor_fusion import SENSOR_TYPE_CODES, SensorFusionSystem, SensorReading
+
+# Detection fields kept inside the store, callers get the rest
+_INTERNAL_FIELDS = ("sensor_readings", "weight_sums", "weighted_confidence")
+
+class SharedFusionStore:
+    def __init__(self, fusion: Optional[SensorFusionSystem] = None, max_skew: float = 2.0):
+        # One fusion system, and so one spatial index, for every rover searching the area
+        self.fusion = fusion or SensorFusionSystem()
+        self.lock = threading.Lock()
+
+        # Each rover streams in its own time order, readings wait until every active rover has
+        # reported past them, then apply as one sorted batch. A rover more than max_skew seconds
+        # behind the newest reading no longer holds the others back, its readings merge in late
+        self.max_skew = max_skew  # seconds
+        self.rover_times: Dict[str, float] = {}  # Latest event time per registered rover
+        self.rover_stats: Dict[str, Dict] = {}   # Readings and hits per rover
+        self.pending: List[Tuple] = []  # Columns (type codes, values, timestamps, xs, ys, confidences, rover ids)
+        self.pending_count = 0
+        self.pending_oldest = np.inf  # Nothing to release until the watermark reaches it
+
+    def register_rover(self, rover_id: str):
+        """Start holding readings back for a rover's stream"""
+        with self.lock:
+            self.rover_times.setdefault(rover_id, -np.inf)
+            self.rover_stats.setdefault(rover_id, {"readings": 0, "hits": 0})
+
+    def unregister_rover(self, rover_id: str):
+        """Stop waiting on a rover that left the mission"""
+        with self.lock:
+            self.rover_times.pop(rover_id, None)
+            self._release()
+
+    def add_readings(self, rover_id: str, type_codes: np.ndarray, values: np.ndarray, timestamps: np.ndarray,
+                     xs: np.ndarray, ys: np.ndarray, confidences: np.ndarray):
+        """Add columns of one rover's readings (type codes from SENSOR_TYPE_CODES)"""
+        timestamps = np.asarray(timestamps, dtype=float)
+        if len(timestamps) == 0:
+            return
+        columns = (np.asarray(type_codes, dtype=np.int64), np.asarray(values, dtype=float), timestamps,
+                   np.asarray(xs, dtype=float), np.asarray(ys, dtype=float), np.asarray(confidences, dtype=float),
+                   np.full(len(timestamps), rover_id, dtype=object))
+        with self.lock:
+            if rover_id not in self.rover_times:
+                self.rover_times[rover_id] = -np.inf
+                self.rover_stats[rover_id] = {"readings": 0, "hits": 0}
+            self.rover_times[rover_id] = max(self.rover_times[rover_id], float(timestamps.max()))
+            self.rover_stats[rover_id]["readings"] += len(timestamps)
+            self.pending.append(columns)
+            self.pending_count += len(timestamps)
+            self.pending_oldest = min(self.pending_oldest, float(timestamps.min()))
+            self._release()
+
+    def add_sensor_readings(self, rover_id: str, readings: List[SensorReading]):
+        """Add one rover's readings as SensorReading objects"""
+        self.add_readings(
+            rover_id,
+            [SENSOR_TYPE_CODES[reading.type] for reading in readings],
+            [reading.value for reading in readings],
+            [reading.timestamp for reading in readings],
+            [reading.position[0] for reading in readings],
+            [reading.position[1] for reading in readings],
+            [reading.confidence for reading in readings]
+        )
+
+    def flush(self):
+        """Apply every pending reading without waiting for other rovers"""
+        with self.lock:
+            self._release(np.inf)
+
+    def _watermark(self) -> float:
+        """Event time every active rover has reported up to"""
+        if not self.rover_times:
+            return np.inf
+        latest = max(self.rover_times.values())
+        return max(min(self.rover_times.values()), latest - self.max_skew)
+
+    def _release(self, watermark: Optional[float] = None):
+        """Apply pending readings up to the watermark as one batch"""
+        if watermark is None:
+            watermark = self._watermark()
+        if not self.pending or watermark < self.pending_oldest:
+            return
+        columns = [np.concatenate(column) for column in zip(*self.pending)]
+        ready = columns[2] <= watermark
+        hits = self.fusion.add_sensor_readings_batch(*(column[ready] for column in columns[:6]),
+                                                     rover_ids=columns[6][ready])
+        if hits:
+            # Count hits per rover from the readings that went in
+            hit_mask = self.fusion._detection_mask(columns[0][ready], columns[1][ready])
+            rover_ids, counts = np.unique(columns[6][ready][hit_mask].astype(str), return_counts=True)
+            for rover_id, count in zip(rover_ids.tolist(), counts.tolist()):
+                if rover_id in self.rover_stats:
+                    self.rover_stats[rover_id]["hits"] += count
+        waiting = ~ready
+        self.pending = [tuple(column[waiting] for column in columns)] if np.any(waiting) else []
+        self.pending_count = int(np.count_nonzero(waiting))
+        self.pending_oldest = float(columns[2][waiting].min()) if self.pending_count else np.inf
+
+    def _snapshot(self, detection: Dict) -> Dict:
+        """Copy of a detection that is safe to hand to another thread or process"""
+        snapshot = {key: value for key, value in detection.items() if key not in _INTERNAL_FIELDS}
+        if 'rovers' in snapshot:
+            snapshot['rovers'] = dict(snapshot['rovers'])
+        return snapshot
+
+    def get_survivor_detections(self, min_confidence: float = 0.5, include_heatmap: bool = True) -> List[Dict]:
+        """Get the merged survivor detections of every rover, with the rovers that support each"""
+        with self.lock:
+            return [self._snapshot(detection)
+                    for detection in self.fusion.get_survivor_detections(min_confidence, include_heatmap)]
+
+    def get_priority_survivors(self, max_count: int = 5, include_heatmap: bool = True) -> List[Dict]:
+        """Get highest priority survivors across every rover"""
+        with self.lock:
+            return [self._snapshot(detection)
+                    for detection in self.fusion.get_priority_survivors(max_count, include_heatmap)]
+
+    def get_heatmap(self, max_size: int = 64) -> Dict:
+        """Get the shared survivor probability grid"""
+        with self.lock:
+            return self.fusion.get_heatmap(max_size)
+
+    def get_rover_stats(self) -> Dict:
+        """Get readings and hits per rover, and how many readings are waiting on slower rovers"""
+        with self.lock:
+            return {
+                "rovers": {rover_id: dict(stats) for rover_id, stats in self.rover_stats.items()},
+                "pending": self.pending_count,
+                "detections": len(self.fusion.detections_by_id)
+            }
+
+class FusionSession:
+    def __init__(self, store, rover_id: str, batch_size: int = 64):
+        # One rover's handle on a shared store, in-process or a proxy from connect_fusion_store
+        self.store = store
+        self.rover_id = rover_id
+        self.batch_size = batch_size  # Readings buffered per call to the store
+        self.buffer: List[SensorReading] = []
+        self.store.register_rover(rover_id)
+
+    def add_sensor_reading(self, reading: SensorReading):
+        """Buffer a reading, sent to the store once batch_size are waiting"""
+        self.buffer.append(reading)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Send buffered readings to the store"""
+        if self.buffer:
+            readings, self.buffer = self.buffer, []
+            self.store.add_sensor_readings(self.rover_id, readings)
+
+    def get_survivor_detections(self, min_confidence: float = 0.5, include_heatmap: bool = True) -> List[Dict]:
+        """Get survivor detections from every rover"""
+        self.flush()
+        return self.store.get_survivor_detections(min_confidence, include_heatmap)
+
+    def get_priority_survivors(self, max_count: int = 5, include_heatmap: bool = True) -> List[Dict]:
+        """Get highest priority survivors from every rover"""
+        self.flush()
+        return self.store.get_priority_survivors(max_count, include_heatmap)
+
+    def close(self):
+        """Send what is buffered and stop holding the other rovers back"""
+        self.flush()
+        self.store.unregister_rover(self.rover_id)
+
+class FusionStoreManager(BaseManager):
+    """Connects rover processes to a SharedFusionStore over a local socket"""
+
+FusionStoreManager.register("get_store")
+
+def serve_fusion_store(store: SharedFusionStore, address: Tuple[str, int] = ("127.0.0.1", 50070),
+                       authkey: Optional[bytes] = None) -> Tuple[threading.Thread, bytes]:
+    """Serve a store to other processes from a background thread, one server thread per connection,
+    returns the thread and the key clients need, a random one unless given"""
+    if authkey is None:
+        authkey = os.urandom(32)
+    class StoreServer(FusionStoreManager):
+        pass
+    StoreServer.register("get_store", callable=lambda: store)
+    server = StoreServer(address=address, authkey=authkey).get_server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread, authkey
+
+def connect_fusion_store(authkey: bytes, address: Tuple[str, int] = ("127.0.0.1", 50070)):
+    """Get a proxy to a store served by serve_fusion_store, usable wherever the store is"""
+    manager = FusionStoreManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.get_store()
@@ -0,0 +1,79 @@
+import math
+from typing import Dict, Hashable, List, Tuple
+
+class SpatialHash:
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.buckets: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float]]] = {}
+        self.positions: Dict[Hashable, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self.positions
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        """Get the bucket containing a position"""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, item_id: Hashable, position):
+        """Insert an item, or move it if it is already indexed"""
+        if item_id in self.positions:
+            self.remove(item_id)
+        position = (float(position[0]), float(position[1]))
+        self.positions[item_id] = position
+        self.buckets.setdefault(self._key(*position), {})[item_id] = position
+
+    def remove(self, item_id: Hashable) -> bool:
+        """Remove an item, returns False if it was not indexed"""
+        position = self.positions.pop(item_id, None)
+        if position is None:
+            return False
+
+        key = self._key(*position)
+        bucket = self.buckets[key]
+        del bucket[item_id]
+        if not bucket:
+            del self.buckets[key]
+        return True
+
+    def _nearby_buckets(self, position, radius: float):
+        """Yield the non-empty buckets overlapping a circle's bounding box"""
+        min_x, min_y = self._key(position[0] - radius, position[1] - radius)
+        max_x, max_y = self._key(position[0] + radius, position[1] + radius)
+        for bx in range(min_x, max_x + 1):
+            for by in range(min_y, max_y + 1):
+                bucket = self.buckets.get((bx, by))
+                if bucket:
+                    yield bucket
+
+    def query_radius(self, position, radius: float, strict: bool = False) -> List[Hashable]:
+        """Get items within radius of a position (closer than radius if strict)"""
+        radius_sq = radius * radius
+        found = []
+        for bucket in self._nearby_buckets(position, radius):
+            for item_id, (x, y) in bucket.items():
+                dx = position[0] - x
+                dy = position[1] - y
+                dist_sq = dx*dx + dy*dy
+                if dist_sq < radius_sq or (not strict and dist_sq == radius_sq):
+                    found.append(item_id)
+        return found
+
+    def any_within(self, position, radius: float, strict: bool = False) -> bool:
+        """Check if any item is within radius of a position"""
+        radius_sq = radius * radius
+        for bucket in self._nearby_buckets(position, radius):
+            for x, y in bucket.values():
+                dx = position[0] - x
+                dy = position[1] - y
+                dist_sq = dx*dx + dy*dy
+                if dist_sq < radius_sq or (not strict and dist_sq == radius_sq):
+                    return True
+        return False
+
+    def clear(self):
+        """Remove all items"""
+        self.buckets.clear()
+        self.positions.clear()
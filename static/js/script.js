@@ -33,7 +33,9 @@ const pathSettings = {
   survivorColor: "#e74c3c",
   startColor: "#f39c12",
   padding: 30,
-  maxPositions: 50,
+  maxPositions: 50000, // Path is drawn incrementally, trim only very long runs
+  trimPositions: 5000, // Positions dropped at once when the path is trimmed
+  boundsSlack: 0.25, // Extra room added when the view grows, limits rescales
   pathWidth: 3,
   roverStrokeWidth: 2,
   survivorStrokeWidth: 1.5,
@@ -54,6 +56,19 @@ let roverState = {
   survivorsCount: 0,
 };
 
+// Incremental path rendering state
+const gridLayer = document.createElement("canvas");
+const pathLayer = document.createElement("canvas");
+const gridLayerCtx = gridLayer.getContext("2d");
+const pathLayerCtx = pathLayer.getContext("2d");
+let pathView = {
+  dataBounds: null, // Running bounds of path, rover and survivors
+  viewBounds: null, // Bounds currently mapped onto the canvas
+  scale: null,
+  drawnPositions: 0, // Path positions already drawn on the path layer
+  redrawScheduled: false,
+};
+
 // Log window controls
 const logWindow = document.getElementById("logWindow");
 const minimizeLogBtn = document.getElementById("minimizeLogBtn");
@@ -91,30 +106,84 @@ function initPathVisualization() {
   pathCtx.strokeRect(0, 0, pathCanvas.width, pathCanvas.height);
 }
 
-// Calculate the scale for the path visualization
-function calculatePathScale(positions) {
-  if (!positions || positions.length === 0) {
-    return { scaleX: 1, scaleY: 1, minX: 0, minY: 0, maxX: 0, maxY: 0 };
+// Initialize the offscreen layers for the static grid and the path
+function initPathLayers() {
+  gridLayer.width = pathLayer.width = pathCanvas.width;
+  gridLayer.height = pathLayer.height = pathCanvas.height;
+
+  // The grid does not depend on the scale, so it is drawn only once
+  drawGrid(gridLayerCtx);
+
+  // Resizing cleared the path layer, force a full redraw
+  pathView.viewBounds = null;
+}
+
+// Extend the running bounds with a new position
+function extendPathBounds(pos) {
+  const bounds = pathView.dataBounds;
+  if (!bounds) {
+    pathView.dataBounds = { minX: pos[0], maxX: pos[0], minY: pos[1], maxY: pos[1] };
+    return;
   }
+  bounds.minX = Math.min(bounds.minX, pos[0]);
+  bounds.maxX = Math.max(bounds.maxX, pos[0]);
+  bounds.minY = Math.min(bounds.minY, pos[1]);
+  bounds.maxY = Math.max(bounds.maxY, pos[1]);
+}
 
-  // Find min and max coordinates
-  let minX = positions[0][0];
-  let maxX = positions[0][0];
-  let minY = positions[0][1];
-  let maxY = positions[0][1];
-
-  positions.forEach((pos) => {
-    minX = Math.min(minX, pos[0]);
-    maxX = Math.max(maxX, pos[0]);
-    minY = Math.min(minY, pos[1]);
-    maxY = Math.max(maxY, pos[1]);
-  });
+// Rebuild the running bounds from scratch (only needed after trimming)
+function resetPathBounds() {
+  pathView.dataBounds = null;
+  pathView.viewBounds = null;
+  roverState.path.forEach(extendPathBounds);
+  if (roverState.currentPosition) {
+    extendPathBounds(roverState.currentPosition);
+  }
+  roverState.survivors.forEach(extendPathBounds);
+}
+
+// Grow the view bounds if the data left them, returns true on rescale
+function updatePathView() {
+  const data = pathView.dataBounds;
+  const view = pathView.viewBounds;
 
   // Add some padding
-  minX -= 1;
-  maxX += 1;
-  minY -= 1;
-  maxY += 1;
+  const minX = data.minX - 1;
+  const maxX = data.maxX + 1;
+  const minY = data.minY - 1;
+  const maxY = data.maxY + 1;
+
+  if (
+    view &&
+    minX >= view.minX &&
+    maxX <= view.maxX &&
+    minY >= view.minY &&
+    maxY <= view.maxY
+  ) {
+    return false;
+  }
+
+  // Grow with some slack on the side that overflowed so a path expanding
+  // into new territory only triggers a full redraw now and then
+  const slackX = view ? (maxX - minX) * pathSettings.boundsSlack : 0;
+  const slackY = view ? (maxY - minY) * pathSettings.boundsSlack : 0;
+  pathView.viewBounds = {
+    minX: view && minX >= view.minX ? view.minX : minX - slackX,
+    maxX: view && maxX <= view.maxX ? view.maxX : maxX + slackX,
+    minY: view && minY >= view.minY ? view.minY : minY - slackY,
+    maxY: view && maxY <= view.maxY ? view.maxY : maxY + slackY,
+  };
+  pathView.scale = calculatePathScale(pathView.viewBounds);
+  return true;
+}
+
+// Calculate the scale for the path visualization
+function calculatePathScale(bounds) {
+  if (!bounds) {
+    return { scaleX: 1, scaleY: 1, minX: 0, minY: 0, maxX: 0, maxY: 0 };
+  }
+
+  const { minX, minY, maxX, maxY } = bounds;
 
   // Calculate scale
   const rangeX = maxX - minX;
@@ -134,6 +203,63 @@ function pathCoordinates(x, y, scale) {
   return { x: canvasX, y: canvasY };
 }
 
+// Draw path segments from index `from` onwards onto the path layer
+function drawPathSegments(from, scale) {
+  const path = roverState.path;
+  if (path.length < 2 || from >= path.length) {
+    return;
+  }
+
+  pathLayerCtx.strokeStyle = pathSettings.pathColor;
+  pathLayerCtx.lineWidth = pathSettings.pathWidth;
+  pathLayerCtx.lineCap = "round";
+  pathLayerCtx.lineJoin = "round";
+
+  // Use quadratic curves for smoother path
+  pathLayerCtx.beginPath();
+  const start = Math.max(from, 1);
+  let prevCoords = pathCoordinates(path[start - 1][0], path[start - 1][1], scale);
+  pathLayerCtx.moveTo(prevCoords.x, prevCoords.y);
+
+  for (let i = start; i < path.length; i++) {
+    const currCoords = pathCoordinates(path[i][0], path[i][1], scale);
+
+    // Calculate control point for smooth curve
+    const controlX =
+      prevCoords.x + (currCoords.x - prevCoords.x) * pathSettings.pathSmoothing;
+    const controlY =
+      prevCoords.y + (currCoords.y - prevCoords.y) * pathSettings.pathSmoothing;
+
+    pathLayerCtx.quadraticCurveTo(controlX, controlY, currCoords.x, currCoords.y);
+    prevCoords = currCoords;
+  }
+
+  pathLayerCtx.stroke();
+}
+
+// Bring the path layer up to date, redrawing it fully only on rescale
+function updatePathLayer() {
+  if (updatePathView()) {
+    pathLayerCtx.clearRect(0, 0, pathLayer.width, pathLayer.height);
+    pathView.drawnPositions = 0;
+  }
+
+  drawPathSegments(pathView.drawnPositions, pathView.scale);
+  pathView.drawnPositions = roverState.path.length;
+}
+
+// Coalesce redraws requested by one map update into a single frame
+function schedulePathVisualization() {
+  if (pathView.redrawScheduled) {
+    return;
+  }
+  pathView.redrawScheduled = true;
+  requestAnimationFrame(() => {
+    pathView.redrawScheduled = false;
+    drawPathVisualization();
+  });
+}
+
 // Draw the path visualization
 function drawPathVisualization() {
   // Initialize the canvas
@@ -144,63 +270,17 @@ function drawPathVisualization() {
     return;
   }
 
-  // Calculate scale based on all positions (path + current + survivors)
-  const allPositions = [...roverState.path];
-  if (roverState.currentPosition) {
-    allPositions.push(roverState.currentPosition);
-  }
-  if (roverState.survivors && roverState.survivors.length > 0) {
-    allPositions.push(...roverState.survivors);
-  }
-
-  const scale = calculatePathScale(allPositions);
+  // Append new segments (or rescale) on the offscreen path layer
+  updatePathLayer();
+  const scale = pathView.scale;
 
   // Draw grid
-  drawGrid(scale);
-
-  // Draw the path with smoothing
-  if (roverState.path.length > 1) {
-    pathCtx.strokeStyle = pathSettings.pathColor;
-    pathCtx.lineWidth = pathSettings.pathWidth;
-    pathCtx.lineCap = "round";
-    pathCtx.lineJoin = "round";
-    pathCtx.globalAlpha = pathSettings.pathOpacity;
+  pathCtx.drawImage(gridLayer, 0, 0);
 
-    // Use quadratic curves for smoother path
-    pathCtx.beginPath();
-    const startCoords = pathCoordinates(
-      roverState.path[0][0],
-      roverState.path[0][1],
-      scale
-    );
-    pathCtx.moveTo(startCoords.x, startCoords.y);
-
-    for (let i = 1; i < roverState.path.length; i++) {
-      const prevCoords = pathCoordinates(
-        roverState.path[i - 1][0],
-        roverState.path[i - 1][1],
-        scale
-      );
-      const currCoords = pathCoordinates(
-        roverState.path[i][0],
-        roverState.path[i][1],
-        scale
-      );
-
-      // Calculate control point for smooth curve
-      const controlX =
-        prevCoords.x +
-        (currCoords.x - prevCoords.x) * pathSettings.pathSmoothing;
-      const controlY =
-        prevCoords.y +
-        (currCoords.y - prevCoords.y) * pathSettings.pathSmoothing;
-
-      pathCtx.quadraticCurveTo(controlX, controlY, currCoords.x, currCoords.y);
-    }
-
-    pathCtx.stroke();
-    pathCtx.globalAlpha = 1.0;
-  }
+  // Draw the path, composited at its opacity so segment joints stay even
+  pathCtx.globalAlpha = pathSettings.pathOpacity;
+  pathCtx.drawImage(pathLayer, 0, 0);
+  pathCtx.globalAlpha = 1.0;
 
   // Draw the starting position with enhanced visuals
   if (roverState.startingPosition) {
@@ -384,32 +464,31 @@ function drawPathVisualization() {
 }
 
 // Add grid drawing function
-function drawGrid(scale) {
-  const canvas = document.getElementById("pathCanvas");
-  const width = canvas.width;
-  const height = canvas.height;
+function drawGrid(ctx) {
+  const width = ctx.canvas.width;
+  const height = ctx.canvas.height;
 
-  pathCtx.strokeStyle = pathSettings.gridColor;
-  pathCtx.lineWidth = 0.5;
-  pathCtx.globalAlpha = pathSettings.gridOpacity;
+  ctx.strokeStyle = pathSettings.gridColor;
+  ctx.lineWidth = 0.5;
+  ctx.globalAlpha = pathSettings.gridOpacity;
 
   // Draw vertical lines
   for (let x = 0; x <= width; x += pathSettings.gridSize) {
-    pathCtx.beginPath();
-    pathCtx.moveTo(x, 0);
-    pathCtx.lineTo(x, height);
-    pathCtx.stroke();
+    ctx.beginPath();
+    ctx.moveTo(x, 0);
+    ctx.lineTo(x, height);
+    ctx.stroke();
   }
 
   // Draw horizontal lines
   for (let y = 0; y <= height; y += pathSettings.gridSize) {
-    pathCtx.beginPath();
-    pathCtx.moveTo(0, y);
-    pathCtx.lineTo(width, y);
-    pathCtx.stroke();
+    ctx.beginPath();
+    ctx.moveTo(0, y);
+    ctx.lineTo(width, y);
+    ctx.stroke();
   }
 
-  pathCtx.globalAlpha = 1.0;
+  ctx.globalAlpha = 1.0;
 }
 
 // Update path with new position
@@ -423,6 +502,7 @@ function updatePath(position) {
 
   // Update current position
   roverState.currentPosition = [...position];
+  extendPathBounds(position);
 
   // Add to path if it's a new position
   if (
@@ -432,14 +512,15 @@ function updatePath(position) {
   ) {
     roverState.path.push([...position]);
 
-    // Limit the path length to avoid performance issues
+    // Limit the path length, trimming in chunks since it forces a full redraw
     if (roverState.path.length > pathSettings.maxPositions) {
-      roverState.path.shift();
+      roverState.path.splice(0, pathSettings.trimPositions);
+      resetPathBounds();
     }
   }
 
   // Redraw the path visualization
-  drawPathVisualization();
+  schedulePathVisualization();
 }
 
 // Add log entry
@@ -654,9 +735,10 @@ function updateSurvivors(survivors) {
 
   // Update the survivors state
   roverState.survivors = [...survivors];
+  roverState.survivors.forEach(extendPathBounds);
 
   // Update the path visualization
-  drawPathVisualization();
+  schedulePathVisualization();
 }
 
 // Update battery level
@@ -747,7 +829,7 @@ socket.on("map_update", (data) => {
     // Update direction
     if (data.direction) {
       roverState.currentDirection = data.direction;
-      drawPathVisualization();
+      schedulePathVisualization();
     }
   }
 });
@@ -858,6 +940,7 @@ document.addEventListener("DOMContentLoaded", () => {
   survivorsCount.textContent = "0";
 
   // Initialize path visualization
+  initPathLayers();
   initPathVisualization();
 
   // Add initial log entry
@@ -0,0 +1,205 @@
+import bisect
+import math
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Cells of zero evidence around the grid, wide enough for a peak check two cells past an update
+_MARGIN = 3
+
+class SurvivorHeatmap:
+    def __init__(self, width: float = 4000.0, height: float = 4000.0,
+                 resolution: float = 25.0, origin: Optional[Tuple[float, float]] = None):
+        self.resolution = resolution  # cm per cell
+        self.shape = (int(math.ceil(width / resolution)), int(math.ceil(height / resolution)))
+
+        # World position of cell (0, 0)'s corner, grid is centered on (0, 0) by default
+        if origin is None:
+            origin = (-self.shape[0] * resolution / 2, -self.shape[1] * resolution / 2)
+        self.origin = np.array(origin, dtype=float)
+
+        # Log-odds of a survivor per cell, indexed [x, y], a view into a zero margin so
+        # neighbourhoods near the edge need no bounds checks
+        padded_shape = (self.shape[0] + 2 * _MARGIN, self.shape[1] + 2 * _MARGIN)
+        self._padded_log_odds = np.zeros(padded_shape, dtype=np.float64)
+        self.log_odds = self._padded_log_odds[_MARGIN:-_MARGIN, _MARGIN:-_MARGIN]
+        self.min_log_odds = -3.0
+        self.max_log_odds = 8.0
+        self.peak_log_odds = 2.0  # p ~ 0.88, weaker peaks are not reported as survivors
+
+        # Readings of one survivor straddle cell borders, so peaks are judged on the evidence
+        # summed over each cell's 3x3 neighbourhood, -inf in the margin
+        self._padded_summed = np.full(padded_shape, -np.inf)
+        self._padded_summed[_MARGIN:-_MARGIN, _MARGIN:-_MARGIN] = 0.0
+        self._strong = np.zeros(padded_shape, dtype=bool)  # Peaks at or above peak_log_odds
+        self.strong_peaks: Dict[int, Dict] = {}  # The same peaks described, by flat padded index
+        self._peak_order: List[Tuple] = []  # Their (-log_odds, cell, flat index), strongest first
+        self._inside_mask = np.isfinite(self._padded_summed).reshape(-1)
+        self._inside = np.flatnonzero(self._inside_mask)
+
+        # Flat offsets of the 3x3 and 5x5 neighbourhoods, in row-major (dx, dy) order
+        stride = padded_shape[1]
+        self._offsets = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+        self._flat_offsets = self._offsets @ np.array([stride, 1])
+        self._flat_offsets_2 = np.array([dx * stride + dy for dx in range(-2, 3) for dy in range(-2, 3)])
+
+        # Cells changed since peaks were last brought up to date, as flat padded indices,
+        # updates only queue them so ingestion stays O(1) per reading
+        self._dirty: List[int] = []
+
+    def world_to_cell(self, points) -> np.ndarray:
+        """Convert world positions (..., 2) to integer cell indices"""
+        points = np.asarray(points, dtype=float)
+        return np.floor((points - self.origin) / self.resolution).astype(np.int64)
+
+    def cell_to_world(self, cells) -> np.ndarray:
+        """Convert cell indices (..., 2) to world positions of the cell centers"""
+        cells = np.asarray(cells)
+        return self.origin + (cells + 0.5) * self.resolution
+
+    def add_evidence(self, xs: np.ndarray, ys: np.ndarray, log_odds: np.ndarray):
+        """Add log-odds evidence at world positions, summed per cell and clamped once per call"""
+        cells = self.world_to_cell(np.column_stack([xs, ys]))
+        inside = ((cells[:, 0] >= 0) & (cells[:, 0] < self.shape[0]) &
+                  (cells[:, 1] >= 0) & (cells[:, 1] < self.shape[1]))
+        if not np.any(inside):
+            return
+        # Only the touched cells change, the rest of the grid is left alone
+        flat = (cells[inside, 0] + _MARGIN) * self._padded_log_odds.shape[1] + cells[inside, 1] + _MARGIN
+        touched, slots = np.unique(flat, return_inverse=True)
+        totals = np.bincount(slots, weights=np.asarray(log_odds, dtype=float)[inside], minlength=len(touched))
+        cell_log_odds = self._padded_log_odds.reshape(-1)
+        cell_log_odds[touched] = np.clip(cell_log_odds[touched] + totals, self.min_log_odds, self.max_log_odds)
+        self._dirty.extend(touched.tolist())
+
+    def add_point(self, x: float, y: float, log_odds: float):
+        """Add log-odds evidence at one world position"""
+        cell_x = math.floor((x - self.origin[0]) / self.resolution)
+        cell_y = math.floor((y - self.origin[1]) / self.resolution)
+        if 0 <= cell_x < self.shape[0] and 0 <= cell_y < self.shape[1]:
+            value = self.log_odds[cell_x, cell_y] + log_odds
+            self.log_odds[cell_x, cell_y] = min(max(value, self.min_log_odds), self.max_log_odds)
+            self._dirty.append((cell_x + _MARGIN) * self._padded_log_odds.shape[1] + cell_y + _MARGIN)
+
+    def probability(self) -> np.ndarray:
+        """Get the survivor probability of every cell"""
+        return 1.0 - 1.0 / (1.0 + np.exp(self.log_odds))
+
+    def peaks(self, min_log_odds: Optional[float] = None) -> List[Dict]:
+        """Get local maxima of neighbourhood evidence above min_log_odds, strongest first, as position,
+        the probability of the strongest cell around it and the summed neighbourhood log-odds"""
+        if min_log_odds is None:
+            min_log_odds = self.peak_log_odds
+        self._refresh_dirty()
+        if min_log_odds >= self.peak_log_odds:
+            # Peaks this strong are kept up to date and in order around every change
+            peaks = [self.strong_peaks[cell] for _, _, cell in self._peak_order]
+        else:
+            # Weaker ones take a scan of the whole grid
+            flags = self._peak_flags(self._inside, min_log_odds)
+            peaks = sorted(self._describe_peaks(self._inside[flags]).values(),
+                           key=lambda peak: (-peak["log_odds"], peak["cell"]))
+        return [dict(peak) for peak in peaks if peak["log_odds"] >= min_log_odds]
+
+    def _peak_flags(self, cells: np.ndarray, min_log_odds: float) -> np.ndarray:
+        """Check which flat cells have 3x3 evidence of at least min_log_odds that beats their
+        8 neighbours', plateaus keep their first cell"""
+        summed = self._padded_summed.reshape(-1)
+        center = summed[cells]
+        peak = (center > 0.0) & (center >= min_log_odds)
+        for offset in self._flat_offsets.tolist():
+            if offset == 0:
+                continue
+            # Strict against neighbours before the cell, so equal neighbours yield one peak
+            neighbour = summed[cells + offset]
+            peak &= center > neighbour if offset < 0 else center >= neighbour
+        return peak
+
+    def _refresh_dirty(self):
+        """Bring the neighbourhood sums and strong peaks up to date around changed cells"""
+        if not self._dirty:
+            return
+        touched = np.array(list(set(self._dirty)), dtype=np.int64)
+        self._dirty = []
+        if len(touched) * len(self._flat_offsets_2) >= len(self._inside):
+            # Changes all over the grid, every cell is checked anyway
+            summed_cells = peak_cells = self._inside
+        else:
+            # A cell's sum moves with the cells next to it, whether it is a peak with the sums next to it,
+            # repeats are harmless since every repeat writes the same value
+            summed_cells = (touched[:, None] + self._flat_offsets).reshape(-1)
+            summed_cells = summed_cells[self._inside_mask[summed_cells]]
+            peak_cells = (touched[:, None] + self._flat_offsets_2).reshape(-1)
+
+        # Same order of additions as summing the shifted grids, whatever the cells
+        log_odds = self._padded_log_odds.reshape(-1)
+        total = 0
+        for offset in self._flat_offsets.tolist():
+            total = total + log_odds[summed_cells + offset]
+        self._padded_summed.reshape(-1)[summed_cells] = total
+
+        # The margin sums -inf and is never a peak, so cells up to the margin need no bounds check
+        flags = self._strong.reshape(-1)
+        flipped = peak_cells[flags[peak_cells] != self._peak_flags(peak_cells, self.peak_log_odds)]
+        if len(flipped):
+            flipped = np.unique(flipped)
+            flags[flipped] = ~flags[flipped]
+            for cell in flipped[~flags[flipped]].tolist():
+                self._unorder_peak(self.strong_peaks.pop(cell), cell)
+        changed = summed_cells[flags[summed_cells]]
+        if len(flipped):
+            changed = np.concatenate([changed, flipped[flags[flipped]]])
+        if not len(changed):
+            return
+        # Peaks whose sum or cells moved are described again, the rest keep their entry and place
+        for cell, peak in self._describe_peaks(np.unique(changed)).items():
+            if cell in self.strong_peaks:
+                self._unorder_peak(self.strong_peaks[cell], cell)
+            self.strong_peaks[cell] = peak
+            bisect.insort(self._peak_order, (-peak["log_odds"], peak["cell"], cell))
+
+    def _unorder_peak(self, peak: Dict, cell: int):
+        """Drop a described peak from the strongest-first order"""
+        index = bisect.bisect_left(self._peak_order, (-peak["log_odds"], peak["cell"], cell))
+        del self._peak_order[index]
+
+    def _describe_peaks(self, cells: np.ndarray) -> Dict[int, Dict]:
+        """Describe flat peak cells by position, probability, neighbourhood log-odds and grid cell"""
+        values = self._padded_summed.reshape(-1)[cells]
+        grid_cells = np.stack(np.divmod(cells, self._padded_log_odds.shape[1]), axis=1).reshape(-1, 2) - _MARGIN
+
+        # Place each peak at the centroid of the positive evidence around it, the summed evidence
+        # only ranks peaks, their probability is that of the strongest single cell
+        neighbourhood = self._padded_log_odds.reshape(-1)[cells[:, None] + self._flat_offsets]
+        weights = np.maximum(neighbourhood, 0.0)
+        totals = np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+        centers = self.cell_to_world(grid_cells[:, None, :] + self._offsets[None, :, :])
+        positions = (centers * weights[..., None]).sum(axis=1) / totals
+        strongest = neighbourhood.max(axis=1, initial=-np.inf)
+        return {
+            cell: {"position": (x, y), "probability": 1.0 - 1.0 / (1.0 + math.exp(cell_value)),
+                   "log_odds": value, "cell": (cx, cy)}
+            for cell, (x, y), value, cell_value, (cx, cy) in zip(cells.tolist(), positions.tolist(), values.tolist(),
+                                                               strongest.tolist(), grid_cells.tolist())
+        }
+
+    def get_heatmap(self, max_size: int = 64) -> Dict:
+        """Get a max-pooled probability grid at most max_size cells a side, for the dashboard"""
+        factor = max(1, math.ceil(max(self.shape) / max_size))
+        padded_shape = (math.ceil(self.shape[0] / factor) * factor, math.ceil(self.shape[1] / factor) * factor)
+        padded = np.full(padded_shape, self.min_log_odds)
+        padded[:self.shape[0], :self.shape[1]] = self.log_odds
+        pooled = padded.reshape(padded_shape[0] // factor, factor, padded_shape[1] // factor, factor).max(axis=(1, 3))
+        return {
+            "origin": self.origin.tolist(),
+            "cell_size": self.resolution * factor,
+            "probability": np.round(1.0 - 1.0 / (1.0 + np.exp(pooled)), 3).tolist()
+        }
+
+    def clear(self):
+        """Reset every cell to no evidence"""
+        self.log_odds.fill(0.0)
+        self._padded_summed[_MARGIN:-_MARGIN, _MARGIN:-_MARGIN] = 0.0
+        self._strong.fill(False)
+        self.strong_peaks.clear()
+        self._peak_order = []
+        self._dirty = []
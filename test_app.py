@@ -0,0 +1,50 @@
+import os
+import time
+import app as app_module
+
+def make_static(tmp_path, monkeypatch):
+    """Point the app at a static dir holding script.js and fresh .gz/.br variants"""
+    (tmp_path / "js").mkdir()
+    source = tmp_path / "js" / "script.js"
+    source.write_text("console.log('rover');")
+    for suffix in (".gz", ".br"):
+        (tmp_path / "js" / ("script.js" + suffix)).write_bytes(b"compressed")
+    later = time.time() + 10
+    for suffix in (".gz", ".br"):
+        os.utime(tmp_path / "js" / ("script.js" + suffix), (later, later))
+    monkeypatch.setattr(app_module, "STATIC_DIR", str(tmp_path))
+    monkeypatch.setattr(app_module, "static_fingerprints", {})
+
+def served_encoding(accept_encoding):
+    client = app_module.app.test_client()
+    response = client.get("/static/js/script.js", headers={"Accept-Encoding": accept_encoding})
+    assert response.status_code == 200
+    return response.headers.get("Content-Encoding")
+
+def test_parse_accept_encoding_reads_q_values():
+    weights = app_module.parse_accept_encoding("gzip;q=0, identity, br ; q=0.5, *;q=0.1")
+    assert weights == {"gzip": 0.0, "identity": 1.0, "br": 0.5, "*": 0.1}
+
+def test_preferred_encoding_when_all_accepted(tmp_path, monkeypatch):
+    make_static(tmp_path, monkeypatch)
+    assert served_encoding("gzip, deflate, br") == "br"
+
+def test_q_zero_is_never_served(tmp_path, monkeypatch):
+    make_static(tmp_path, monkeypatch)
+    assert served_encoding("gzip;q=0, identity") is None
+    assert served_encoding("br;q=0, gzip") == "gzip"
+
+def test_higher_q_value_wins(tmp_path, monkeypatch):
+    make_static(tmp_path, monkeypatch)
+    assert served_encoding("br;q=0.2, gzip;q=0.8") == "gzip"
+
+def test_wildcard_accepts_unlisted_encodings(tmp_path, monkeypatch):
+    make_static(tmp_path, monkeypatch)
+    assert served_encoding("*") == "br"
+    assert served_encoding("br;q=0, *") == "gzip"
+
+def test_stale_variant_is_skipped(tmp_path, monkeypatch):
+    make_static(tmp_path, monkeypatch)
+    earlier = time.time() - 100
+    os.utime(tmp_path / "js" / "script.js.br", (earlier, earlier))
+    assert served_encoding("br, gzip") == "gzip"
@@ -0,0 +1,93 @@
+import math
+import time
+import numpy as np
+from coverage_planner import CoveragePlanner
+from navigation_system import NavigationSystem
+from rover_controller import RoverController, RoverState, RoverStatus
+
+def all_free(points):
+    return np.ones(len(points), dtype=bool)
+
+def test_lanes_alternate_direction_and_split_around_obstacles():
+    planner = CoveragePlanner(lane_spacing=100)
+    planner.plan([0, 0, 1000, 300], lambda points: ~((points[:, 0] > 400) & (points[:, 0] < 600) & (points[:, 1] < 100)), 10)
+    assert planner.sweeps == [
+        ((0.0, 50.0), (400.0, 50.0)), ((600.0, 50.0), (1000.0, 50.0)),
+        ((1000.0, 150.0), (0.0, 150.0)),
+        ((0.0, 250.0), (1000.0, 250.0))
+    ]
+
+def test_leg_leaves_range_to_return_and_resumes_mid_sweep():
+    planner = CoveragePlanner(lane_spacing=100)
+    planner.plan([0, 0, 1000, 100], all_free, 10)
+    station = [0, 50]
+    leg = planner.next_leg([0, 50], 1000, station)
+    # Out and back along the sweep, 500 cm each way
+    assert len(leg) == 1 and math.isclose(leg[0][0], 500) and leg[0][1] == 50
+    planner.advance(leg[0])
+    assert math.isclose(planner.resume_point[0], 500)
+    assert math.isclose(planner.progress()["fraction"], 0.5)
+    assert planner.next_leg([0, 50], 2000, station) == [(500.0, 50.0), (1000.0, 50.0)]
+
+def test_transit_route_is_cached_until_the_map_changes_near_it():
+    navigation = NavigationSystem()
+    navigation.mark_obstacles([[400, y] for y in range(-300, 300, 10)])
+    navigation.start_coverage([600, -100, 1000, 100])
+    navigation.get_coverage_commands(1e6)
+    misses = navigation.plan_cache.misses
+    command = navigation.get_coverage_commands(1e6)
+    assert command["command"] == "move"
+    assert navigation.plan_cache.misses == misses
+    assert navigation._is_path_clear(command["path"][:2])
+
+    navigation.mark_obstacles([[300, 350]])
+    navigation.get_coverage_commands(1e6)
+    assert navigation.plan_cache.misses == misses + 1
+
+def status(battery_level, position=(0, 0)):
+    return RoverStatus(position=list(position), battery_level=battery_level, temperature=30.0, voltage=12.0,
+                       current=1.0, state=RoverState.SEARCHING, survivors_found=0, timestamp=time.time())
+
+def test_controller_uses_search_area_and_only_returns_when_asked():
+    controller = RoverController(search_area=[0, 0, 400, 400])
+    controller.power_management.set_charging_station([0, 0])
+    controller.update_status(status(90, (200, 200)))
+    controller.current_state = RoverState.SEARCHING
+    assert controller.get_next_action()["command"] == "move"
+    assert controller.navigation.coverage_planner.area == [0, 0, 400, 400]
+
+    # Neither a low battery nor a budget return, so there is nowhere to go
+    controller.current_state = RoverState.RETURNING_TO_CHARGE
+    assert controller.get_next_action() == {"command": "stop"}
+    controller.budget_return = True
+    assert controller.get_next_action()["command"] == "move"
+
+def test_finished_search_returns_to_the_station_and_stays_idle():
+    controller = RoverController(search_area=[0, 0, 400, 400])
+    controller.power_management.set_charging_station([0, 0])
+    controller.update_status(status(90, (200, 200)))
+    controller.start_search()
+    planner = controller.navigation.coverage_planner
+    planner.sweep_index = len(planner.sweeps)
+    assert controller.get_next_action()["command"] == "move"
+    assert controller.current_state == RoverState.RETURNING_TO_CHARGE and controller.search_complete
+
+    # Recharged at the station, the rover waits for the next area instead of sweeping again
+    controller.update_status(status(90, (0, 0)))
+    controller.update_status(status(90, (0, 0)))
+    assert controller.current_state == RoverState.IDLE
+    assert controller.get_next_action() == {"command": "stop", "reason": "coverage_complete"}
+    controller.start_search([400, 0, 800, 400])
+    assert controller.current_state == RoverState.SEARCHING
+    assert controller.get_next_action()["command"] == "move"
+    assert planner.area == [400, 0, 800, 400]
+
+def test_finished_search_without_a_station_stops():
+    controller = RoverController(search_area=[0, 0, 400, 400])
+    controller.update_status(status(90, (200, 200)))
+    controller.start_search()
+    planner = controller.navigation.coverage_planner
+    planner.sweep_index = len(planner.sweeps)
+    action = controller.get_next_action()
+    assert (action["command"], action["reason"]) == ("stop", "coverage_complete")
+    assert controller.current_state == RoverState.IDLE
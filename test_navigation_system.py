@@ -0,0 +1,99 @@
+import numpy as np
+from navigation_system import NavigationSystem
+
+def test_obstacle_far_from_origin_is_remembered_and_unsafe():
+    navigation = NavigationSystem()
+    navigation.current_position = [2500, 0]
+    result = navigation.process_ultrasonic_data(30, 0)
+    assert result["obstacle_detected"]
+    assert len(navigation.obstacle_index) == 1
+    assert not navigation._is_position_safe([2530, 0])
+    assert navigation._is_position_safe([2800, 0])
+    assert not navigation._is_path_clear([(2600, 0)])
+    assert navigation.world_map.query_bbox(2400, -100, 2700, 100)["obstacles"]
+
+def test_navigation_does_not_drive_into_far_obstacle():
+    navigation = NavigationSystem()
+    navigation.current_position = [2500, 0]
+    navigation.process_ultrasonic_data(30, 0)
+    command = navigation.get_navigation_commands([2700, 0], 80)
+    if command["command"] == "move":
+        assert navigation._is_path_clear(command["path"])
+
+def test_no_route_stops_instead_of_returning_blocked_zigzag():
+    navigation = NavigationSystem()
+    # Ring of obstacles around the target
+    angles = np.linspace(0, 2 * np.pi, 120, endpoint=False)
+    navigation.mark_obstacles((np.stack([np.cos(angles), np.sin(angles)], axis=1) * 150 + [600, 0]).tolist())
+    assert navigation._get_planned_path([600, 0], 80) == []
+    assert navigation.get_navigation_commands([600, 0], 80) == {"command": "stop", "reason": "no_safe_path"}
+
+def test_blocked_zigzag_falls_back_to_clear_route():
+    navigation = NavigationSystem()
+    navigation.mark_obstacles([[300, y] for y in range(-400, 400, 10)] + [[800, y] for y in range(-400, 400, 10)])
+    path = navigation._get_planned_path([600, 0], 80)
+    assert path and path[-1] == (600.0, 0.0)
+    assert navigation._is_path_clear(path)
+
+def test_route_to_target_in_the_rovers_planning_cell_goes_straight_there():
+    navigation = NavigationSystem()
+    assert navigation.find_route([5, 5]) == [(5.0, 5.0)]
+
+def test_reobserving_an_obstacle_from_further_away_keeps_it():
+    navigation = NavigationSystem()
+    navigation.current_position = [0, 0]
+    assert navigation.process_ultrasonic_data(40, 0)["obstacle_detected"]
+    assert len(navigation.obstacle_index) == 1
+    # Backed up 20 cm, the same echo is now past the obstacle threshold
+    navigation.current_position = [-20, 0]
+    assert not navigation.process_ultrasonic_data(60, 0)["obstacle_detected"]
+    assert len(navigation.obstacle_index) == 1
+    assert not navigation._is_position_safe([40, 0])
+    # Nothing within range marks nothing
+    navigation.current_position = [0, 200]
+    navigation.process_ultrasonic_data(500, 0)
+    assert len(navigation.obstacle_index) == 1
+
+def test_blocked_routes_are_repaired_by_the_incremental_planner():
+    navigation = NavigationSystem()
+    navigation.current_position = [-300, 0]
+    navigation.mark_obstacles([[0, y] for y in range(-300, 150, 10)])
+    route = navigation._get_planned_path([300, 0], 80)
+    assert route and navigation._is_path_clear(route)
+    planner = navigation.route_planner
+    assert planner is not None
+
+    # A second wall across the route is fed into the same planner
+    expansions = planner.expansions
+    navigation.mark_obstacles([[x, 200] for x in range(-100, 400, 10)])
+    route = navigation._get_planned_path([300, 0], 80)
+    assert navigation.route_planner is planner and planner.expansions > expansions
+    assert route and navigation._is_path_clear(route)
+
+def test_sweep_keeps_mid_range_echoes_occupied():
+    navigation = NavigationSystem()
+    angles = np.arange(0, 360, 45.0)
+    result = navigation.process_ultrasonic_scan(np.full(len(angles), 40.0), angles, [0, 0, 0])
+    assert result["obstacle_detected"] and len(result["obstacles"]) == len(angles)
+    known = len(navigation.obstacle_index)
+    assert known == len(angles)
+
+    # The same ring seen from 20 cm back, the echo straight ahead is now mid-range
+    distances = np.hypot(40 * np.cos(np.radians(angles)) + 20, 40 * np.sin(np.radians(angles)))
+    headings = np.degrees(np.arctan2(40 * np.sin(np.radians(angles)), 40 * np.cos(np.radians(angles)) + 20))
+    result = navigation.process_ultrasonic_scan(distances, headings, [-20, 0, 0])
+    assert not navigation._is_position_safe([40, 0])
+    assert tuple(navigation.occupancy_grid.world_to_cell([40, 0]).tolist()) in navigation.obstacle_index
+    assert len(navigation.obstacle_index) >= known
+    assert all(obstacle["distance"] < navigation.obstacle_threshold for obstacle in result["obstacles"])
+
+def test_sweep_matches_single_beams_on_occupancy():
+    rng = np.random.default_rng(3)
+    angles = np.arange(0, 360, 22.5)
+    distances = rng.uniform(20, 500, len(angles))
+    swept = NavigationSystem()
+    swept.process_ultrasonic_scan(distances, angles, [0, 0, 0])
+    single = NavigationSystem()
+    for distance, angle in zip(distances, angles):
+        single.process_ultrasonic_data(distance, angle)
+    assert set(swept.obstacle_index.positions) == set(single.obstacle_index.positions)
@@ -0,0 +1,79 @@
+import numpy as np
+from occupancy_grid import ClearanceMap, OccupancyGrid
+
+def test_hit_marks_cell_occupied_and_reports_change():
+    grid = OccupancyGrid(1000, 1000, 10)
+    changed = grid.update_points([[55, -25]])
+    assert changed == [tuple(grid.world_to_cell([55, -25]).tolist())]
+    assert grid.is_occupied([[55, -25], [0, 0]]).tolist() == [True, False]
+
+def test_beam_frees_cells_it_crosses():
+    grid = OccupancyGrid(1000, 1000, 10)
+    grid.update_points([[100, 0]])
+    for _ in range(3):
+        grid.update_beam([0, 0], [200, 0], hit=False)
+    assert not grid.is_occupied([[100, 0]])[0]
+
+def test_obstacle_far_from_origin_is_stored_and_queried():
+    grid = OccupancyGrid(1000, 1000, 10)
+    far = [2530.0, 0.0]
+    changed = grid.update_beam([2500, 0], far, hit=True)
+    cell = tuple(grid.world_to_cell(far).tolist())
+    assert cell in changed
+    assert grid.is_occupied([far])[0]
+    assert cell in map(tuple, grid.occupied_cells().tolist())
+    np.testing.assert_allclose(grid.occupied_positions()[-1], [2535.0, 5.0])
+
+def test_far_obstacle_clears_after_misses_and_is_forgotten():
+    grid = OccupancyGrid(1000, 1000, 10)
+    grid.update_points([[3000, 3000]])
+    for _ in range(3):
+        grid.update_points([[3000, 3000]], hit=False)
+    assert not grid.is_occupied([[3000, 3000]])[0]
+    assert grid.outside == {}
+
+def test_clearance_matches_brute_force_after_updates():
+    grid = OccupancyGrid(600, 600, 10)
+    clearance = ClearanceMap(grid, max_distance=100)
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-320, 320, (40, 2))  # Some land just beyond the grid edge
+    clearance.update(grid.update_points(points))
+    clearance.update(grid.update_points(points[:10], hit=False))
+    clearance.update(grid.update_points(points[:10], hit=False))
+
+    obstacles = grid.occupied_positions()
+    cells = np.argwhere(np.ones(grid.shape, dtype=bool))
+    centers = grid.cell_to_world(cells)
+    distance = np.sqrt(((centers[:, None, :] - obstacles[None, :, :]) ** 2).sum(axis=2)).min(axis=1)
+    expected = np.minimum(distance, 100).reshape(grid.shape)
+    np.testing.assert_allclose(clearance.clearance, expected, atol=1e-3)
+
+def random_sweep(rng, count):
+    origin = rng.uniform(-300, 300, 2)
+    angles = np.radians(np.arange(count) * 360 / count + rng.uniform(0, 360))
+    distances = rng.uniform(20, 400, count)
+    ends = origin + np.stack([np.cos(angles), np.sin(angles)], axis=1) * distances[:, None]
+    return origin, ends, distances < 350
+
+def test_single_beam_sweeps_match_update_beam_exactly():
+    rng = np.random.default_rng(1)
+    batched = OccupancyGrid(1000, 1000, 10)
+    single = OccupancyGrid(1000, 1000, 10)
+    for _ in range(200):
+        origin, ends, hits = random_sweep(rng, 1)
+        assert batched.update_beams(origin, ends, hits) == single.update_beam(origin, ends[0], hits[0])
+    np.testing.assert_array_equal(batched.log_odds, single.log_odds)
+
+def test_sweep_marks_the_same_cells_as_repeated_update_beam():
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        origin, ends, hits = random_sweep(rng, 16)
+        batched = OccupancyGrid(1000, 1000, 10)
+        single = OccupancyGrid(1000, 1000, 10)
+        changed = batched.update_beams(origin, ends, hits)
+        for end, hit in zip(ends, hits):
+            single.update_beam(origin, end, hit)
+        # Cells shared by several beams take one update per sweep, so only the occupancy is compared
+        occupied = set(map(tuple, single.occupied_cells().tolist()))
+        assert set(map(tuple, batched.occupied_cells().tolist())) == occupied
+        assert set(changed) == occupied
@@ -0,0 +1,67 @@
+import numpy as np
+from occupancy_grid import ClearanceMap, OccupancyGrid
+from path_planner import CoarseCostMap, CostMap, DStarLite, astar, simplify_path
+
+def build_cost_map(points, size=600):
+    grid = OccupancyGrid(size, size, 10)
+    clearance = ClearanceMap(grid, max_distance=200)
+    clearance.update(grid.update_points(points))
+    return CostMap(clearance, robot_radius=30, safe_distance=100)
+
+def wall(x, y_from, y_to):
+    return [[x, y] for y in range(y_from, y_to, 10)]
+
+def route_cost(cost_map, cells):
+    return sum(cost_map.edge_cost(a, b) for a, b in zip(cells, cells[1:]))
+
+def test_astar_routes_around_wall():
+    cost_map = build_cost_map(wall(0, -300, 150))
+    start, goal = (tuple(cell) for cell in cost_map.world_to_cell([[-200, 0], [200, 0]]).tolist())
+    cells = astar(cost_map, start, goal)
+    assert cells[0] == start and cells[-1] == goal
+    assert all(np.isfinite(cost_map.costs[cell]) for cell in cells)
+
+def test_astar_gives_up_after_max_expansions_and_when_blocked():
+    cost_map = build_cost_map(wall(0, -300, 300))
+    start, goal = (tuple(cell) for cell in cost_map.world_to_cell([[-200, 0], [200, 0]]).tolist())
+    assert astar(cost_map, start, goal) is None
+
+    open_map = build_cost_map([])
+    assert astar(open_map, start, goal, max_expansions=5) is None
+    assert astar(open_map, start, goal, max_expansions=1000) is not None
+
+def test_dstar_lite_repair_matches_fresh_astar():
+    cost_map = build_cost_map(wall(0, -300, 100))
+    start, goal = (tuple(cell) for cell in cost_map.world_to_cell([[-200, 0], [200, 0]]).tolist())
+    planner = DStarLite(cost_map, start, goal)
+    assert route_cost(cost_map, planner.plan()) == route_cost(cost_map, astar(cost_map, start, goal))
+
+    changed = cost_map.grid.update_points(wall(100, -100, 300))
+    cost_map.clearance_map.update(changed)
+    planner.update_costs(cost_map.refresh(changed))
+    repaired = planner.plan()
+    np.testing.assert_allclose(route_cost(cost_map, repaired), route_cost(cost_map, astar(cost_map, start, goal)))
+
+def test_dstar_lite_resumes_after_max_expansions():
+    cost_map = build_cost_map(wall(0, -300, 100))
+    start, goal = (tuple(cell) for cell in cost_map.world_to_cell([[-200, 0], [200, 0]]).tolist())
+    planner = DStarLite(cost_map, start, goal)
+    assert planner.plan(max_expansions=10) is None
+    path = None
+    while path is None:
+        path = planner.plan(max_expansions=10)
+    assert route_cost(cost_map, path) == route_cost(cost_map, astar(cost_map, start, goal))
+
+def test_coarse_refresh_matches_rebuild():
+    cost_map = build_cost_map(wall(0, -300, 100))
+    coarse = CoarseCostMap(cost_map, 3)
+    grid = cost_map.grid
+    changed = grid.update_points(wall(-150, -50, 250))
+    cost_map.clearance_map.update(changed)
+    coarse.refresh(cost_map.refresh(changed))
+    np.testing.assert_array_equal(coarse.costs, CoarseCostMap(cost_map, 3).costs)
+    np.testing.assert_allclose(coarse.cell_to_world(coarse.world_to_cell([[-105, 45]])), [[-105, 45]])
+
+def test_simplify_path_keeps_turns():
+    cells = [(0, 0), (1, 0), (2, 0), (3, 1), (4, 2), (4, 3)]
+    assert simplify_path(cells) == [(0, 0), (2, 0), (4, 2), (4, 3)]
@@ -0,0 +1,29 @@
+import numpy as np
+from path_smoothing import catmull_rom, smooth_path
+
+def test_spline_passes_through_every_waypoint():
+    points = np.array([[0, 0], [100, 0], [150, 80], [300, 60]], dtype=float)
+    curve = catmull_rom(points, samples_per_segment=8)
+    np.testing.assert_allclose(curve[::8], points, atol=1e-9)
+
+def test_straight_path_keeps_one_waypoint_per_spacing():
+    waypoints, curvature = smooth_path([[0, 0], [1000, 0]], max_spacing=200)
+    np.testing.assert_allclose(waypoints[:, 1], 0, atol=1e-9)
+    assert len(waypoints) == 5
+    np.testing.assert_allclose(waypoints[-1], [1000, 0])
+    np.testing.assert_allclose(curvature, 0, atol=1e-9)
+
+def test_heading_changes_between_waypoints_stay_within_budget():
+    zigzag = [[0, 0], [200, 200], [400, 0], [600, 200], [800, 0]]
+    waypoints, curvature = smooth_path(zigzag, max_heading_change=45)
+    points = np.vstack([[0, 0], waypoints])
+    headings = np.degrees(np.arctan2(*np.diff(points, axis=0).T[::-1]))
+    turns = np.abs((np.diff(headings) + 180) % 360 - 180)
+    # A turn budget of 45 degrees, with slack for the chord approximation
+    assert turns.max() <= 45 * 1.5
+    assert len(curvature) == len(waypoints) and curvature.max() > 0
+
+def test_repeated_points_are_dropped():
+    waypoints, _ = smooth_path([[0, 0], [0, 0], [100, 0], [100, 0]])
+    np.testing.assert_allclose(waypoints[-1], [100, 0])
+    assert not np.any(np.isnan(waypoints))
@@ -0,0 +1,45 @@
+from navigation_system import NavigationSystem
+from plan_cache import PlanCache
+
+def test_get_counts_hits_and_misses():
+    cache = PlanCache()
+    assert cache.get("a") is None
+    cache.put("a", [(0, 0), (100, 0)], [[0, 0], [100, 0]])
+    assert cache.get("a") == [(0, 0), (100, 0)]
+    assert cache.get_stats()["hits"] == 1 and cache.get_stats()["misses"] == 1
+    assert cache.hit_rate == 0.5
+
+def test_least_recently_used_plan_is_evicted():
+    cache = PlanCache(capacity=2)
+    cache.put("a", [], [[0, 0]])
+    cache.put("b", [], [[0, 0]])
+    cache.get("a")
+    cache.put("c", [], [[0, 0]])
+    assert cache.get("b") is None
+    assert cache.get("a") == [] and cache.get("c") == []
+    assert cache.evictions == 1
+    assert "b" not in cache.bucket_entries[(0, 0)]
+
+def test_invalidation_drops_only_plans_passing_nearby():
+    cache = PlanCache(bucket_size=100)
+    # A long straight plan touches every bucket along it, not just its end points
+    cache.put("long", [(2000, 0)], [[0, 0], [2000, 0]])
+    cache.put("far", [(0, 2000)], [[0, 1900], [0, 2000]])
+    assert cache.invalidate_near([[1000, 50]]) == 1
+    assert cache.get("long") is None
+    assert cache.get("far") == [(0, 2000)]
+    assert cache.invalidate_near([[5000, 5000]]) == 0
+
+def test_cached_plan_matches_fresh_plan_and_is_invalidated_by_obstacles():
+    navigation = NavigationSystem()
+    target = [400, 300]
+    path = navigation.get_navigation_commands(target, 80)["path"]
+    assert navigation.get_navigation_commands(target, 80)["path"] == path
+    assert navigation.plan_cache.hits == 1
+
+    fresh = NavigationSystem()
+    fresh.current_pattern_angle = navigation.current_pattern_angle
+    assert fresh.get_navigation_commands(target, 80)["path"] == path
+
+    navigation.mark_obstacles([[200, 150]])
+    assert len(navigation.plan_cache) == 0
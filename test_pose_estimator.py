@@ -0,0 +1,47 @@
+import numpy as np
+from pose_estimator import PoseEstimator
+import app as app_module
+
+def test_first_fix_sets_position_and_commands_set_velocity():
+    estimator = PoseEstimator()
+    estimator.update_position((3.0, 4.0), 0.0)
+    pose = estimator.get_pose()
+    assert (pose["x"], pose["y"]) == (3.0, 4.0)
+    for step in range(1, 50):
+        estimator.update_command("right", 0.5, step * 0.1)
+        estimator.update_position((3.0 + 0.05 * step, 4.0), step * 0.1)
+    pose = estimator.get_pose()
+    assert np.isclose(pose["vx"], 0.5, atol=0.05) and np.isclose(pose["vy"], 0.0, atol=0.05)
+    assert np.isclose(pose["x"], 3.0 + 0.05 * 49, atol=0.1)
+
+def test_get_pose_extrapolates_without_touching_the_filter():
+    estimator = PoseEstimator()
+    estimator.update_position((0.0, 0.0), 0.0)
+    estimator.state[2:] = (1.0, -2.0)
+    state = estimator.state.copy()
+    pose = estimator.get_pose(2.0)
+    assert (pose["x"], pose["y"], pose["timestamp"]) == (2.0, -4.0, 2.0)
+    np.testing.assert_array_equal(estimator.state, state)
+    assert estimator.timestamp == 0.0
+
+def test_stale_timestamps_do_not_move_the_pose_back():
+    estimator = PoseEstimator()
+    estimator.update_position((0.0, 0.0), 5.0)
+    estimator.predict(4.0)
+    assert estimator.timestamp == 5.0
+
+def test_start_simulation_resets_the_app_pose(monkeypatch):
+    class IdleSimulation:
+        status = "idle"
+    monkeypatch.setattr(app_module, "RoverSimulation", IdleSimulation)
+    monkeypatch.setattr(app_module, "simulation_loop", lambda: None)
+    monkeypatch.setattr(app_module, "simulation_running", False)
+    monkeypatch.setattr(app_module, "start_search_sweeps", lambda: None)
+    monkeypatch.setattr(app_module, "pose_estimator", PoseEstimator())
+    old = app_module.pose_estimator
+    old.update_position((10.0, 10.0), 1.0)
+    response = app_module.app.test_client().post("/api/start-simulation")
+    assert response.get_json()["status"] == "success"
+    assert app_module.pose_estimator is not old
+    assert not app_module.pose_estimator.initialized
+    assert "estimated_pose" not in app_module.app.test_client().get("/api/rover-data").get_json()
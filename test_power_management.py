@@ -0,0 +1,64 @@
+import random
+import numpy as np
+from power_management import HISTORY_FIELDS, PowerHistory, PowerManagementSystem, PowerMetrics, PowerState
+
+def metrics(timestamp, battery_level=90.0, temperature=30.0, power_consumption=20.0, voltage=12.0):
+    return PowerMetrics(battery_level=battery_level, power_consumption=power_consumption,
+                        temperature=temperature, voltage=voltage, current=1.0, timestamp=timestamp)
+
+def test_history_matches_naive_window_and_ewma_with_late_samples():
+    rng = random.Random(0)
+    history = PowerHistory(capacity=8, max_age=30.0, ewma_half_life=5.0)
+    samples = []
+    timestamp = 0.0
+    for step in range(500):
+        timestamp += rng.uniform(0, 0.5)
+        # Every tenth sample arrives a little late
+        sample = metrics(timestamp - (2.0 if step % 10 == 5 else 0.0), power_consumption=rng.uniform(10, 50),
+                         temperature=rng.uniform(20, 40), voltage=rng.uniform(11, 13))
+        history.add(sample)
+        samples.append(sample)
+    newest = max(sample.timestamp for sample in samples)
+    window = [sample for sample in samples if sample.timestamp >= newest - 30.0]
+    weights = [0.5 ** ((newest - sample.timestamp) / 5.0) for sample in samples]
+    stats = history.get_stats()
+    assert stats["count"] == len(window)
+    for field in HISTORY_FIELDS:
+        assert np.isclose(stats[field]["mean"], np.mean([getattr(sample, field) for sample in window]))
+        expected = sum(weight * getattr(sample, field) for weight, sample in zip(weights, samples)) / sum(weights)
+        assert np.isclose(stats[field]["ewma"], expected)
+
+def test_history_grows_past_its_capacity_to_cover_max_age():
+    history = PowerHistory(capacity=16, max_age=3600.0)
+    # 10 Hz for a minute, far more samples than the starting capacity
+    for step in range(600):
+        history.add(metrics(step * 0.1))
+    assert len(history) == 600
+    history.add(metrics(3600.05))
+    assert len(history) == 1 + sum(step * 0.1 >= 0.05 for step in range(600))
+
+def test_history_evicts_the_oldest_sample_at_max_capacity():
+    rng = random.Random(1)
+    history = PowerHistory(capacity=4, max_age=3600.0, max_capacity=64)
+    # A burst of samples on one timestamp, then late ones, never grows past max_capacity
+    samples = []
+    for step in range(1000):
+        timestamp = 10.0 if step < 500 else 10.0 + step * 0.01 - (1.0 if step % 7 == 0 else 0.0)
+        sample = metrics(timestamp, power_consumption=rng.uniform(10, 50))
+        history.add(sample)
+        samples.append(sample)
+    assert len(history) == 64 and len(history.timestamps) == 64
+    # The newest 64 in timestamp order, late arrivals before the evicted ones fall out
+    kept = sorted(samples, key=lambda sample: sample.timestamp)[-64:]
+    assert np.isclose(history.get_stats()["power_consumption"]["mean"],
+                      np.mean([sample.power_consumption for sample in kept]))
+
+def test_late_sample_does_not_set_the_power_state():
+    power = PowerManagementSystem()
+    power.update_power_metrics(metrics(10.0, battery_level=50.0))
+    power.update_power_metrics(metrics(5.0, battery_level=3.0))
+    assert power.current_state == PowerState.NORMAL
+    assert power.power_history.latest.battery_level == 50.0
+    assert not power.should_return_to_charge()
+    power.update_power_metrics(metrics(11.0, battery_level=3.0))
+    assert power.current_state == PowerState.CRITICAL
@@ -0,0 +1,225 @@
+import random
+import time
+import numpy as np
+from rover_controller import RoverController, RoverState, RoverStatus
+from sensor_fusion import ReadingWindow, SensorFusionSystem, SensorReading, SensorType
+
+def naive_stats(readings, cutoff):
+    values = [value for timestamp, value in readings if timestamp >= cutoff]
+    if not values:
+        return {"count": 0, "mean": None, "max": None}
+    return {"count": len(values), "mean": sum(values) / len(values), "max": max(values)}
+
+def test_reading_window_matches_naive_recompute():
+    rng = random.Random(0)
+    window = ReadingWindow(capacity=4)
+    readings = []
+    timestamp = 0.0
+    for step in range(2000):
+        timestamp += rng.uniform(0, 0.2)
+        value = rng.uniform(0, 10)
+        if step % 7 == 3 and readings:
+            # A late reading lands somewhere inside the window
+            late = timestamp - rng.uniform(0, 2)
+            window.insert(late, value)
+            readings.append((late, value))
+        elif step % 50 == 0:
+            batch = np.sort(timestamp + rng.uniform(0, 0.1) * np.arange(1, 6))
+            batch_values = np.array([rng.uniform(0, 10) for _ in batch])
+            window.extend(batch, batch_values)
+            readings.extend(zip(batch.tolist(), batch_values.tolist()))
+            timestamp = float(batch[-1])
+        else:
+            window.append(timestamp, value)
+            readings.append((timestamp, value))
+        cutoff = timestamp - 5.0
+        window.expire(cutoff)
+        readings = [reading for reading in readings if reading[0] >= cutoff]
+        stats = window.get_stats()
+        expected = naive_stats(readings, cutoff)
+        assert stats["count"] == expected["count"]
+        if expected["count"]:
+            assert np.isclose(stats["mean"], expected["mean"])
+            assert stats["max"] == expected["max"]
+
+def test_reading_window_resets_once_empty():
+    window = ReadingWindow()
+    window.append(1.0, 3.0)
+    window.append(2.0, 5.0)
+    window.expire(10.0)
+    assert window.get_stats() == {"count": 0, "mean": None, "max": None}
+    window.append(11.0, 1.0)
+    assert window.get_stats() == {"count": 1, "mean": 1.0, "max": 1.0}
+
+def test_reading_window_max_follows_late_readings_through_expiry():
+    window = ReadingWindow()
+    window.extend(np.array([1.0, 2.0, 3.0, 4.0]), np.array([5.0, 4.0, 3.0, 2.0]))
+    window.insert(2.5, 4.5)
+    assert window.get_stats()["max"] == 5.0
+    window.expire(1.5)
+    assert window.get_stats()["max"] == 4.5
+    window.expire(2.6)
+    assert window.get_stats()["max"] == 3.0
+    window.insert(2.8, 3.0)
+    window.expire(3.0)
+    assert window.get_stats() == {"count": 2, "mean": 2.5, "max": 3.0}
+    assert len(window.max_candidates) == 2
+
+def survivor_readings(count, seed):
+    rng = random.Random(seed)
+    readings = []
+    for step in range(count):
+        sensor_type = rng.choice([SensorType.IR, SensorType.RFID, SensorType.ACCELEROMETER])
+        value = {SensorType.IR: 0.9, SensorType.RFID: 0.8, SensorType.ACCELEROMETER: 3.0}[sensor_type]
+        readings.append(SensorReading(sensor_type, value, step * 0.1, (100.0, 100.0), rng.uniform(0.3, 1.0)))
+    return readings
+
+def test_confidence_matches_weighted_mean_of_all_readings():
+    fusion = SensorFusionSystem()
+    readings = survivor_readings(500, seed=0)
+    for reading in readings:
+        fusion.add_sensor_reading(reading)
+    weights = [fusion.sensor_weights[reading.type] for reading in readings]
+    expected = sum(weight * reading.confidence for weight, reading in zip(weights, readings)) / sum(weights)
+    [detection] = fusion.survivor_detections
+    assert np.isclose(detection['confidence'], expected)
+
+def test_confidence_half_life_decays_old_evidence():
+    fusion = SensorFusionSystem()
+    fusion.confidence_half_life = 2.0
+    readings = survivor_readings(200, seed=1)
+    for reading in readings:
+        fusion.add_sensor_reading(reading)
+    latest = readings[-1].timestamp
+    weights = [fusion.sensor_weights[reading.type] * 0.5 ** ((latest - reading.timestamp) / 2.0)
+               for reading in readings]
+    expected = sum(weight * reading.confidence for weight, reading in zip(weights, readings)) / sum(weights)
+    [detection] = fusion.survivor_detections
+    assert np.isclose(detection['confidence'], expected)
+    assert len(detection['sensor_readings']) == fusion.max_detection_readings
+
+def test_spatial_index_association_matches_linear_scan():
+    rng = random.Random(2)
+    fusion = SensorFusionSystem()
+    for _ in range(400):
+        position = (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000))
+        fusion.add_sensor_reading(SensorReading(SensorType.RFID, 0.9, 0.0, position, rng.random()))
+    for _ in range(2000):
+        position = (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000))
+        # The original loop over every detection, oldest first
+        expected = next((detection['id'] for detection in fusion.survivor_detections
+                         if fusion._is_nearby(position, detection['position'])), None)
+        nearby = fusion.detection_index.query_radius(position, fusion.association_radius)
+        assert (min(nearby) if nearby else None) == expected
+
+def mission_log(count, seed):
+    rng = np.random.default_rng(seed)
+    type_codes = rng.integers(0, len(SensorType), count)
+    timestamps = np.arange(count) / 100.0
+    values = np.where(type_codes == 0, rng.uniform(150, 400, count), rng.uniform(0, 1, count))
+    values = np.where(type_codes == 3, rng.uniform(0, 3, count), values)
+    xs = rng.uniform(-1000, 1000, count)
+    ys = rng.uniform(-1000, 1000, count)
+    return type_codes, values, timestamps, xs, ys, rng.random(count)
+
+def ingest_one_at_a_time(log, allowed_lateness=0.0):
+    fusion = SensorFusionSystem()
+    fusion.allowed_lateness = allowed_lateness
+    sensor_types = list(SensorType)
+    for type_code, value, timestamp, x, y, confidence in zip(*log):
+        fusion.add_sensor_reading(SensorReading(sensor_types[type_code], float(value), float(timestamp),
+                                                (float(x), float(y)), float(confidence)))
+    fusion.flush()
+    return fusion
+
+def detection_summary(fusion):
+    return [(d['id'], d['position'], d['confidence'], d['last_update'], len(d['sensor_readings']))
+            for d in fusion.survivor_detections]
+
+def test_batch_ingestion_matches_one_reading_at_a_time():
+    log = mission_log(3000, seed=3)
+    single = ingest_one_at_a_time(log)
+    batched = SensorFusionSystem()
+    hits = sum(batched.add_sensor_readings_batch(*(column[offset:offset + 700] for column in log))
+               for offset in range(0, 3000, 700))
+    assert hits == int(single._detection_mask(log[0], log[1]).sum()) > 0
+    summary = detection_summary(batched)
+    expected = detection_summary(single)
+    assert [entry[:2] for entry in summary] == [entry[:2] for entry in expected]
+    np.testing.assert_allclose([entry[2:] for entry in summary], [entry[2:] for entry in expected])
+    for sensor_type in SensorType:
+        stats = batched.get_window_stats(sensor_type)
+        expected_stats = single.get_window_stats(sensor_type)
+        assert stats["count"] == expected_stats["count"] and stats["max"] == expected_stats["max"]
+        assert np.isclose(stats["mean"], expected_stats["mean"])
+    np.testing.assert_allclose(batched.heatmap.log_odds, single.heatmap.log_odds)
+
+def test_priority_survivors_match_full_sort():
+    fusion = ingest_one_at_a_time(mission_log(3000, seed=4))
+    current_time = fusion.current_time
+    for max_count in (1, 5, 50):
+        expected = sorted(fusion.survivor_detections,
+                          key=lambda x: (x['confidence'], current_time - x['last_update']), reverse=True)[:max_count]
+        assert [d['id'] for d in fusion.get_priority_survivors(max_count, include_heatmap=False)] == [d['id'] for d in expected]
+
+def test_heatmap_only_survivor_gets_priority_and_draws_the_rover():
+    fusion = SensorFusionSystem()
+    # Weak IR readings, none past the threshold, all around one spot
+    for step in range(10):
+        fusion.add_sensor_reading(SensorReading(SensorType.IR, 0.6, step * 0.1, (300.0, 200.0), 1.0))
+    assert fusion.survivor_detections == []
+    [survivor] = fusion.get_priority_survivors()
+    assert survivor['source'] == 'heatmap'
+    assert fusion.get_priority_survivors(include_heatmap=False) == []
+
+    controller = RoverController(sensor_fusion=fusion)
+    controller.current_state = RoverState.SEARCHING
+    controller.update_status(RoverStatus(position=[0, 0], battery_level=90, temperature=30.0, voltage=12.0,
+                                         current=1.0, state=RoverState.SEARCHING, survivors_found=0,
+                                         timestamp=time.time()))
+    assert controller.current_state == RoverState.MOVING_TO_SURVIVOR
+
+def test_recluster_keeps_a_line_of_survivors_apart():
+    fusion = SensorFusionSystem()
+    # Survivors a merge radius apart along a corridor, each far enough to get its own detection
+    for index in range(10):
+        fusion._update_survivor_detection(SensorReading(SensorType.RFID, 0.9, 0.0, (index * 100.0, 0.0), 0.8))
+    while fusion.recluster():
+        fusion.touched_detections = set(fusion.detections_by_id)
+    assert len(fusion.survivor_detections) >= 4
+    xs = sorted(detection['position'][0] for detection in fusion.survivor_detections)
+    assert xs[0] < 150 and xs[-1] > 750
+
+    # Fragments of one survivor still merge
+    fragments = SensorFusionSystem()
+    for x, y in ((0.0, 0.0), (60.0, 0.0), (30.0, 55.0)):
+        fragments._update_survivor_detection(SensorReading(SensorType.IR, 0.9, 0.0, (x, y), 0.7))
+    assert fragments.recluster() == 2
+    [detection] = fragments.survivor_detections
+    np.testing.assert_allclose(detection['position'], (30.0, 55.0 / 3))
+
+def test_jittered_arrival_behind_watermark_matches_sorted_ingestion():
+    log = mission_log(3000, seed=5)
+    expected = ingest_one_at_a_time(log)
+    # Fetchers deliver up to 0.2 s late
+    rng = np.random.default_rng(6)
+    arrival = np.argsort(log[2] + rng.uniform(0, 0.2, len(log[2])), kind="stable")
+    jittered = ingest_one_at_a_time([column[arrival] for column in log], allowed_lateness=0.2)
+    assert jittered.late_readings == 0
+    assert detection_summary(jittered) == detection_summary(expected)
+    assert jittered.get_window_stats() == expected.get_window_stats()
+    np.testing.assert_array_equal(jittered.heatmap.log_odds, expected.heatmap.log_odds)
+
+    shuffled = SensorFusionSystem()
+    order = rng.permutation(len(log[0]))
+    shuffled.add_sensor_readings_batch(*(column[order] for column in log))
+    assert [entry[:2] for entry in detection_summary(shuffled)] == [entry[:2] for entry in detection_summary(expected)]
+
+def test_late_reading_never_moves_the_clock_back():
+    fusion = SensorFusionSystem()
+    fusion.add_sensor_reading(SensorReading(SensorType.IR, 0.5, 10.0, (0.0, 0.0), 0.5))
+    fusion.add_sensor_reading(SensorReading(SensorType.IR, 0.5, 8.0, (0.0, 0.0), 0.5))
+    fusion.add_sensor_reading(SensorReading(SensorType.IR, 0.5, 1.0, (0.0, 0.0), 0.5))
+    assert fusion.current_time == 10.0
+    assert (fusion.late_readings, fusion.dropped_readings) == (2, 1)
+    assert fusion.get_window_stats(SensorType.IR)["count"] == 2
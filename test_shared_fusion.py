@@ -0,0 +1,66 @@
+import socket
+from multiprocessing import AuthenticationError
+import numpy as np
+import pytest
+from sensor_fusion import SENSOR_TYPE_CODES, SensorFusionSystem, SensorReading, SensorType
+from shared_fusion import FusionSession, SharedFusionStore, connect_fusion_store, serve_fusion_store
+
+def hit(timestamp, position):
+    return SensorReading(SensorType.RFID, 0.9, timestamp, position, 0.8)
+
+def free_address():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()
+
+def test_store_waits_for_the_slowest_rover():
+    store = SharedFusionStore()
+    first = FusionSession(store, "first", batch_size=1)
+    second = FusionSession(store, "second", batch_size=1)
+    first.add_sensor_reading(hit(1.0, (0.0, 0.0)))
+    assert store.get_rover_stats()["pending"] == 1
+    second.add_sensor_reading(hit(1.5, (20.0, 0.0)))
+    [detection] = store.get_survivor_detections(include_heatmap=False)
+    assert detection['rovers'] == {"first": 1}
+    second.close()
+    first.close()
+    [detection] = store.get_survivor_detections(include_heatmap=False)
+    assert detection['rovers'] == {"first": 1, "second": 1}
+    assert "sensor_readings" not in detection
+
+def test_store_matches_merged_batch():
+    # Sessions send 64 readings at a time, far enough apart that the skew limit would kick in
+    store = SharedFusionStore(max_skew=np.inf)
+    sessions = [FusionSession(store, f"rover-{rover}") for rover in range(3)]
+    readings = []
+    for step in range(200):
+        for rover, session in enumerate(sessions):
+            reading = hit(step * 0.05, (rover * 300.0 + step % 7 * 10.0, step * 5.0))
+            session.add_sensor_reading(reading)
+            readings.append(SensorReading(reading.type, reading.value, reading.timestamp, reading.position,
+                                          reading.confidence, session.rover_id))
+    for session in sessions:
+        session.close()
+    merged = SensorFusionSystem()
+    merged.add_sensor_readings_batch(
+        [SENSOR_TYPE_CODES[reading.type] for reading in readings], [reading.value for reading in readings],
+        [reading.timestamp for reading in readings], [reading.position[0] for reading in readings],
+        [reading.position[1] for reading in readings], [reading.confidence for reading in readings],
+        rover_ids=[reading.rover_id for reading in readings])
+    shared = store.get_survivor_detections(min_confidence=0.0, include_heatmap=False)
+    expected = merged.get_survivor_detections(min_confidence=0.0, include_heatmap=False)
+    assert [(d['id'], d['position'], d['rovers']) for d in shared] == \
+           [(d['id'], d['position'], d['rovers']) for d in expected]
+
+def test_served_store_needs_the_generated_key():
+    store = SharedFusionStore()
+    address = free_address()
+    _, authkey = serve_fusion_store(store, address)
+    assert len(authkey) == 32
+    with pytest.raises(AuthenticationError):
+        connect_fusion_store(b"roverx", address)
+    proxy = connect_fusion_store(authkey, address)
+    proxy.add_sensor_readings("remote", [hit(1.0, (0.0, 0.0))])
+    proxy.unregister_rover("remote")
+    [detection] = store.get_survivor_detections(include_heatmap=False)
+    assert detection['rovers'] == {"remote": 1}
@@ -0,0 +1,69 @@
+import math
+import numpy as np
+from survivor_heatmap import SurvivorHeatmap
+
+def sigmoid(value):
+    return 1.0 - 1.0 / (1.0 + math.exp(value))
+
+def test_add_evidence_matches_dense_update_and_clamps_touched_cells():
+    rng = np.random.default_rng(0)
+    heatmap = SurvivorHeatmap(width=1000, height=1000, resolution=25)
+    expected = np.zeros(heatmap.shape)
+    for _ in range(20):
+        xs = rng.uniform(-600, 600, 300)
+        ys = rng.uniform(-600, 600, 300)
+        log_odds = rng.uniform(-1.0, 2.0, 300)
+        heatmap.add_evidence(xs, ys, log_odds)
+        # Reference: sum every reading into the whole grid, then clamp it
+        cells = heatmap.world_to_cell(np.column_stack([xs, ys]))
+        inside = np.all((cells >= 0) & (cells < heatmap.shape), axis=1)
+        totals = np.zeros(heatmap.shape)
+        np.add.at(totals, (cells[inside, 0], cells[inside, 1]), log_odds[inside])
+        expected = np.clip(expected + totals, heatmap.min_log_odds, heatmap.max_log_odds)
+    np.testing.assert_allclose(heatmap.log_odds, expected)
+
+def test_peak_probability_is_the_strongest_cell_not_the_neighbourhood_sum():
+    heatmap = SurvivorHeatmap(width=1000, height=1000, resolution=25)
+    # One survivor's readings straddle a cell border
+    heatmap.add_evidence(np.array([-5.0, 5.0, -5.0, 5.0]), np.array([10.0, 10.0, 10.0, 10.0]),
+                         np.array([0.8, 0.6, 0.8, 0.6]))
+    [peak] = heatmap.peaks(min_log_odds=2.0)
+    assert np.isclose(peak["log_odds"], 2.8)
+    assert np.isclose(peak["probability"], sigmoid(1.6))
+    assert -5.0 < peak["position"][0] < 5.0
+    assert heatmap.peaks(min_log_odds=3.0) == []
+
+def full_scan_peaks(heatmap, min_log_odds):
+    """Reference: sum and compare every cell of the grid"""
+    width, height = heatmap.shape
+    padded = np.pad(heatmap.log_odds, 1)
+    summed = sum(padded[1 + dx:width + 1 + dx, 1 + dy:height + 1 + dy]
+                 for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+    padded_summed = np.pad(summed, 1, constant_values=-np.inf)
+    peaks = []
+    for cx, cy in np.argwhere(summed > 0.0).tolist():
+        neighbours = padded_summed[cx:cx + 3, cy:cy + 3].reshape(-1)
+        if all(summed[cx, cy] > value for value in neighbours[:4]) and \
+                all(summed[cx, cy] >= value for value in neighbours[5:]) and summed[cx, cy] >= min_log_odds:
+            peaks.append((-summed[cx, cy], (cx, cy), padded[cx:cx + 3, cy:cy + 3].max()))
+    return sorted(peaks)
+
+def test_incremental_peaks_match_a_full_scan():
+    rng = np.random.default_rng(1)
+    heatmap = SurvivorHeatmap(width=500, height=500, resolution=25)
+    for step in range(300):
+        if step % 10 == 0:
+            # Whole-step evidence makes plateaus, and some batches touch most of the grid
+            count = 400 if step % 50 == 0 else 5
+            xs, ys = rng.uniform(-300, 300, count), rng.uniform(-300, 300, count)
+            heatmap.add_evidence(xs, ys, rng.integers(-2, 4, count) * 0.5)
+        else:
+            heatmap.add_point(rng.uniform(-300, 300), rng.uniform(-300, 300), rng.integers(-2, 4) * 0.5)
+        if step % 3:
+            continue
+        for min_log_odds in (0.5, heatmap.peak_log_odds, 3.0):
+            found = [(-peak["log_odds"], peak["cell"], peak["probability"]) for peak in heatmap.peaks(min_log_odds)]
+            expected = full_scan_peaks(heatmap, min_log_odds)
+            assert [cell for _, cell, _ in found] == [cell for _, cell, _ in expected]
+            assert [value for value, _, _ in found] == [value for value, _, _ in expected]
+            assert np.allclose([p for _, _, p in found], [sigmoid(value) for _, _, value in expected])
@@ -0,0 +1,64 @@
+import itertools
+import math
+import random
+from tour_planner import TourPlanner
+
+def brute_force_length(targets, start, end):
+    best = math.inf
+    for order in itertools.permutations(targets.values()):
+        points = [start] + list(order) + [end]
+        best = min(best, sum(math.dist(a, b) for a, b in zip(points, points[1:])))
+    return best
+
+def test_tour_visits_every_target_and_is_near_optimal():
+    rng = random.Random(0)
+    targets = {i: [rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)] for i in range(7)}
+    station = [0.0, 0.0]
+    planner = TourPlanner()
+    planner.sync(targets, station, station)
+    assert sorted(planner.order) == sorted(targets)
+    assert planner.length(station, station) <= 1.05 * brute_force_length(targets, station, station)
+
+def test_improvement_never_lengthens_nearest_neighbor_tour():
+    rng = random.Random(1)
+    targets = {i: [rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)] for i in range(60)}
+    greedy = TourPlanner(max_passes=0)
+    greedy.sync(targets, [0, 0], [0, 0])
+    planner = TourPlanner()
+    planner.sync(targets, [0, 0], [0, 0])
+    assert planner.length([0, 0], [0, 0]) <= greedy.length([0, 0], [0, 0])
+
+def test_sync_inserts_new_targets_and_drops_closed_ones():
+    planner = TourPlanner()
+    planner.sync({"a": [100, 0], "b": [200, 0]}, [0, 0])
+    planner.sync({"a": [100, 0], "b": [200, 0], "c": [150, 0]}, [0, 0])
+    assert planner.order == ["a", "c", "b"]
+    assert planner.insertions == 1
+    planner.sync({"a": [100, 0], "c": [150, 0]}, [0, 0])
+    assert planner.order == ["a", "c"]
+
+def test_stops_recharge_before_out_of_range_survivors():
+    planner = TourPlanner()
+    station = [0, 0]
+    planner.sync({"near": [100, 0], "far": [900, 0], "too_far": [5000, 0]}, station, station)
+    stops = planner.get_stops(station, range_budget=500, full_range=2000, charging_station=station)
+    assert [stop.get("id", stop["type"]) for stop in stops] == [
+        "near", "charging_station", "far", "charging_station"
+    ]
+    assert planner.unreachable == ["too_far"]
+
+def test_unchanged_targets_skip_the_local_search():
+    rng = random.Random(2)
+    targets = {i: [rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)] for i in range(50)}
+    planner = TourPlanner()
+    planner.sync(targets, [0, 0], [0, 0])
+    order = list(planner.order)
+    # The rover creeping forward and detections jittering in place change nothing
+    planner.sync({key: [x + 5, y] for key, (x, y) in targets.items()}, [50, 0], [0, 0])
+    assert planner.improvements == 1 and planner.order == order
+
+    planner.sync(targets, [500, 0], [0, 0])
+    assert planner.improvements == 2
+    del targets[order[0]]
+    planner.sync(targets, [500, 0], [0, 0])
+    assert planner.improvements == 3 and order[0] not in planner.order
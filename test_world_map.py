@@ -0,0 +1,49 @@
+import random
+from world_map import WorldMap
+
+def test_obstacles_and_visits_come_back_from_bbox_query():
+    world = WorldMap(resolution=10)
+    world.add_obstacle([15, 25])
+    world.add_path_point([0, 0])
+    world.add_path_point([0, 0])
+    assert world.query_bbox(-50, -50, 50, 50) == {"obstacles": [[10, 20, 10]], "path": [[0, 0, 10, 2]]}
+    assert world.is_occupied([15, 25]) and not world.is_occupied([35, 25])
+
+def test_removing_obstacle_from_coarse_cell_keeps_its_neighbors():
+    world = WorldMap(resolution=10, fine_radius=100)
+    world.add_obstacle([5, 5])
+    world.add_obstacle([15, 5])
+    world.set_focus([100000, 0], 0.0)  # Far away, the chunk gets coarsened
+    assert world.chunks[(0, 0)].obstacles.keys() - {0}
+    assert world.is_occupied([5, 5])
+
+    world.remove_obstacle([5, 5])
+    assert world.is_occupied([15, 5])
+    world.remove_obstacle([15, 5])
+    assert not world.is_occupied([15, 5])
+    assert world.cell_count == 0
+
+def test_removing_fine_obstacle_keeps_coarse_cell_holding_others():
+    world = WorldMap(resolution=10, fine_radius=100)
+    world.add_obstacle([5, 5])
+    world.set_focus([100000, 0], 0.0)
+    world.add_obstacle([15, 5])  # Fine again, in the same coarse cell
+    world.remove_obstacle([15, 5])
+    assert world.is_occupied([5, 5])
+
+def test_cell_cap_holds_over_a_long_mission():
+    world = WorldMap(resolution=10, max_cells=2000)
+    rng = random.Random(0)
+    x = y = 0.0
+    for step in range(20000):
+        x += rng.uniform(-5, 15)
+        y += rng.uniform(-10, 10)
+        world.set_focus([x, y], float(step))
+        world.add_path_point([x, y])
+        if step % 3 == 0:
+            world.add_obstacle([x + rng.uniform(-200, 200), y + rng.uniform(-200, 200)])
+        assert world.cell_count + len(world.chunks) <= world.max_cells
+    stored = sum(len(cells) for chunk in world.chunks.values()
+                 for cells in list(chunk.obstacles.values()) + list(chunk.visits.values()))
+    assert stored == world.cell_count
+    assert world.query_bbox(x - 50, y - 50, x + 50, y + 50)["path"]
@@ -0,0 +1,215 @@
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+Point = Tuple[float, float]
+
+class TourPlanner:
+    def __init__(self, max_passes: int = 20, move_tolerance: float = 25.0):
+        self.max_passes = max_passes          # Local search passes per update
+        self.move_tolerance = move_tolerance  # cm, targets moving further are reinserted
+        self.anchor_tolerance = 200.0         # cm, start or end moving further re-optimizes the tour
+        self.targets: Dict[Hashable, Point] = {}
+        self.order: List[Hashable] = []       # Visit order, without charging stops
+        self.unreachable: List[Hashable] = []
+        self.rebuilds = 0
+        self.insertions = 0
+        self.improvements = 0
+        # Start and end the tour was last optimized for
+        self.anchors: Optional[Tuple[Point, Optional[Point]]] = None
+
+    def sync(self, targets: Dict[Hashable, List[float]], start: List[float],
+             end: Optional[List[float]] = None):
+        """Bring the tour up to date with the open targets, inserting new ones incrementally"""
+        # Drop closed targets and pull out the ones that moved
+        previous = self.order
+        kept = []
+        for key in previous:
+            position = targets.get(key)
+            if position is None:
+                continue
+            old = self.targets[key]
+            if math.hypot(position[0] - old[0], position[1] - old[1]) <= self.move_tolerance:
+                kept.append(key)
+        self.targets = {key: (float(p[0]), float(p[1])) for key, p in targets.items()}
+        self.order = kept
+
+        kept_keys = set(kept)
+        added = [key for key in self.targets if key not in kept_keys]
+        dropped = len(kept) < len(previous)
+        if not added and not kept:
+            return
+        if not added and not dropped and not self._anchors_moved(start, end):
+            # Nothing changed that the last optimization did not already cover
+            return
+
+        if len(added) > len(kept):
+            # Mostly new targets, a fresh construction is cheaper than inserting one by one
+            self.order = self._nearest_neighbor(start, list(self.targets))
+            self.rebuilds += 1
+        else:
+            for key in added:
+                self._insert(key, start, end)
+            self.insertions += len(added)
+        self.improve(start, end)
+
+    def _anchors_moved(self, start: List[float], end: Optional[List[float]]) -> bool:
+        """Check whether the start or end moved past anchor_tolerance since the last optimization"""
+        if self.anchors is None:
+            return True
+        old_start, old_end = self.anchors
+        if (end is None) != (old_end is None):
+            return True
+        if math.hypot(start[0] - old_start[0], start[1] - old_start[1]) > self.anchor_tolerance:
+            return True
+        return end is not None and math.hypot(end[0] - old_end[0], end[1] - old_end[1]) > self.anchor_tolerance
+
+    def _route_points(self, start: List[float], end: Optional[List[float]]) -> np.ndarray:
+        """Positions of start, the ordered targets and the end, (n + 2, 2)"""
+        points = np.empty((len(self.order) + 2, 2))
+        points[0] = start[:2]
+        if self.order:
+            points[1:-1] = [self.targets[key] for key in self.order]
+        points[-1] = end[:2] if end is not None else points[-2]
+        return points
+
+    def _distances(self, points: np.ndarray, open_end: bool) -> np.ndarray:
+        """Pairwise distances, an open end costs nothing to reach"""
+        distances = np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+        if open_end:
+            distances[-1, :] = 0.0
+            distances[:, -1] = 0.0
+        return distances
+
+    def _nearest_neighbor(self, start: List[float], keys: List[Hashable]) -> List[Hashable]:
+        """Build a visit order by always going to the closest remaining target"""
+        points = np.array([self.targets[key] for key in keys], dtype=float).reshape(-1, 2)
+        remaining = np.ones(len(keys), dtype=bool)
+        current = np.asarray(start[:2], dtype=float)
+        order = []
+        for _ in range(len(keys)):
+            distances = np.hypot(*(points - current).T)
+            distances[~remaining] = np.inf
+            nearest = int(np.argmin(distances))
+            remaining[nearest] = False
+            order.append(keys[nearest])
+            current = points[nearest]
+        return order
+
+    def _insert(self, key: Hashable, start: List[float], end: Optional[List[float]]):
+        """Insert a target where it lengthens the tour the least"""
+        points = self._route_points(start, end)
+        position = np.asarray(self.targets[key])
+        before, after = points[:-1], points[1:]
+        added = np.hypot(*(before - position).T) + np.hypot(*(after - position).T) - np.hypot(*(after - before).T)
+        if end is None:
+            # Appending after the last target only adds the way there
+            added[-1] = np.hypot(*(before[-1] - position))
+        self.order.insert(int(np.argmin(added)), key)
+
+    def improve(self, start: List[float], end: Optional[List[float]] = None):
+        """Shorten the tour with 2-opt and Or-opt moves until neither helps"""
+        self.anchors = ((float(start[0]), float(start[1])),
+                        None if end is None else (float(end[0]), float(end[1])))
+        self.improvements += 1
+        if len(self.order) < 2:
+            return
+        keys = self.order
+        distances = self._distances(self._route_points(start, end), end is None)
+        route = np.arange(len(keys) + 2)
+
+        for _ in range(self.max_passes):
+            route, two_opt = self._two_opt_pass(route, distances)
+            route, or_opt = self._or_opt_pass(route, distances)
+            if not (two_opt or or_opt):
+                break
+        self.order = [keys[node - 1] for node in route[1:-1].tolist()]
+
+    def _two_opt_pass(self, route: np.ndarray, distances: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Reverse route sections wherever that shortens the tour"""
+        improved = False
+        last = len(route) - 1
+        for i in range(1, last - 1):
+            a, b = route[i - 1], route[i]
+            cs = route[i + 1:last]
+            ds = route[i + 2:last + 1]
+            delta = distances[a, cs] + distances[b, ds] - distances[a, b] - distances[cs, ds]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-6:
+                j = i + 1 + best
+                route[i:j + 1] = route[i:j + 1][::-1].copy()
+                improved = True
+        return route, improved
+
+    def _or_opt_pass(self, route: np.ndarray, distances: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Move runs of up to three targets to where they fit best, possibly reversed"""
+        improved = False
+        # Distances and edge lengths in route order, so lookups are plain slices
+        ordered = distances[np.ix_(route, route)]
+        edges = np.diagonal(ordered, 1).copy()
+        for length in (1, 2, 3):
+            i = 1
+            while i + length < len(route):
+                first, last = i, i + length - 1
+                gain = edges[i - 1] + edges[last] - ordered[i - 1, last + 1]
+
+                # Cost of inserting the run into each edge, edges touching it are excluded
+                forward = ordered[:-1, first] + ordered[last, 1:] - edges
+                backward = ordered[:-1, last] + ordered[first, 1:] - edges
+                costs = np.minimum(forward, backward)
+                costs[i - 1:i + length] = np.inf
+                best = int(np.argmin(costs))
+                if costs[best] < gain - 1e-6:
+                    run = route[first:last + 1]
+                    if forward[best] > backward[best]:
+                        run = run[::-1]
+                    rest = np.concatenate([route[:i], route[i + length:]])
+                    # Edge index best is in route order, shift it past the removed run
+                    at = best + 1 if best < i else best + 1 - length
+                    route = np.concatenate([rest[:at], run, rest[at:]])
+                    ordered = distances[np.ix_(route, route)]
+                    edges = np.diagonal(ordered, 1).copy()
+                    improved = True
+                i += 1
+        return route, improved
+
+    def length(self, start: List[float], end: Optional[List[float]] = None) -> float:
+        """Travel distance of the tour from start, through every target, to the end"""
+        points = self._route_points(start, end)
+        if end is None:
+            points = points[:-1]
+        return float(np.sum(np.hypot(*np.diff(points, axis=0).T)))
+
+    def get_stops(self, start: List[float], range_budget: float, full_range: float,
+                  charging_station: Optional[List[float]] = None) -> List[Dict]:
+        """Split the tour into legs the battery can drive, with charging stops in between"""
+        def distance(a, b):
+            return math.hypot(a[0] - b[0], a[1] - b[1])
+
+        stops = []
+        self.unreachable = []
+        current = (float(start[0]), float(start[1]))
+        remaining = range_budget
+        for key in self.order:
+            position = self.targets[key]
+            if charging_station is None:
+                # No way to recharge, visit what the battery reaches
+                if distance(current, position) > remaining:
+                    self.unreachable.append(key)
+                    continue
+            elif distance(current, position) + distance(position, charging_station) > remaining:
+                # Even a full charge cannot reach this target and get back
+                if 2 * distance(charging_station, position) > full_range:
+                    self.unreachable.append(key)
+                    continue
+                stops.append({"type": "charging_station", "position": list(charging_station)})
+                remaining = full_range
+                current = (float(charging_station[0]), float(charging_station[1]))
+
+            stops.append({"type": "survivor", "id": key, "position": list(position)})
+            remaining -= distance(current, position)
+            current = position
+
+        if stops and charging_station is not None:
+            stops.append({"type": "charging_station", "position": list(charging_station)})
+        return stops
@@ -0,0 +1,220 @@
+import math
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+class MapChunk:
+    def __init__(self, timestamp: float):
+        # Cells per level of detail, level k cells are 2^k base cells wide. Obstacle cells
+        # count the base obstacles merged into them, so removing one keeps the others
+        self.obstacles: Dict[int, Dict[Cell, int]] = {}
+        self.visits: Dict[int, Dict[Cell, int]] = {}
+        self.size = 0   # Stored cells, obstacles plus visits
+        self.last_access = timestamp
+
+class WorldMap:
+    def __init__(self, resolution: float = 10.0, chunk_size: float = 1280.0, max_level: int = 7,
+                 max_cells: int = 200000, fine_radius: float = 1500.0, stale_age: float = 600.0):
+        self.resolution = resolution    # cm, finest cell size
+        self.chunk_size = chunk_size    # cm, a power of two times the resolution
+        self.max_level = max_level      # Coarsest level, one cell per chunk at 2^max_level = chunk_size / resolution
+        self.max_cells = max_cells      # Hard cap on stored cells across all chunks, each chunk counts as one
+        self.fine_radius = fine_radius  # cm, chunks this close to the rover keep full detail
+        self.stale_age = stale_age      # seconds, untouched chunks further away get coarsened
+
+        # Chunks in least recently used order
+        self.chunks: "OrderedDict[Cell, MapChunk]" = OrderedDict()
+        self.cell_count = 0
+        self.focus: Optional[List[float]] = None
+        self.focus_chunk: Optional[Cell] = None
+        self.clock = 0.0
+        self.evictions = 0
+        self.coarsenings = 0
+
+    def _chunk_key(self, position) -> Cell:
+        return (math.floor(position[0] / self.chunk_size), math.floor(position[1] / self.chunk_size))
+
+    def _cell(self, position, level: int) -> Cell:
+        size = self.resolution * (1 << level)
+        return (math.floor(position[0] / size), math.floor(position[1] / size))
+
+    def _touch(self, key: Cell, create: bool) -> Optional[MapChunk]:
+        """Get a chunk and mark it recently used"""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if not create:
+                return None
+            chunk = self.chunks[key] = MapChunk(self.clock)
+        self.chunks.move_to_end(key)
+        chunk.last_access = self.clock
+        return chunk
+
+    def add_obstacle(self, position: List[float]):
+        """Record an obstacle at full detail"""
+        chunk = self._touch(self._chunk_key(position), create=True)
+        cells = chunk.obstacles.setdefault(0, {})
+        cell = self._cell(position, 0)
+        if cell not in cells:
+            cells[cell] = 1
+            chunk.size += 1
+            self.cell_count += 1
+            self._enforce_cap()
+
+    def remove_obstacle(self, position: List[float]):
+        """Clear an obstacle from the finest level that holds it, a coarse cell stays while
+        other obstacles merged into it remain"""
+        chunk = self._touch(self._chunk_key(position), create=False)
+        if chunk is None:
+            return
+        for level in sorted(chunk.obstacles):
+            cells = chunk.obstacles[level]
+            cell = self._cell(position, level)
+            if cell in cells:
+                cells[cell] -= 1
+                if cells[cell] <= 0:
+                    del cells[cell]
+                    chunk.size -= 1
+                    self.cell_count -= 1
+                return
+
+    def add_path_point(self, position: List[float]):
+        """Record a visit of the rover at full detail"""
+        chunk = self._touch(self._chunk_key(position), create=True)
+        visits = chunk.visits.setdefault(0, {})
+        cell = self._cell(position, 0)
+        if cell not in visits:
+            visits[cell] = 0
+            chunk.size += 1
+            self.cell_count += 1
+        visits[cell] += 1
+        self._enforce_cap()
+
+    def is_occupied(self, position: List[float]) -> bool:
+        """Check for an obstacle at a position, at whatever detail its chunk keeps"""
+        chunk = self.chunks.get(self._chunk_key(position))
+        if chunk is None:
+            return False
+        return any(self._cell(position, level) in cells for level, cells in chunk.obstacles.items())
+
+    def set_focus(self, position: List[float], timestamp: float):
+        """Move the rover's focus, coarsening distant and stale chunks when it enters a new chunk"""
+        self.focus = [position[0], position[1]]
+        self.clock = timestamp
+        key = self._chunk_key(position)
+        self._touch(key, create=False)
+        if key != self.focus_chunk:
+            self.focus_chunk = key
+            self._update_detail()
+
+    def _target_level(self, key: Cell, chunk: MapChunk) -> int:
+        """Level of detail a chunk deserves, finer near the rover and for recent activity"""
+        if self.focus is None:
+            return 0
+        center_x = (key[0] + 0.5) * self.chunk_size
+        center_y = (key[1] + 0.5) * self.chunk_size
+        distance = math.hypot(center_x - self.focus[0], center_y - self.focus[1])
+        if distance <= self.fine_radius:
+            return 0
+        level = 1 + int(math.log2(distance / self.fine_radius))
+        if self.clock - chunk.last_access <= self.stale_age:
+            level -= 1  # Recently active, one level finer
+        return max(0, min(level, self.max_level))
+
+    def _update_detail(self):
+        """Coarsen every chunk down to the detail it deserves"""
+        for key, chunk in self.chunks.items():
+            level = self._target_level(key, chunk)
+            if level > self._finest_level(chunk):
+                self._coarsen(chunk, level)
+
+    def _finest_level(self, chunk: MapChunk) -> int:
+        """Finest level of detail a chunk still holds cells at"""
+        levels = [level for level, cells in chunk.obstacles.items() if cells] + \
+            [level for level, cells in chunk.visits.items() if cells]
+        return min(levels) if levels else self.max_level
+
+    def _coarsen(self, chunk: MapChunk, level: int):
+        """Merge every finer level of a chunk into the given level"""
+        merged_obstacles = chunk.obstacles.pop(level, {})
+        merged_visits = chunk.visits.pop(level, {})
+        for finer in [finer for finer in chunk.obstacles if finer < level]:
+            shift = level - finer
+            for (x, y), count in chunk.obstacles.pop(finer).items():
+                cell = (x >> shift, y >> shift)
+                merged_obstacles[cell] = merged_obstacles.get(cell, 0) + count
+        for finer in [finer for finer in chunk.visits if finer < level]:
+            shift = level - finer
+            for (x, y), count in chunk.visits.pop(finer).items():
+                cell = (x >> shift, y >> shift)
+                merged_visits[cell] = merged_visits.get(cell, 0) + count
+
+        size = sum(len(cells) for cells in chunk.obstacles.values()) + \
+            sum(len(cells) for cells in chunk.visits.values())
+        if merged_obstacles:
+            chunk.obstacles[level] = merged_obstacles
+        if merged_visits:
+            chunk.visits[level] = merged_visits
+        size += len(merged_obstacles) + len(merged_visits)
+
+        self.cell_count += size - chunk.size
+        chunk.size = size
+        self.coarsenings += 1
+
+    def _enforce_cap(self):
+        """Coarsen, then evict, least recently used chunks until under the memory cap"""
+        while self.cell_count + len(self.chunks) > self.max_cells:
+            # The rover's own chunk goes last, its detail only drops when it alone breaks the cap
+            key = next((key for key in self.chunks if key != self.focus_chunk), self.focus_chunk)
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                break
+            finest = self._finest_level(chunk)
+            if finest < self.max_level:
+                self._coarsen(chunk, finest + 1)
+            elif key == self.focus_chunk:
+                break
+            else:
+                # Already as coarse as it gets, drop the chunk
+                del self.chunks[key]
+                self.cell_count -= chunk.size
+                self.evictions += 1
+
+    def query_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Dict:
+        """Get obstacle and visited cells inside a box as [corner x, corner y, size], visits add a count"""
+        obstacles = []
+        visited = []
+        key_x0, key_y0 = self._chunk_key([min_x, min_y])
+        key_x1, key_y1 = self._chunk_key([max_x, max_y])
+        if (key_x1 - key_x0 + 1) * (key_y1 - key_y0 + 1) <= len(self.chunks):
+            keys = [(kx, ky) for kx in range(key_x0, key_x1 + 1) for ky in range(key_y0, key_y1 + 1)]
+        else:
+            keys = [key for key in self.chunks
+                    if key_x0 <= key[0] <= key_x1 and key_y0 <= key[1] <= key_y1]
+
+        def inside(x, y, size):
+            return x + size > min_x and x < max_x and y + size > min_y and y < max_y
+
+        for key in keys:
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                continue
+            for level, cells in chunk.obstacles.items():
+                size = self.resolution * (1 << level)
+                obstacles.extend([x * size, y * size, size] for x, y in cells
+                                 if inside(x * size, y * size, size))
+            for level, cells in chunk.visits.items():
+                size = self.resolution * (1 << level)
+                visited.extend([x * size, y * size, size, count] for (x, y), count in cells.items()
+                               if inside(x * size, y * size, size))
+        return {"obstacles": obstacles, "path": visited}
+
+    def get_stats(self) -> Dict:
+        """Get map memory statistics"""
+        return {
+            "chunks": len(self.chunks),
+            "cells": self.cell_count,
+            "max_cells": self.max_cells,
+            "evictions": self.evictions,
+            "coarsenings": self.coarsenings
+        }